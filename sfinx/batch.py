@@ -0,0 +1,415 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+import traceback
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from sfinx.cache import FinResultCache
+from sfinx.fintypes.components.sheet import FinSheet
+from sfinx.fintypes.components.workbook import FinWorkbook
+from sfinx.fintypes.datapoints import FinTabDatapoints
+from sfinx.fintypes.temporals.fulldates import FullDate
+from sfinx.fintypes.temporals.memo import TemporalMemo
+from sfinx.main import OUTPUT_EXTENSIONS, cell_budget, generate_output
+from sfinx.processors.metric_normalizer import FinTabMetricNormalizer
+
+# Ignore dateparser warnings regarding pytz
+warnings.filterwarnings(
+    "ignore",
+    message="The localize method is no longer necessary, as this time zone supports the fold attribute",
+)
+
+INPUT_EXTENSIONS = [".xlsx"]
+SUMMARY_COLUMNS = ["input_path", "output_path", "status", "cached", "seconds", "error"]
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+my_parser = argparse.ArgumentParser(description="Run SFinX normalizer on a batch of workbooks.")
+
+# Add the arguments
+my_parser.add_argument(
+    "--input",
+    "-i",
+    dest="input",
+    type=str,
+    help="A directory of workbooks, a glob pattern, or a manifest file listing one workbook path per line.",
+)
+
+my_parser.add_argument(
+    "--output",
+    "-o",
+    dest="output_path",
+    type=str,
+    help="The output directory (one output per workbook), or a .tsv/.json/.ndjson file (one combined output).",
+)
+
+my_parser.add_argument(
+    "--format",
+    "-f",
+    dest="output_format",
+    type=str,
+    default=".json",
+    help="The format of per-workbook outputs, one of .tsv, .json or .ndjson.",
+)
+
+my_parser.add_argument(
+    "--summary",
+    "-s",
+    dest="summary_path",
+    type=str,
+    default=None,
+    help="The path to the per-workbook summary (defaults to summary.tsv next to the outputs).",
+)
+
+my_parser.add_argument(
+    "--workers",
+    "-w",
+    dest="workers",
+    type=int,
+    default=os.cpu_count() or 1,
+    help="The number of worker processes. Workers are reused across workbooks.",
+)
+
+my_parser.add_argument(
+    "--read-only",
+    dest="read_only",
+    action="store_true",
+    help="Stream worksheets row by row instead of loading full workbooks into memory.",
+)
+
+my_parser.add_argument(
+    "--engine",
+    dest="engine",
+    type=str,
+    default=FinWorkbook.ENGINE_OPENPYXL,
+    choices=FinWorkbook.ENGINES,
+    help="The engine that reads workbooks. The xml engine parses worksheets directly from their xml source.",
+)
+
+my_parser.add_argument(
+    "--max-cells",
+    dest="max_cells",
+    type=cell_budget,
+    default=FinSheet.DEFAULT_MAX_CELLS,
+    help="The maximum number of cells within the used range of a worksheet. Larger worksheets are rejected.",
+)
+
+my_parser.add_argument(
+    "--truncate",
+    dest="truncate",
+    action="store_true",
+    help="Truncate worksheets beyond --max-cells to their first rows instead of rejecting them.",
+)
+
+my_parser.add_argument(
+    "--cache-dir",
+    dest="cache_dir",
+    type=str,
+    default=None,
+    help="A directory where outputs are cached by the content of their input workbook.",
+)
+
+my_parser.add_argument(
+    "--cache-size",
+    dest="cache_size",
+    type=int,
+    default=FinResultCache.DEFAULT_MAX_BYTES >> 20,
+    help="The maximum size of the cache in MB.",
+)
+
+my_parser.add_argument(
+    "--period-cache",
+    dest="period_cache",
+    type=str,
+    default=None,
+    help="A SQLite file where the periods parsed from header strings are kept across workbooks and runs.",
+)
+
+my_parser.add_argument(
+    "--no-date-fallback",
+    dest="no_date_fallback",
+    action="store_true",
+    help="Only parse full dates in the formats of FullDate.FORMATS, without falling back to dateparser.",
+)
+
+
+def find_inputs(input):
+    """
+    Lists the workbooks to process.
+    :param input: A directory, a glob pattern, or a manifest file listing one workbook path per line.
+    :return: Sorted list of paths to workbooks (manifests keep their own order).
+    """
+    path = Path(input)
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*") if p.suffix in INPUT_EXTENSIONS and not p.name.startswith("~$"))
+    if path.is_file() and path.suffix not in INPUT_EXTENSIONS:
+        with open(path) as f:
+            lines = [line.strip() for line in f]
+        return [Path(line) for line in lines if line and not line.startswith("#")]
+    return sorted(Path(p) for p in glob.glob(input, recursive=True) if Path(p).suffix in INPUT_EXTENSIONS)
+
+
+def get_output_paths(input_paths, output_dir, extension):
+    """
+    Maps each input workbook to its own output file within the output directory.
+    Workbooks that share a file name are told apart by a numeric suffix.
+    """
+    seen = set()
+    output_paths = []
+    for input_path in input_paths:
+        name, k = input_path.stem, 0
+        while name in seen:
+            k += 1
+            name = f"{input_path.stem}_{k}"
+        seen.add(name)
+        output_paths.append(output_dir / (name + extension))
+    return output_paths
+
+
+def _init_worker(temporals=None):
+    """
+    Warms up each worker process once, so that workbooks don't pay for loading the date parser's language data.
+    :param temporals: The TemporalMemo of parsed header strings (optional). Without its date fallback, the date parser
+    is never used, so its language data is not loaded.
+    """
+    if temporals is None or temporals.date_fallback:
+        FullDate.get_parser().get_date_data("September 30, 2020")
+
+
+def _combined_part(input_path, extension, cache, options):
+    """
+    Returns the part of a combined output that holds the output of one workbook (or None if it is empty).
+    The json and ndjson parts are serialized by generate_output, and tagged with the name of the workbook:
+    a workbook object of the json list, or records that start with the file name of the workbook.
+    The tsv parts are the lines of the workbook as lists, since the columns of a combined tsv output depend on
+    all the workbooks.
+    """
+    if extension == ".tsv":
+        sheets = json.loads(generate_output(str(input_path), ".json", True, cache=cache, **options))
+        return list(FinTabMetricNormalizer.workbook_to_list({"file_name": str(input_path), "sheets": sheets})) or None
+    j = generate_output(str(input_path), extension, True, cache=cache, **options)
+    file_name = json.dumps(str(input_path))
+    if extension == ".ndjson":
+        return "".join('{"file_name": ' + file_name + ", " + line[1:] for line in j.splitlines(True)) or None
+    return '{"file_name": ' + file_name + ', "sheets": ' + j + "}" if j != "[]" else None
+
+
+def _process(input_path, output_path, extension, cache, options):
+    """
+    Normalizes one workbook within a worker process.
+    :param extension: The format of the output, or of the combined output when output_path is None.
+    :param options: Keyword arguments of generate_output.
+    :return: A tuple of the summary record of the workbook, and its part of the combined output
+    (only when output_path is None).
+    """
+    start = time.perf_counter()
+    counters = (cache.hits, cache.misses, cache.evictions) if cache else (0, 0, 0)
+    temporals = options["temporals"] if options["temporals"] is not None else TemporalMemo.open()
+    period_counters = temporals.counters()
+    try:
+        if output_path is None:
+            j = _combined_part(input_path, extension, cache, options)
+        else:
+            j = generate_output(str(input_path), extension, True, cache=cache, **options)
+            with open(output_path, "w") as f:
+                f.write(j)
+            j = None
+        status, error = STATUS_OK, ""
+    except Exception as e:  # a single broken workbook should not fail the whole batch
+        j = None
+        status, error = STATUS_FAILED, "".join(traceback.format_exception_only(type(e), e)).strip()
+    seconds = time.perf_counter() - start
+    record = {
+        "input_path": str(input_path),
+        "output_path": str(output_path) if output_path else "",
+        "status": status,
+        "cached": bool(cache and cache.hits > counters[0]),
+        "seconds": round(seconds, 3),
+        "error": error,
+    }
+    # The cache of a worker is a copy of the cache of the batch, so its counters are sent back with the record.
+    if cache:
+        record["cache_hits"] = cache.hits - counters[0]
+        record["cache_misses"] = cache.misses - counters[1]
+        record["cache_evictions"] = cache.evictions - counters[2]
+    # So are the counters of its TemporalMemo, which is reopened by the worker.
+    record["period_counters"] = [n - m for n, m in zip(temporals.counters(), period_counters)]
+    return record, j
+
+
+def write_summary(records, summary_path):
+    """
+    Writes the status and timing of each workbook as a tsv file.
+    """
+    with open(summary_path, "w") as f:
+        f.write("\t".join(SUMMARY_COLUMNS) + "\n")
+        for record in records:
+            f.write("\t".join(str(record[c]).replace("\n", " ").replace("\t", " ") for c in SUMMARY_COLUMNS) + "\n")
+
+
+def _write_combined_tsv(outputs, f):
+    """
+    Writes the lines of all workbooks into a single tsv file. The lines are written into a temporary file first,
+    since the columns depend on the deepest metric of all the workbooks.
+    """
+    with tempfile.TemporaryFile("w+") as spool:
+        max_len = 0
+        for o in outputs:
+            for line in o or []:
+                max_len = max(max_len, len(line))
+                spool.write(json.dumps(line) + "\n")
+        if max_len > 0:
+            f.write(FinTabDatapoints.format_tsv_header(max_len, ["file_name", "sheet_name"]))
+            spool.seek(0)
+            for line in spool:
+                f.write(FinTabDatapoints.format_tsv_line(json.loads(line), max_len))
+
+
+def write_combined(input_paths, outputs, output_path):
+    """
+    Writes the outputs of all workbooks into a single tsv, json or ndjson file, in input order.
+    The outputs of each workbook are written as soon as they are available (see _write_combined_tsv for tsv outputs).
+    :param outputs: The parts of the combined output of the workbooks, in input order (see _combined_part).
+    """
+    with open(output_path, "w") as f:
+        if output_path.suffix == ".tsv":
+            _write_combined_tsv(outputs, f)
+        elif output_path.suffix == ".ndjson":
+            for o in outputs:
+                if o:
+                    f.write(o)
+        else:
+            f.write("[")
+            n = 0
+            for o in outputs:
+                if o:
+                    f.write((", " if n > 0 else "") + o)
+                    n += 1
+            f.write("]")
+
+
+def run_batch(
+    input_paths,
+    output_path,
+    extension=".json",
+    summary_path=None,
+    workers=1,
+    read_only=False,
+    cache=None,
+    engine=FinWorkbook.ENGINE_OPENPYXL,
+    max_cells=FinSheet.DEFAULT_MAX_CELLS,
+    truncate=False,
+    temporals=None,
+):
+    """
+    Normalizes a batch of workbooks on a pool of worker processes.
+    :param input_paths: Paths to the workbooks.
+    :param output_path: An output directory, or a .tsv/.json/.ndjson file for one combined output.
+    :param extension: The format of per-workbook outputs.
+    :param summary_path: The path to the per-workbook summary.
+    :param workers: The number of worker processes.
+    :param read_only: Indicates whether worksheets should be streamed row by row.
+    :param cache: A FinResultCache shared by the workers (optional).
+    :param engine: The engine that reads workbooks, one of FinWorkbook.ENGINES.
+    :param max_cells: The maximum number of cells within the used range of each worksheet (None for no limit).
+    :param truncate: Indicates whether worksheets beyond max_cells are truncated rather than rejected.
+    :param temporals: The TemporalMemo of parsed header strings, reopened by each worker process (optional).
+    :return: The summary records, in input order.
+    """
+    output_path = Path(output_path)
+    combined = output_path.suffix in OUTPUT_EXTENSIONS
+    if combined:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_paths = [None] * len(input_paths)
+        summary_path = summary_path or output_path.with_name(output_path.stem + "_summary.tsv")
+    else:
+        output_path.mkdir(parents=True, exist_ok=True)
+        output_paths = get_output_paths(input_paths, output_path, extension)
+        summary_path = summary_path or output_path / "summary.tsv"
+    options = {
+        "read_only": read_only,
+        "engine": engine,
+        "max_cells": max_cells,
+        "truncate": truncate,
+        "temporals": temporals,
+    }
+    if combined:
+        extension = output_path.suffix
+    records = []
+    tasks = zip(input_paths, output_paths)
+    temporals = temporals if temporals is not None else TemporalMemo.open()
+    with ProcessPoolExecutor(max_workers=max(1, workers), initializer=_init_worker, initargs=(temporals,)) as pool:
+        # Only a window of workbooks is submitted at a time, so that pending outputs don't pile up in memory.
+        futures = deque()
+
+        def submit(n):
+            for p, o in islice(tasks, n):
+                futures.append(pool.submit(_process, p, o, extension, cache, options))
+
+        def outputs():
+            submit(max(1, workers) * 2)
+            while futures:
+                record, j = futures.popleft().result()
+                submit(1)
+                if cache:
+                    cache.hits += record.pop("cache_hits")
+                    cache.misses += record.pop("cache_misses")
+                    cache.evictions += record.pop("cache_evictions")
+                temporals.add_counters(*record.pop("period_counters"))
+                records.append(record)
+                yield j
+
+        if combined:
+            write_combined(input_paths, outputs(), output_path)
+        else:
+            for _ in outputs():
+                pass
+    write_summary(records, summary_path)
+    return records
+
+
+if __name__ == "__main__":
+    args = my_parser.parse_args()
+    input_paths = find_inputs(args.input)
+    if len(input_paths) == 0:
+        print(f"No workbooks found for the given input: {args.input}")
+        sys.exit(1)
+
+    if args.output_format not in OUTPUT_EXTENSIONS:
+        print(f'The given output format "{args.output_format}" does not match one of {OUTPUT_EXTENSIONS}')
+        sys.exit(1)
+
+    cache = FinResultCache(args.cache_dir, max_bytes=args.cache_size << 20) if args.cache_dir else None
+    temporals = None
+    if args.period_cache or args.no_date_fallback:
+        temporals = TemporalMemo.open(args.period_cache, date_fallback=not args.no_date_fallback)
+    records = run_batch(
+        input_paths,
+        args.output_path,
+        extension=args.output_format,
+        summary_path=args.summary_path,
+        workers=args.workers,
+        read_only=args.read_only,
+        cache=cache,
+        engine=args.engine,
+        max_cells=args.max_cells,
+        truncate=args.truncate,
+        temporals=temporals,
+    )
+    failed = [r for r in records if r["status"] != STATUS_OK]
+    cached = [r for r in records if r["cached"]]
+    print(f"Processed {len(records)} workbooks, {len(failed)} failed, {len(cached)} served from the cache.")
+    if cache:
+        stats = cache.stats()
+        print(f"Result cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions.")
+    if args.period_cache:
+        stats = temporals.stats()
+        print(f"Period cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate).")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+class FinResultCache:
+    """
+    On-disk cache of normalized outputs, keyed by the content of the input workbook
+    together with the version of SFinX and the configuration of the run.
+    The cache is bounded in size, and evicts its least recently used entries first.
+    Entries are plain files, so the cache can be shared by several processes.
+    Each process keeps a running total of the size of the cache, which only accounts for the entries stored by
+    other processes once the cache directory is scanned again, i.e. when the total exceeds the bound.
+    """
+
+    DEFAULT_MAX_BYTES = 1 << 30  # 1 GiB
+    _code_version = None
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        :param cache_dir: The directory where outputs are stored.
+        :param max_bytes: The maximum total size of the stored outputs.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._total = None  # the running total size of the stored outputs (None until the directory is scanned)
+
+    @staticmethod
+    def code_version():
+        """
+        Fingerprints the source code of SFinX, so that entries stored by a different version are never reused.
+        """
+        if FinResultCache._code_version is None:
+            root = Path(__file__).parent
+            h = hashlib.sha256()
+            for path in sorted(root.rglob("*.py")):
+                h.update(str(path.relative_to(root)).encode())
+                h.update(path.read_bytes())
+            FinResultCache._code_version = h.hexdigest()
+        return FinResultCache._code_version
+
+    def key(self, content, config):
+        """
+        Returns the cache key of a workbook.
+        :param content: The content of the workbook as bytes.
+        :param config: A json-serializable map of the settings that affect the output.
+        """
+        h = hashlib.sha256()
+        h.update(FinResultCache.code_version().encode())
+        h.update(json.dumps(config, sort_keys=True).encode())
+        h.update(hashlib.sha256(content).digest())
+        return h.hexdigest()
+
+    def _path(self, key, extension):
+        return self.cache_dir / (key + extension)
+
+    def get(self, key, extension):
+        """
+        Returns the stored output for the given key, or None if it isn't cached.
+        """
+        path = self._path(key, extension)
+        try:
+            with open(path) as f:
+                output = f.read()
+            # Refresh the modification time, which orders entries for eviction.
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return output
+
+    def put(self, key, extension, output):
+        """
+        Stores an output, then evicts the least recently used entries if the cache grew beyond its size bound.
+        """
+        path = self._path(key, extension)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            f.write(output)
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        size = tmp.stat().st_size
+        os.replace(tmp, path)
+        if self._total is None:
+            self._evict()
+            return
+        self._total += size - replaced
+        if self._total > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """
+        Scans the cache directory, evicts the least recently used entries until the cache fits its size bound,
+        and resets the running total size of the cache.
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".tmp"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._total = total
+
+    def stats(self):
+        """
+        Returns the hit and miss counters of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+        }
@@ -9,6 +9,9 @@ class FinTabAmount:
     such as currency and scale.
     """
 
+    # Only currencies, integers and floating point numbers can be used for delta calculation.
+    DELTA_TYPES = [FinTabValTypes.CURRENCY, FinTabValTypes.INT, FinTabValTypes.FLOAT]
+
     def __init__(self, cell):
         self.i = cell.i
         self.j = cell.j
@@ -25,11 +28,7 @@ class FinTabAmount:
         Indicates whether the type of amount is suitable for a delta calculation.
         Only currencies, integers and floating point numbers can be used for delta calculation.
         """
-        return self.amount_type in [
-            FinTabValTypes.CURRENCY,
-            FinTabValTypes.INT,
-            FinTabValTypes.FLOAT,
-        ]
+        return self.amount_type in FinTabAmount.DELTA_TYPES
 
     def to_json(self):
         return {
@@ -49,6 +48,8 @@ class FinTabDerivedAmount:
     such as pct shares of total.
     """
 
+    __slots__ = ("amount", "i", "j", "amount_type", "amount_scale", "amount_currency", "share_of_total")
+
     def __init__(self, amount, amount_type, amount_scale, amount_currency):
         self.amount = amount
         self.i = -1
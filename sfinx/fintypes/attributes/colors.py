@@ -63,10 +63,15 @@ class FinTabColors:
         """Gets theme colors from the workbook
         See: https://groups.google.com/forum/#!topic/openpyxl-users/I0k3TfqNLrc
         """
+        return FinTabColors.parse_theme_colors(wb.loaded_theme)
+
+    @staticmethod
+    def parse_theme_colors(loaded_theme):
+        """Gets theme colors from the xml source of a workbook theme"""
         from openpyxl.xml.functions import QName, fromstring
 
         xlmns = "http://schemas.openxmlformats.org/drawingml/2006/main"
-        root = fromstring(wb.loaded_theme)
+        root = fromstring(loaded_theme)
         themeEl = root.find(QName(xlmns, "themeElements").text)
         colorSchemes = themeEl.findall(QName(xlmns, "clrScheme").text)
         firstColorScheme = colorSchemes[0]
@@ -87,10 +92,10 @@ class FinTabColors:
         ]:
             accent = firstColorScheme.find(QName(xlmns, c).text)
 
-            if "window" in accent.getchildren()[0].attrib["val"]:
-                colors.append(accent.getchildren()[0].attrib["lastClr"])
+            if "window" in accent[0].attrib["val"]:
+                colors.append(accent[0].attrib["lastClr"])
             else:
-                colors.append(accent.getchildren()[0].attrib["val"])
+                colors.append(accent[0].attrib["val"])
 
         return colors
 
@@ -116,7 +121,12 @@ class FinTabColors:
         return COLOR_INDEX[index]
 
     @staticmethod
-    def get_cell_fill_color_hex(cell):
+    def get_cell_fill_color_hex(cell, theme_colors=None):
+        """
+        :param theme_colors: The FinTabThemeColors of the workbook, which resolves theme colors (optional).
+        """
+        if theme_colors is not None:
+            return theme_colors.color_to_hex(cell.fill.start_color)
         idx = cell.fill.start_color.index
         l = len(str(idx))
         if l == 8:
@@ -124,12 +134,59 @@ class FinTabColors:
         return FinTabColors.index_to_hex(idx)
 
     @staticmethod
-    def get_cell_font_color_hex(cell):
+    def get_cell_font_color_hex(cell, theme_colors=None):
+        """
+        :param theme_colors: The FinTabThemeColors of the workbook, which resolves theme colors (optional).
+        """
         c = cell.font.color
         if not c:
             return FinTabColors.BLACK
+        if theme_colors is not None:
+            return theme_colors.color_to_hex(c)
         idx = cell.font.color.value
         l = len(str(idx))
         if l == 8:
             return idx
         return FinTabColors.index_to_hex(idx)
+
+
+class FinTabThemeColors:
+    """
+    Resolves the colors of the cells in a workbook.
+    The theme of the workbook is parsed once, and each combination of theme color and tint is converted once.
+    """
+
+    ALPHA = "FF"
+
+    def __init__(self, loaded_theme=None):
+        """
+        :param loaded_theme: The xml source of the workbook theme (if any).
+        """
+        self.colors = FinTabColors.parse_theme_colors(loaded_theme) if loaded_theme else []
+        self._theme_and_tint_to_hex = {}  # map of (theme, tint) to argb hex strings
+
+    def theme_and_tint_to_hex(self, theme, tint):
+        """
+        Returns the argb hex string of a theme color with a tint.
+        Theme colors missing from the workbook are treated as black.
+        """
+        key = (theme, tint)
+        if key not in self._theme_and_tint_to_hex:
+            if 0 <= theme < len(self.colors):
+                h, l, s = FinTabColors.rgb_to_ms_hls(self.colors[theme])
+                rgb = FinTabColors.ms_hls_to_rgb(h, FinTabColors.tint_luminance(tint, l), s)
+                self._theme_and_tint_to_hex[key] = FinTabThemeColors.ALPHA + FinTabColors.rgb_to_hex(rgb)
+            else:
+                self._theme_and_tint_to_hex[key] = FinTabColors.BLACK
+        return self._theme_and_tint_to_hex[key]
+
+    def color_to_hex(self, color):
+        """
+        Returns the argb hex string of a color, whether it's given by its rgb value, a palette index or a theme color.
+        """
+        if color.type == "theme":
+            return self.theme_and_tint_to_hex(color.theme, color.tint)
+        idx = color.value
+        if len(str(idx)) == 8:
+            return idx
+        return FinTabColors.index_to_hex(idx)
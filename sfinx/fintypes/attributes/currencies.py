@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 
 from sfinx.fintypes.attributes.valtypes import FinTabValTypes
 
@@ -9,24 +10,62 @@ class FinTabCurrency:
     """
 
     USD = "usd"
+    EUR = "eur"
+    GBP = "gbp"
+    JPY = "jpy"
     DEFAULT = "default"
+    REGEX = re.compile(r"\b(usd)\b")
+    # the currency code of a number format, e.g. "[$€-x]#,##0" or "[$EUR] #,##0"
+    FORMAT_REGEX = re.compile(r"\[\$([^\]\-]+)(?:-[^\]]*)?\]")
+    FORMAT_SYMBOLS = {"$": USD, "us$": USD, "€": EUR, "£": GBP, "¥": JPY}
+    MAX_MEMO_ENTRIES = 10_000
 
     def __init__(self):
-        self.regex = re.compile(r"\b(usd)\b")
+        self.regex = FinTabCurrency.REGEX
 
     @staticmethod
     def find(cell):
         """
         Given a table cell, finds the best matching currency for its value (if applicable).
+        The currency mentioned in its metrics hierarchy comes first, then the currency code of its number format.
         :param cell: A table cell
         :return: Type of currency implied in the cell value (if applicable).
         """
         if cell.val_type != FinTabValTypes.CURRENCY:
             return FinTabCurrency.DEFAULT
-        h = " ".join([m.val for m in cell.metrics_hierarchy]).lower()
-        if "$" in h:
-            return FinTabCurrency.USD
-        regex = re.compile(r"\b(usd)\b")
-        if regex.search(h):
+        currency = FinTabCurrency.find_in_values(tuple([m.val for m in cell.metrics_hierarchy]))
+        if currency == FinTabCurrency.DEFAULT and cell.number_format:
+            currency = FinTabCurrency.find_in_format(cell.number_format)
+        return currency
+
+    @staticmethod
+    @lru_cache(maxsize=MAX_MEMO_ENTRIES)
+    def find_in_values(values):
+        """
+        Finds the currency mentioned in the values of the headers of a metrics hierarchy.
+        The results are memoized, since all the cells under the same headers share them.
+        :param values: A tuple of the values of the headers.
+        :return: Type of currency mentioned in the headers (if any).
+        """
+        h = " ".join(values).lower()
+        if "$" in h or FinTabCurrency.REGEX.search(h):
             return FinTabCurrency.USD
         return FinTabCurrency.DEFAULT
+
+    @staticmethod
+    @lru_cache(maxsize=MAX_MEMO_ENTRIES)
+    def find_in_format(number_format):
+        """
+        Finds the currency of the currency code of a number format (e.g. "[$€-x]#,##0" is in euros).
+        Currency symbols outside of currency codes are left out, e.g. "$" in "_($* #,##0_)".
+        :param number_format: The number format of a table cell.
+        :return: Type of currency implied by the number format (if any).
+        """
+        m = FinTabCurrency.FORMAT_REGEX.search(number_format)
+        if m:
+            symbol = m.group(1).strip().lower()
+            if symbol in FinTabCurrency.FORMAT_SYMBOLS:
+                return FinTabCurrency.FORMAT_SYMBOLS[symbol]
+            if re.fullmatch(r"[a-z]{3}", symbol):
+                return symbol  # an ISO 4217 code, e.g. "[$CHF]"
+        return FinTabCurrency.DEFAULT
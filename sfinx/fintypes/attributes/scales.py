@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 
 from sfinx.fintypes.attributes.valtypes import FinTabValTypes
 
@@ -9,6 +10,12 @@ class FinTabScale:
     """
 
     DEFAULT = "default"
+    # the scales from the smallest to the largest, each a thousand times the previous one
+    ORDER = [DEFAULT, "thousands", "millions", "billions"]
+    FORMAT_REGEX = re.compile(r"[0#?](,+)[^0#?]*$")
+    # literal text, padding and fill characters, and bracketed codes (e.g. colors) of a number format
+    FORMAT_LITERALS = re.compile(r'"[^"]*"|\\.|_.|\*.|\[[^\]]*\]')
+    MAX_MEMO_ENTRIES = 10_000
 
     def __init__(self, name, regex):
         self.name = name
@@ -22,19 +29,61 @@ class FinTabScale:
     @staticmethod
     def find(cell):
         """
-        Given a table cell, finds the best matching scale for its value.
+        Given a table cell, finds the best matching scale for its value, as it is stored in the cell.
+        The scale mentioned in its metrics hierarchy is that of the number displayed. A number format that divides
+        the number shown (e.g. "#,##0,,") makes the value stored smaller in scale, e.g. the value of a cell displayed
+        in billions with that format is in thousands.
         :param cell: A table cell
         :return: The name of an object of the FinTabScale class.
         """
         if cell.val_type == FinTabValTypes.PERCENT:
             return FinTabScale.DEFAULT
-        scales = [Millions(), Billions(), Thousands()]
-        h = " ".join([m.val for m in cell.metrics_hierarchy]).lower()
-        for scale in scales:
+        scale = FinTabScale.find_in_values(tuple([m.val for m in cell.metrics_hierarchy]))
+        return FinTabScale.unscale(scale, cell.number_format)
+
+    @staticmethod
+    def unscale(scale, number_format):
+        """
+        Returns the scale of a value stored in a cell, given the scale it is displayed in and the number format
+        of the cell, each comma of which after the last digit divides the number shown by a thousand.
+        :param scale: The name of an object of the FinTabScale class.
+        :param number_format: The number format of a table cell.
+        :return: The name of an object of the FinTabScale class.
+        """
+        if not number_format:
+            return scale
+        exponent = FinTabScale.format_exponent(number_format)
+        if exponent == 0:
+            return scale
+        return FinTabScale.ORDER[max(FinTabScale.ORDER.index(scale) - exponent, 0)]
+
+    @staticmethod
+    @lru_cache(maxsize=MAX_MEMO_ENTRIES)
+    def find_in_values(values):
+        """
+        Finds the scale mentioned in the values of the headers of a metrics hierarchy.
+        The results are memoized, since all the cells under the same headers share them.
+        :param values: A tuple of the values of the headers.
+        :return: The name of an object of the FinTabScale class.
+        """
+        h = " ".join(values).lower()
+        for scale in SCALES:
             if scale.match(h) != FinTabScale.DEFAULT:
                 return scale.name
         return FinTabScale.DEFAULT
 
+    @staticmethod
+    @lru_cache(maxsize=MAX_MEMO_ENTRIES)
+    def format_exponent(number_format):
+        """
+        Returns the number of commas after the last digit of a number format (for positive numbers),
+        i.e. the number of times the number shown is divided by a thousand, e.g. 2 for "#,##0,,".
+        :param number_format: The number format of a table cell.
+        """
+        section = FinTabScale.FORMAT_LITERALS.sub("", number_format).split(";")[0]
+        m = FinTabScale.FORMAT_REGEX.search(section)
+        return len(m.group(1)) if m else 0
+
 
 class Billions(FinTabScale):
     def __init__(self):
@@ -49,3 +98,7 @@ class Millions(FinTabScale):
 class Thousands(FinTabScale):
     def __init__(self):
         super().__init__("thousands", r"\b(thousand|000)s?\b")
+
+
+# the scales that may be mentioned in metrics hierarchies, in the order they are matched
+SCALES = [Millions(), Billions(), Thousands()]
@@ -1,5 +1,8 @@
+from array import array
 from enum import Enum
 
+from sfinx.fintypes.attributes.colors import FinTabColors
+
 
 class FinTabStyles(Enum):
     """
@@ -10,3 +13,116 @@ class FinTabStyles(Enum):
     HORIZONTAL_ALIGNMENT_LEFT = 2
     HORIZONTAL_ALIGNMENT_CENTER = 3
     HORIZONTAL_ALIGNMENT_RIGHT = 4
+
+
+class FinTabStyle:
+    """
+    Represents the combination of style attributes that places a cell in the hierarchy of headers.
+    """
+
+    __slots__ = (
+        "style",
+        "font_size",
+        "font_is_bold",
+        "font_is_italic",
+        "font_color",
+        "bg_color",
+        "horizontal_alignment",
+    )
+
+    def __init__(self, cell, theme_colors=None):
+        """
+        :param cell: A cell in an MS Excel worksheet with this style.
+        :param theme_colors: The FinTabThemeColors of the workbook (optional).
+        """
+        try:
+            self.style = cell.style
+        except IndexError:
+            self.style = FinTabStyles.NORMAL
+        self.font_size = cell.font.sz if cell.font.sz else 11.0
+        self.font_is_bold = cell.font.b if cell.font.b else False
+        self.font_is_italic = cell.font.i if cell.font.i else False
+        self.font_color = FinTabColors.get_cell_font_color_hex(cell, theme_colors)[2:]
+        self.bg_color = FinTabColors.get_cell_fill_color_hex(cell, theme_colors)
+        self.horizontal_alignment = (
+            cell.alignment.horizontal if cell.alignment else FinTabStyles.HORIZONTAL_ALIGNMENT_LEFT
+        )
+
+    def sub(self, other):
+        """
+        Determines whether self is a subordinate style to other.
+        """
+        if self.style == FinTabStyles.NORMAL and other.style != FinTabStyles.NORMAL:
+            return True
+        if self.equal(other) and self.font_color > other.font_color:
+            return True
+
+        return (
+            self.font_size < other.font_size
+            or (not self.font_is_bold and other.font_is_bold)
+            or (not self.font_is_italic and other.font_is_italic)
+            or (
+                self.horizontal_alignment == FinTabStyles.HORIZONTAL_ALIGNMENT_LEFT
+                and other.horizontal_alignment == FinTabStyles.HORIZONTAL_ALIGNMENT_CENTER
+            )
+        )
+
+    def equal(self, other):
+        """
+        Determines whether self is equal in the hierarchy of styles to other.
+        """
+        return (
+            self.font_size == other.font_size
+            and self.font_is_bold == other.font_is_bold
+            and self.font_is_italic == other.font_is_italic
+        )
+
+
+class FinTabStyleTable:
+    """
+    Interns the distinct styles of the cells in a workbook.
+    A worksheet typically has a few dozen distinct styles, so cells hold the id of their style in this table,
+    and the sub/equal relations are computed once per pair of style ids.
+    """
+
+    def __init__(self, theme_colors=None):
+        """
+        :param theme_colors: The FinTabThemeColors of the workbook, which resolves theme colors (optional).
+        """
+        self.theme_colors = theme_colors
+        self.styles = []  # list of FinTabStyle objects, indexed by style id
+        self._style_ids = {}  # map of the raw style of a cell to its style id
+        self._sub = {}  # map of pairs of style ids to their sub relation
+        self._equal = {}  # map of pairs of style ids to their equal relation
+
+    def get_style_id(self, cell):
+        """
+        Returns the id of the style of a cell, and interns the style if it's new.
+        :param cell: A cell in an MS Excel worksheet.
+        """
+        key = cell._style
+        if isinstance(key, array):  # openpyxl style arrays are mutable
+            key = tuple(key)
+        style_id = self._style_ids.get(key)
+        if style_id is None:
+            style_id = self._style_ids[key] = len(self.styles)
+            self.styles.append(FinTabStyle(cell, self.theme_colors))
+        return style_id
+
+    def sub(self, a, b):
+        """
+        Determines whether the style with id a is subordinate to the style with id b.
+        """
+        key = (a, b)
+        if key not in self._sub:
+            self._sub[key] = self.styles[a].sub(self.styles[b])
+        return self._sub[key]
+
+    def equal(self, a, b):
+        """
+        Determines whether the style with id a is equal in the hierarchy of styles to the style with id b.
+        """
+        key = (a, b)
+        if key not in self._equal:
+            self._equal[key] = self.styles[a].equal(self.styles[b])
+        return self._equal[key]
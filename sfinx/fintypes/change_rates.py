@@ -0,0 +1,122 @@
+import numpy as np
+
+from sfinx.fintypes.attributes.amounts import FinTabAmount, FinTabDerivedAmount
+from sfinx.fintypes.attributes.currencies import FinTabCurrency
+from sfinx.fintypes.attributes.scales import FinTabScale
+from sfinx.fintypes.attributes.valtypes import FinTabValTypes
+from sfinx.fintypes.period import FinTabDerivedPeriod, FinTabPeriod
+
+
+class FinTabChangeRates:
+    """
+    Calculates the period-on-period change rates of a group of metrics (e.g. all the metrics of a worksheet)
+    and of their sub-metrics at once.
+    The amounts of all their series are gathered into arrays, and the raw, percent and basis-point deltas of each
+    pair of adjacent amounts are calculated in one vectorized pass. The derived periods and amounts of a metric
+    are only created when its period_to_amount is read, e.g. to output it.
+    """
+
+    # Integers up to this magnitude are exact in floating point, and so are their deltas times 10000.
+    MAX_EXACT_INT = 2**53 // 20000
+
+    def __init__(self, metrics):
+        """
+        :param metrics: A list of FinTabMetric objects.
+        """
+        self.periods = []  # the periods of all the series, series after series
+        self.amounts = []  # the amounts of all the series, series after series
+        for metric in metrics:
+            self._gather(metric)
+        self._calculate()
+
+    def _gather(self, metric):
+        """
+        Appends the series of a metric and its sub-metrics, and records where the series of each metric starts and
+        ends, so that its change rates are added to its period_to_amount when it is read.
+        """
+        start = len(self.periods)
+        for period, amount in metric.period_to_amount.items():
+            self.periods.append(period)
+            self.amounts.append(amount)
+        metric._change_rates = (self, start, len(self.periods))
+        for sm in metric.name_to_sub_metric.values():
+            self._gather(sm)
+
+    def _calculate(self):
+        n = len(self.amounts)
+        ends = np.zeros(n, dtype=np.int64)
+        values = np.zeros(n)
+        exact = np.zeros(n, dtype=bool)  # whether an amount is a number whose deltas are exact in floating point
+        is_int = np.zeros(n, dtype=bool)
+        type_codes = np.empty(n, dtype=np.int64)
+        codes = {}  # map of amount types to codes
+        for k, (period, amount) in enumerate(zip(self.periods, self.amounts)):
+            type_codes[k] = codes.setdefault(amount.amount_type, len(codes))
+            if not isinstance(period, FinTabPeriod):  # e.g. the derived periods of a previous calculation
+                continue
+            ends[k] = period.end_time
+            a = amount.amount
+            if isinstance(a, int):
+                is_int[k] = True
+                exact[k] = -self.MAX_EXACT_INT <= a <= self.MAX_EXACT_INT
+            elif isinstance(a, float):
+                exact[k] = True
+            if exact[k]:
+                values[k] = a
+        fit = np.isin(type_codes, [codes[t] for t in FinTabAmount.DELTA_TYPES if t in codes])
+        a1, a2 = values[:-1], values[1:]
+        # Pairs of adjacent amounts of the same type and fit for deltas (only those within a series are used).
+        self.pairs = fit[:-1] & (type_codes[:-1] == type_codes[1:])
+        # Whether the pairs are calculated here, rather than with the formulas of FinTabMetric.
+        self.vectorized = exact[:-1] & exact[1:]
+        self.int_pairs = is_int[:-1] & is_int[1:]
+        self.forward = ends[:-1] < ends[1:]
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            self.deltas = a2 - a1
+            nonzero = a1 != 0.0
+            self.pct_deltas = np.where(nonzero, self.deltas * 100.0 / a1, 0.0)
+            self.bps_deltas = np.where(nonzero, self.deltas * 10000 / a1, 0.0)
+
+    def materialize(self, metric, start, stop):
+        """
+        Adds the derived periods and amounts of the series of a metric to its period_to_amount,
+        in the same order and with the same values as the formulas of FinTabMetric.
+        :param metric: A FinTabMetric.
+        :param start: The index of the first amount of its series.
+        :param stop: The index after the last amount of its series.
+        """
+        stop = max(start, stop - 1)  # the index after the last pair of the series
+        vectorized = self.vectorized[start:stop].tolist()
+        int_pairs = self.int_pairs[start:stop].tolist()
+        forward = self.forward[start:stop].tolist()
+        deltas = self.deltas[start:stop].tolist()
+        pct_deltas = self.pct_deltas[start:stop].tolist()
+        bps_deltas = self.bps_deltas[start:stop].tolist()
+        period_to_amount = metric.period_to_amount
+        for k in np.flatnonzero(self.pairs[start:stop]).tolist():
+            amount1, period1 = self.amounts[start + k], self.periods[start + k]
+            amount2, period2 = self.amounts[start + k + 1], self.periods[start + k + 1]
+            if not vectorized[k]:
+                # e.g. amounts that are not numbers, or integers too large for floating point
+                derived_period = FinTabDerivedPeriod.calculate(amount1, period1, amount2, period2)
+                if derived_period is None:
+                    continue
+                metric.set_delta(amount1, amount2, derived_period)
+                metric.set_pct_delta(amount1, period1, amount2, period2)
+                metric.set_bps_delta(amount1, period1, amount2, period2)
+                continue
+            # Same as FinTabDerivedPeriod.calculate, which spans the later period alone if it comes first.
+            derived_period = FinTabDerivedPeriod.between(period1 if forward[k] else period2, period2, "delta")
+            # The deltas of integers are kept as integers.
+            period_to_amount[derived_period] = FinTabDerivedAmount(
+                amount2.amount - amount1.amount if int_pairs[k] else deltas[k],
+                amount1.amount_type,
+                amount1.amount_scale,
+                amount1.amount_currency,
+            )
+            period_to_amount[FinTabDerivedPeriod.between(period1, period2, "delta%")] = FinTabDerivedAmount(
+                pct_deltas[k], FinTabValTypes.PERCENT, FinTabScale.DEFAULT, FinTabCurrency.DEFAULT
+            )
+            period_to_amount[FinTabDerivedPeriod.between(period1, period2, "delta(BPS)")] = FinTabDerivedAmount(
+                int(bps_deltas[k]), FinTabValTypes.BPS, FinTabScale.DEFAULT, FinTabCurrency.DEFAULT
+            )
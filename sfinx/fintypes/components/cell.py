@@ -1,7 +1,7 @@
 import re
+from bisect import bisect_right
 
-from sfinx.fintypes.attributes.colors import FinTabColors
-from sfinx.fintypes.attributes.styles import FinTabStyles
+from sfinx.fintypes.attributes.styles import FinTabStyleTable
 from sfinx.fintypes.attributes.valtypes import FinTabValTypes
 
 
@@ -10,14 +10,34 @@ class FinTabCell:
     Represents a cell in a financial table.
     """
 
+    __slots__ = (
+        "i",
+        "j",
+        "val",
+        "flags",
+        "val_type",
+        "number_format",
+        "val_str",
+        "styles",
+        "style_id",
+        "col_header",
+        "row_header",
+        "inherited_header",
+        "period",
+        "metrics_hierarchy",
+    )
+
     FOOTNOTE_FLAG_REGEX = re.compile(r"(\*+|[(\[][a-z1-9]+[])])$")
 
-    def __init__(self, i, j, cell, flags):
+    def __init__(self, i, j, cell, flags, styles=None, headers=None):
         """
         :param i: Row index of the cell
         :param j: Column index of the cell
         :param cell: Value of the cell
         :param flags: Any footnotes attached to the value
+        :param styles: The FinTabStyleTable of the workbook (optional)
+        :param headers: The empty FinTabHeaderChain through which the header chains of the worksheet are interned
+        (optional)
         """
         self.i = i
         self.j = j
@@ -37,22 +57,13 @@ class FinTabCell:
             self.val = 0
         self.number_format = cell.number_format
         self.val_str = self._convert_to_str()
-        try:
-            self.style = cell.style
-        except IndexError:
-            self.style = FinTabStyles.NORMAL
-        self.font_size = cell.font.sz if cell.font.sz else 11.0
-        self.font_is_bold = cell.font.b if cell.font.b else False
-        self.font_is_italic = cell.font.i if cell.font.i else False
-        self.font_color = FinTabColors.get_cell_font_color_hex(cell)[2:]
-        self.bg_color = FinTabColors.get_cell_fill_color_hex(cell)
-        self.horizontal_alignment = (
-            cell.alignment.horizontal if cell.alignment else FinTabStyles.HORIZONTAL_ALIGNMENT_LEFT
-        )
+        self.styles = styles if styles is not None else FinTabStyleTable()
+        self.style_id = self.styles.get_style_id(cell)
         self.col_header = None
         self.row_header = None
+        headers = headers if headers is not None else FinTabHeaderChain()
         self.inherited_header = (
-            [
+            headers.append(
                 FinTabHeader(
                     self.i,
                     self.j,
@@ -61,9 +72,9 @@ class FinTabCell:
                     self.number_format,
                     self.flags,
                 )
-            ]
+            )
             if self.is_header
-            else []
+            else headers
         )
         self.period = None
         self.metrics_hierarchy = []
@@ -86,26 +97,50 @@ class FinTabCell:
             return "{:,.2f}".format(self.val)
         return str(self.val)
 
+    @property
+    def style_attributes(self):
+        """
+        Returns the FinTabStyle of the cell.
+        """
+        return self.styles.styles[self.style_id]
+
+    @property
+    def style(self):
+        return self.style_attributes.style
+
+    @property
+    def font_size(self):
+        return self.style_attributes.font_size
+
+    @property
+    def font_is_bold(self):
+        return self.style_attributes.font_is_bold
+
+    @property
+    def font_is_italic(self):
+        return self.style_attributes.font_is_italic
+
+    @property
+    def font_color(self):
+        return self.style_attributes.font_color
+
+    @property
+    def bg_color(self):
+        return self.style_attributes.bg_color
+
+    @property
+    def horizontal_alignment(self):
+        return self.style_attributes.horizontal_alignment
+
     def sub(self, other):
         """
         Determines whether self is a subordinate cell to other.
         """
         if not isinstance(other, FinTabCell):
             return False
-        if self.style == FinTabStyles.NORMAL and other.style != FinTabStyles.NORMAL:
-            return True
-        if self.equal(other) and self.font_color > other.font_color:
-            return True
-
-        return (
-            self.font_size < other.font_size
-            or (not self.font_is_bold and other.font_is_bold)
-            or (not self.font_is_italic and other.font_is_italic)
-            or (
-                self.horizontal_alignment == FinTabStyles.HORIZONTAL_ALIGNMENT_LEFT
-                and other.horizontal_alignment == FinTabStyles.HORIZONTAL_ALIGNMENT_CENTER
-            )
-        )
+        if self.styles is other.styles:
+            return self.styles.sub(self.style_id, other.style_id)
+        return self.style_attributes.sub(other.style_attributes)
 
     def equal(self, other):
         """
@@ -113,18 +148,23 @@ class FinTabCell:
         """
         if not isinstance(other, FinTabCell):
             return False
-        return (
-            self.font_size == other.font_size
-            and self.font_is_bold == other.font_is_bold
-            and self.font_is_italic == other.font_is_italic
-        )
+        if self.styles is other.styles:
+            return self.styles.equal(self.style_id, other.style_id)
+        return self.style_attributes.equal(other.style_attributes)
 
     @property
     def is_empty(self):
         """
         Determines if the content of self is empty.
         """
-        return self.val is None or len(str(self.val).strip()) == 0
+        return FinTabCell.is_empty_value(self.val)
+
+    @staticmethod
+    def is_empty_value(val):
+        """
+        Determines if a cell value is empty.
+        """
+        return val is None or len(str(val).strip()) == 0
 
     @property
     def is_body(self):
@@ -177,6 +217,8 @@ class FinTabHeader:
     Represents a header cell.
     """
 
+    __slots__ = ("i", "j", "val", "val_type", "number_format", "flags")
+
     def __init__(self, i, j, val, val_type, number_format, flags):
         self.i = i
         self.j = j
@@ -190,39 +232,243 @@ class FinTabHeader:
         return self.val + "," + str(self.i) + "," + str(self.j)
 
 
-class FinTabMergedCellGroup:
+class FinTabHeaderChain:
+    """
+    Represents an immutable chain of headers, as a node that points to the chain of its preceding headers.
+    Chains are interned: appending the same header to the same chain always returns the same node.
+    Cells under the same hierarchy of headers therefore share their chains, which are compared and hashed
+    by identity in O(1), e.g. to be used as cache keys.
+    """
+
+    __slots__ = ("parent", "header", "length", "_children", "_coords")
+
+    def __init__(self, parent=None, header=None):
+        """
+        :param parent: The chain of preceding headers (None for the empty chain).
+        :param header: The last header of the chain (None for the empty chain).
+        """
+        self.parent = parent
+        self.header = header
+        self.length = 0 if parent is None else parent.length + 1
+        self._children = None  # map of header to the interned chain that appends it to self
+        self._coords = None
+
+    @property
+    def root(self):
+        """
+        Returns the empty chain that self extends.
+        """
+        chain = self
+        while chain.parent is not None:
+            chain = chain.parent
+        return chain
+
+    @property
+    def coords(self):
+        """
+        Returns the coordinates (i, j) of the headers of the chain, in order.
+        """
+        if self._coords is None:
+            self._coords = tuple((h.i, h.j) for h in self)
+        return self._coords
+
+    def append(self, header):
+        """
+        Returns the chain of self followed by the given header.
+        """
+        if self._children is None:
+            self._children = {}
+        child = self._children.get(header)
+        if child is None:
+            child = self._children[header] = FinTabHeaderChain(self, header)
+        return child
+
+    def extend(self, headers):
+        """
+        Returns the chain of self followed by the given headers.
+        """
+        chain = self
+        for h in headers:
+            chain = chain.append(h)
+        return chain
+
+    def __add__(self, other):
+        return self.extend(other)
+
+    def __radd__(self, other):
+        return self.root.extend(other).extend(self)
+
+    def __len__(self):
+        return self.length
+
+    def __bool__(self):
+        return self.length > 0
+
+    def __iter__(self):
+        headers = []
+        chain = self
+        while chain.parent is not None:
+            headers.append(chain.header)
+            chain = chain.parent
+        return reversed(headers)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return self.root.extend(list(self)[k])
+        return list(self)[k]
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class FinTabCellStore:
+    """
+    Stores the non-empty cells of a worksheet in a map of row indices to maps of column indices to cell objects,
+    so that its memory and iteration costs grow with the number of non-empty cells rather than with the area of
+    the worksheet. Behaves like a map of coordinates (i, j) to cell objects, iterated in row-major order.
+    """
+
+    __slots__ = ("nrows", "ncols", "_rows", "_size")
+
+    def __init__(self, nrows, ncols):
+        """
+        :param nrows: The number of rows of the worksheet.
+        :param ncols: The number of columns of the worksheet.
+        """
+        self.nrows = nrows
+        self.ncols = ncols
+        self._rows = {}  # map of row index to the map of column index to cell object of its non-empty cells
+        self._size = 0
+
+    def __contains__(self, coords):
+        i, j = coords
+        row = self._rows.get(i)
+        return row is not None and j in row
+
+    def __getitem__(self, coords):
+        i, j = coords
+        row = self._rows.get(i)
+        if row is None or j not in row:
+            raise KeyError(coords)
+        return row[j]
+
+    def __setitem__(self, coords, cell):
+        i, j = coords
+        if not (0 <= i < self.nrows and 0 <= j < self.ncols):
+            raise KeyError(coords)
+        row = self._rows.get(i)
+        if row is None:
+            row = self._rows[i] = {}
+        if j not in row:
+            self._size += 1
+        row[j] = cell
+
+    def get(self, coords, default=None):
+        i, j = coords
+        row = self._rows.get(i)
+        if row is None:
+            return default
+        return row.get(j, default)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return (coords for coords, _ in self.items())
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        return (c for _, c in self.items())
+
+    def items(self):
+        # Cells are usually stored row by row, in which case sorting the indices takes linear time.
+        for i in sorted(self._rows):
+            row = self._rows[i]
+            for j in sorted(row):
+                yield (i, j), row[j]
+
+
+class FinTabMergedRangeIndex:
     """
-    Represents a group of merged cells in a financial table.
+    Indexes the merged cell ranges of a worksheet by row and by column, so that the merged range covering
+    a cell can be looked up in O(log n) without unmerging the ranges cell by cell.
+    Coordinates are 0-based, like the coordinates of a FinSheet.
     """
 
-    def __init__(self, sheet, group):
-        self.group = group  # The group of merged cells
-        self.top_left_cell_value = sheet.cell(row=group.min_row, column=group.min_col).value  # top-left coords
-        self.row_wise = self.group.max_row > self.group.min_row  # Indicates whether cells are merged row-wise
-        self.col_wise = self.group.max_col > self.group.min_col  # Indicates whether cells are merged column-wise
-        self.row_indices = set()  # Keeps track of row-wise indices
-        self.col_indices = set()  # Keeps track of column-wise indices
-
-    def get_indices(self, sheet):
-        """
-        Returns the full indices of unmerged cells within the current worksheet.
-        :param sheet: Current worksheet (within which the merged cell group exists).
-        :return: Set of row-wise and column-wise indices of the merge group within the worksheet.
-        """
-        i = -1
-        for row in sheet.iter_rows(
-            min_col=self.group.min_col,
-            min_row=self.group.min_row,
-            max_col=self.group.max_col,
-            max_row=self.group.max_row,
-        ):
-            i += 1
-            j = -1
-            for cell in row:
-                j += 1
-                cell.value = self.top_left_cell_value
-                if self.row_wise:
-                    self.row_indices.add((i, j))
-                if self.col_wise:
-                    self.col_indices.add((i, j))
-        return self.row_indices, self.col_indices
+    def __init__(self, ranges, nrows=None, ncols=None):
+        """
+        :param ranges: The merged cell ranges of the worksheet (openpyxl CellRange objects, 1-based).
+        :param nrows: The number of rows to index (all rows of the ranges by default).
+        :param ncols: The number of columns to index (all columns of the ranges by default).
+        """
+        self.ranges = list(ranges)
+        self._rows = {}  # map of row index to the sorted (start, end, range) column intervals of the row
+        self._cols = {}  # map of column index to the sorted (start, end, range) row intervals of the column
+        for g in self.ranges:
+            max_i = g.max_row if nrows is None else min(g.max_row, nrows)
+            max_j = g.max_col if ncols is None else min(g.max_col, ncols)
+            for i in range(g.min_row - 1, max_i):
+                self._rows.setdefault(i, []).append((g.min_col - 1, g.max_col - 1, g))
+            for j in range(g.min_col - 1, max_j):
+                self._cols.setdefault(j, []).append((g.min_row - 1, g.max_row - 1, g))
+        # Merged ranges never overlap, so the intervals of a row (or a column) are disjoint once sorted.
+        for intervals in list(self._rows.values()) + list(self._cols.values()):
+            intervals.sort(key=lambda interval: interval[0])
+        self._row_starts = {i: [start for start, _, _ in intervals] for i, intervals in self._rows.items()}
+        self._col_starts = {j: [start for start, _, _ in intervals] for j, intervals in self._cols.items()}
+
+    def __len__(self):
+        return len(self.ranges)
+
+    @staticmethod
+    def _find(intervals, starts, k):
+        """
+        Returns the range of the interval that includes index k, or None.
+        """
+        if not intervals:
+            return None
+        p = bisect_right(starts, k) - 1
+        if p >= 0 and intervals[p][1] >= k:
+            return intervals[p][2]
+        return None
+
+    def find(self, i, j):
+        """
+        Returns the merged range that covers the cell (i, j), or None if the cell is not merged.
+        """
+        return self._find(self._rows.get(i), self._row_starts.get(i), j)
+
+    def row_intervals(self, i):
+        """
+        Returns the sorted (start, end, range) column intervals of the merged ranges that span row i.
+        """
+        return self._rows.get(i, [])
+
+    def col_intervals(self, j):
+        """
+        Returns the sorted (start, end, range) row intervals of the merged ranges that span column j.
+        """
+        return self._cols.get(j, [])
+
+    def is_top_left(self, i, j):
+        """
+        Determines whether the cell (i, j) is the top-left cell of a merged range, which holds the value of the range.
+        """
+        g = self.find(i, j)
+        return g is not None and (g.min_row - 1, g.min_col - 1) == (i, j)
+
+    def is_merged_row_wise(self, i, j):
+        """
+        Determines whether the cell (i, j) belongs to a merged range that spans more than one row.
+        """
+        g = self.find(i, j)
+        return g is not None and g.max_row > g.min_row
+
+    def is_merged_col_wise(self, i, j):
+        """
+        Determines whether the cell (i, j) belongs to a merged range that spans more than one column.
+        """
+        g = self._find(self._cols.get(j), self._col_starts.get(j), i)
+        return g is not None and g.max_col > g.min_col
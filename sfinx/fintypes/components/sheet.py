@@ -1,5 +1,11 @@
+import warnings
+from bisect import bisect_right
+
 from sfinx.fintypes.attributes.datelike import Datelike
-from sfinx.fintypes.components.cell import FinTabCell, FinTabMergedCellGroup
+from sfinx.fintypes.attributes.styles import FinTabStyleTable
+from sfinx.fintypes.components.cell import FinTabCell, FinTabCellStore, FinTabHeaderChain
+from sfinx.fintypes.components.stream import FinLoadedSheet, FinSheetStream
+from sfinx.fintypes.components.table import FinTable
 
 
 class FinSheet:
@@ -7,12 +13,35 @@ class FinSheet:
     Represents a worksheet with one or more financial tables.
     """
 
-    def __init__(self, sheet_name, sheet):
+    DEFAULT_MAX_CELLS = 5_000_000  # budget of cells within the used range of a worksheet
+
+    def __init__(self, sheet_name, sheet, styles=None, max_cells=DEFAULT_MAX_CELLS, truncate=False):
+        """
+        :param sheet_name: The name of the worksheet.
+        :param sheet: An MS Excel worksheet.
+        :param styles: The FinTabStyleTable shared by the worksheets of the workbook (optional).
+        :param max_cells: The maximum number of cells within the used range of the worksheet (None for no limit).
+        :param truncate: Indicates whether worksheets beyond max_cells are truncated to their first rows
+        (rather than rejected with a ValueError).
+        """
+        if max_cells is not None and max_cells < 1:
+            raise ValueError(f"The cell budget must be at least 1 cell, not {max_cells}")
         # main members
         self.sheet_name = sheet_name
-        self.nrows = sheet.max_row
-        self.ncols = sheet.max_column
-        self.cells = {}  # map of coordinates (i, j) to cell object
+        self.styles = styles if styles is not None else FinTabStyleTable()
+        self.header_chains = FinTabHeaderChain()  # the empty header chain, through which header chains are interned
+        self.max_cells = max_cells
+        self.truncated_from = None  # the used range of the worksheet, if it was truncated to fit max_cells
+        if not isinstance(sheet, FinSheetStream):
+            # Merged cells are resolved through an index as rows are read, rather than unmerged within the worksheet.
+            sheet = FinLoadedSheet(sheet)
+        # Worksheets are often formatted far beyond their data, so only their used range is processed.
+        self.nrows, self.ncols = self._apply_cell_budget(*sheet.get_used_range(), truncate)
+        sheet.trim(self.nrows, self.ncols)
+        self.merged = sheet.get_merged_index()  # index of the merged cell ranges within the used range
+        self.cells = FinTabCellStore(self.nrows, self.ncols)  # map of coordinates (i, j) to non-empty cell object
+        self.row_occupancy = {}  # map of row index to the sorted column indices of its non-empty cells
+        self.col_occupancy = {}  # map of column index to the sorted row indices of its non-empty cells
         self.empty_rows = (
             set()
         )  # Ordered list of row indices that are empty. This is helpful for identifying table boundaries
@@ -21,132 +50,171 @@ class FinSheet:
         )  # Ordered list of column indices that are empty. This is helpful for identifying table boundaries.
         self.tables = (
             []
-        )  # list of tables within the current sheet (note that one worksheet may include more than one table)
+        )  # list of FinTables within the current sheet (note that one worksheet may include more than one table)
         # helper properties
-        self.unmerged_cols = set()  # keeps track of column-wise merged cells
-        self.unmerged_rows = set()  # keeps track of row-wise merged cells
         self._converted_to_date = set()  # caches integer rows that have been converted to a date
+        self._sorted_empty_rows = []
+        self._sorted_empty_cols = []
         # processor methods
-        self._unmerge_cells(sheet)
         self._populate_cells(sheet)
-        self._set_headers()
+        self._segment_tables()
+        for table in self.tables:
+            self._set_headers(table)
 
-    def _unmerge_cells(self, sheet):
-        """
-        Identifies merged cells in a worksheet, unmerges them,
-        and stores them in self.unmerged_rows and self.unmerged_cols.
-        :param sheet: A worksheet possibly including merged cells.
-        """
-        for group in sheet.merged_cells.ranges:
-            g = FinTabMergedCellGroup(sheet, group)
-            sheet.unmerge_cells(str(group))
-            row_indices, col_indices = g.get_indices(sheet)
-            self.unmerged_rows |= row_indices
-            self.unmerged_cols |= col_indices
+    def _apply_cell_budget(self, nrows, ncols, truncate):
+        """
+        Checks the used range of the worksheet against the cell budget.
+        :return: The number of rows and columns to process.
+        """
+        if self.max_cells is None or nrows * ncols <= self.max_cells:
+            return nrows, ncols
+        report = (
+            f'Worksheet "{self.sheet_name}" spans {nrows} rows and {ncols} columns ({nrows * ncols} cells), '
+            f"which exceeds the budget of {self.max_cells} cells"
+        )
+        if not truncate:
+            raise ValueError(report)
+        self.truncated_from = (nrows, ncols)
+        ncols = min(ncols, self.max_cells)
+        nrows = self.max_cells // ncols
+        warnings.warn(f"{report}. Only its first {nrows} rows and {ncols} columns are processed.")
+        return nrows, ncols
 
     def _populate_cells(self, sheet):
         """
-        Converts each cell in the sheet into a FinTabCell object
-        :param sheet: An MS Excel worksheet
+        Converts each non-empty cell in the sheet into a FinTabCell object.
+        Empty cells are implicit: they are left out of self.cells and of the occupancy indices.
+        :param sheet: A FinSheetStream over an MS Excel worksheet
         :return: A map of indices to FinTabCell objects
         """
-        non_empty_rows, non_empty_cols = set(), set()
         for i, row in enumerate(sheet.rows):
             for j, cell in enumerate(row):
                 # Identify all footnote flags and clean them up.
                 cell, footnote_flags = FinTabCell.clean_footnotes(cell)
+                if FinTabCell.is_empty_value(cell.value):
+                    continue
                 # Identify and convert all cells that contain date-like content.
                 d = Datelike(sheet, i, j, cell)
                 d.convert_datelike_cell(self._converted_to_date)
                 # Convert cell objects into FinTabCell objects
-                c = FinTabCell(i, j, cell, footnote_flags)
+                c = FinTabCell(i, j, cell, footnote_flags, self.styles, self.header_chains)
                 self.cells[(i, j)] = c
                 # Keep track of non-empty rows and columns. If there are multiple tables on the sheet,
-                # this helps identify table boundaries
-                if not c.is_empty:
-                    non_empty_rows.add(i)
-                    non_empty_cols.add(j)
+                # this helps identify table boundaries. Rows are read in order, so the indices stay sorted.
+                self.row_occupancy.setdefault(i, []).append(j)
+                self.col_occupancy.setdefault(j, []).append(i)
         # Using the indices of non-empty rows and columns, identify empty rows and columns
-        self.empty_rows = set([-1] + [i for i in range(self.nrows) if i not in non_empty_rows])
-        self.empty_cols = set([-1] + [j for j in range(self.ncols) if j not in non_empty_cols])
+        self.empty_rows = set([-1] + [i for i in range(self.nrows) if i not in self.row_occupancy])
+        self.empty_cols = set([-1] + [j for j in range(self.ncols) if j not in self.col_occupancy])
+        self._sorted_empty_rows = sorted(self.empty_rows)
+        self._sorted_empty_cols = sorted(self.empty_cols)
         return self.cells
 
-    def _set_headers(self):
+    @staticmethod
+    def _get_bands(n, empty):
         """
-        Given a map of indices --> cells, identifies cells that are row/column headers
+        Splits the indices of the rows (or columns) of a worksheet into bands of non-empty rows (or columns).
+        The walk toward the header of a cell crosses a single empty row (or column) right above (or left of) it,
+        so only gaps of two or more empty rows (or columns) separate bands.
+        :param n: The number of rows (or columns).
+        :param empty: The indices of the empty rows (or columns).
+        :return: List of (first, last) indices of the non-empty rows (or columns) of each band.
         """
-        for i in range(self.nrows):
-            for j in range(self.ncols):
-                if (i, j) in self.cells and self.cells[(i, j)].is_body:
-                    # Identify the columns and row headers of each cell
-                    self.cells[(i, j)].col_header = self._set_cell_col_header(i, j)
-                    self.cells[(i, j)].row_header = self._set_cell_row_header(i, j)
-                else:
-                    # Sometimes headers are hierarchical. This step helps propagate super-headers to sub-headers.
-                    # It first attempts to propagate headers downward.
-                    downward_success = self._propagate_headers_downward(i, j)
-                    # It downward propagation fails, then it attempts to propagate the headers rightward.
-                    rightward_success = False
-                    if not downward_success:
-                        rightward_success = self._propagate_headers_rightward(i, j)  # noqa: F841
+        bands = []
+        first, last = None, None
+        for k in range(n):
+            if k not in empty:
+                if first is None:
+                    first = k
+                last = k
+            elif first is not None and k - last >= 2:
+                bands.append((first, last))
+                first = None
+        if first is not None:
+            bands.append((first, last))
+        return bands
 
-    def _set_cell_col_header(self, i, j):
-        """
-        Given the row and column indices of a cell, find its corresponding column header.
-        :param i: The row index of the current cell.
-        :param j: The column index of the current cell.
-        :return: The list of all cells that qualify as the current cell's column header.
-        """
-        # Find the closest upward cell that is non-empty
-        k = i - 1
-        while k - 1 not in self.empty_rows and (k, j) in self.cells and self.cells[(k, j)].is_empty:
-            k -= 1
-        # This top neighbor is either a header, or a cell with the same col header as the current cell.
-        if (k, j) in self.cells:
-            top_neighbor = self.cells[(k, j)]
-            if top_neighbor.is_body and top_neighbor.col_header:
-                return top_neighbor.col_header
-            if top_neighbor.is_header:
-                output = []
-                while top_neighbor is not None and top_neighbor.is_header:
-                    output = top_neighbor.inherited_header + output
-                    k -= 1
-                    top_neighbor = self.cells.get((k, j), None)
-                return output
-            return top_neighbor.inherited_header
-        return []
+    def _segment_tables(self):
+        """
+        Identifies the rectangular regions of the worksheet that hold separate tables, and stores them in self.tables.
+        Tables are separated by gaps of empty rows or columns that neither headers nor their propagation cross.
+        """
+        self.tables = []
+        col_bands = self._get_bands(self.ncols, self.empty_cols)
+        for min_row, max_row in self._get_bands(self.nrows, self.empty_rows):
+            for min_col, max_col in col_bands:
+                table = FinTable(self, min_row, max_row, min_col, max_col)
+                # Shrink the region to the rows and columns that hold its cells.
+                rows = [i for i, _ in table.rows()]
+                cols = [j for j, _ in table.cols()]
+                if rows:
+                    table.min_row, table.max_row = rows[0], rows[-1]
+                    table.min_col, table.max_col = cols[0], cols[-1]
+                    self.tables.append(table)
+        return self.tables
+
+    def _set_headers(self, table):
+        """
+        Given a table of the worksheet, identifies cells that are row/column headers
+        :param table: A FinTable of the worksheet.
+        """
+        # Sometimes headers are hierarchical. This step helps propagate super-headers to sub-headers.
+        # Propagation only reads the headers above and to the left of a cell, so it is settled row by row first.
+        for (i, j), cell in table.items():
+            if cell.is_header:
+                # It first attempts to propagate headers downward.
+                downward_success = self._propagate_headers_downward(i, j)
+                # It downward propagation fails, then it attempts to propagate the headers rightward.
+                rightward_success = False
+                if not downward_success:
+                    rightward_success = self._propagate_headers_rightward(i, j)  # noqa: F841
+        # Identify the column and row headers of each body cell, with one sweep per column and one per row.
+        for j, rows in table.cols():
+            for cell, header in self._sweep_headers(rows, [self.cells[(i, j)] for i in rows], self._sorted_empty_rows):
+                cell.col_header = header
+        for i, cols in table.rows():
+            for cell, header in self._sweep_headers(cols, [self.cells[(i, j)] for j in cols], self._sorted_empty_cols):
+                cell.row_header = header
 
-    def _set_cell_row_header(self, i, j):
-        """
-        Given the row and column indices of a cell, find its corresponding row header.
-        :param i: The row index of the current cell.
-        :param j: The column index of the current cell.
-        :return: The list of all cells that qualify as the current cell's row header.
-        """
-        # Find the closest leftward cell that is non-empty
-        k = j - 1
-        while k - 1 not in self.empty_cols and (i, k) in self.cells and self.cells[(i, k)].is_empty:
-            k -= 1
-        # This left neighbor is either a header, or a cell with the same row header as the current cell.
-        if (i, k) in self.cells:
-            left_neighbor = self.cells[(i, k)]
-            if left_neighbor.is_body and left_neighbor.row_header:
-                return left_neighbor.row_header
-            if left_neighbor.is_header:
-                output = []
-                while left_neighbor is not None and left_neighbor.is_header:
-                    output = left_neighbor.inherited_header + output
-                    k -= 1
-                    left_neighbor = self.cells.get((i, k), None)
-                return output
-            return left_neighbor.inherited_header
-        return []
+    def _sweep_headers(self, indices, cells, empty):
+        """
+        Sweeps over the non-empty cells of a column (or a row) and resolves the header of each body cell.
+        The header of a body cell comes from its closest non-empty neighbor upward (or leftward), without crossing
+        an empty row (or column): either the header of a body neighbor, or the inherited headers of the run of
+        adjacent header cells that ends at a header neighbor.
+        :param indices: Sorted row (or column) indices of the non-empty cells in the column (or row).
+        :param cells: The non-empty cells in the column (or row), in the order of indices.
+        :param empty: Sorted indices of the empty rows (or columns).
+        :return: Yields each body cell with its column (or row) header.
+        """
+        prev = None  # position of the previous non-empty cell
+        prev_header = None  # header of the previous non-empty cell, if it is a body cell
+        run_start = None  # position of the first cell in the run of adjacent header cells that ends at prev
+        for p, (k, cell) in enumerate(zip(indices, cells)):
+            if cell.is_header:
+                if run_start is None or indices[prev] != k - 1:
+                    run_start = p
+            else:
+                # The walk toward the neighbor stops right after the closest empty row (or column) before k - 1.
+                e = empty[bisect_right(empty, k - 2) - 1]
+                if prev is None or indices[prev] <= e:
+                    header = self.header_chains
+                elif run_start is None:
+                    header = prev_header or cells[prev].inherited_header
+                else:
+                    header = self.header_chains
+                    for c in cells[run_start : prev + 1]:
+                        header = header + c.inherited_header
+                yield cell, header
+                prev_header = header
+                run_start = None
+            prev = p
 
     def _propagate_headers_downward(self, i, j):
         """
         Given the row and column index of a cell including a header, propagates that header value downward.
         Propagation is only possible if the subsequent cell is also a header, and its style
-        seems equal or subordinate to the current cell's style.
+        seems equal or subordinate to the current cell's style (as looked up in the style table).
         :param i: The row index of the current cell
         :param j: The column index of the current cell
         :return: A boolean indicating whether the propagation was successful
@@ -157,11 +225,11 @@ class FinSheet:
             return False
         if not nxt.is_header:
             return False
-        if nxt.sub(curr):
+        if self.styles.sub(nxt.style_id, curr.style_id):
             nxt.inherited_header = curr.inherited_header + nxt.inherited_header
             return True
-        if nxt.equal(curr):
-            nxt.inherited_header = curr.inherited_header[:-1] + nxt.inherited_header
+        if self.styles.equal(nxt.style_id, curr.style_id):
+            nxt.inherited_header = curr.inherited_header.parent + nxt.inherited_header
             return True
         return False
 
@@ -169,7 +237,7 @@ class FinSheet:
         """
         Given the row and column index of a cell including a header, propagates that header value rightward.
         Propagation is only possible if the subsequent cell is also a header, and its style
-        seems equal or subordinate to the current cell's style.
+        seems equal or subordinate to the current cell's style (as looked up in the style table).
         :param i: The row index of the current cell
         :param j: The column index of the current cell
         :return: A boolean indicating whether the propagation was successful
@@ -180,10 +248,10 @@ class FinSheet:
             return False
         if not nxt.is_header:
             return False
-        if nxt.sub(curr):
+        if self.styles.sub(nxt.style_id, curr.style_id):
             nxt.inherited_header = curr.inherited_header + nxt.inherited_header
             return True
-        if nxt.equal(curr):
-            nxt.inherited_header = curr.inherited_header[:-1] + nxt.inherited_header
+        if self.styles.equal(nxt.style_id, curr.style_id):
+            nxt.inherited_header = curr.inherited_header.parent + nxt.inherited_header
             return True
         return False
@@ -0,0 +1,337 @@
+from xml.etree.ElementTree import iterparse
+
+import openpyxl
+from openpyxl.cell.cell import Cell
+from openpyxl.worksheet._reader import WorkSheetParser
+from openpyxl.worksheet.cell_range import CellRange
+from openpyxl.xml.constants import SHEET_MAIN_NS
+
+from sfinx.fintypes.components.cell import FinTabCell, FinTabMergedRangeIndex
+
+
+class FinOpenpyxlSource:
+    """
+    Parses the xml source of a worksheet from a workbook opened by openpyxl in read-only mode.
+    openpyxl has no public interface for the merged cell ranges of such worksheets or for the raw cells of their rows,
+    so this is the only place that relies on its internals (the source, shared strings, cell styles and date formats
+    of the worksheet, and its WorkSheetParser). They are checked against the versions of openpyxl they were written for.
+    """
+
+    SUPPORTED_VERSIONS = [(3, 0), (3, 1)]  # the major and minor versions of openpyxl whose internals are used
+    ROW_TAG = "{%s}row" % SHEET_MAIN_NS
+    MERGE_CELL_TAG = "{%s}mergeCell" % SHEET_MAIN_NS
+    SHEET_DATA_TAG = "{%s}sheetData" % SHEET_MAIN_NS
+
+    def __init__(self, sheet):
+        """
+        :param sheet: A worksheet loaded from a workbook opened in read-only mode.
+        """
+        if not FinOpenpyxlSource.is_supported():
+            raise RuntimeError(
+                f"Streaming worksheets relies on internals of openpyxl {FinOpenpyxlSource.SUPPORTED_VERSIONS}, "
+                f"which differ in openpyxl {openpyxl.__version__}. Use the xml engine or a full load instead."
+            )
+        self.sheet = sheet
+        self.cell_styles = sheet.parent._cell_styles
+
+    @staticmethod
+    def is_supported(version=openpyxl.__version__):
+        """
+        Indicates whether the internals of the given version of openpyxl are those that this class relies on.
+        """
+        major_minor = tuple(int(v) for v in version.split(".")[:2] if v.isdigit())
+        return major_minor in FinOpenpyxlSource.SUPPORTED_VERSIONS
+
+    def parse(self):
+        """
+        Parses the source of the worksheet in one pass (see FinSheetStream._parse_source).
+        """
+        if self.sheet.max_row is not None and self.sheet.max_column is not None:
+            # openpyxl reads the declared dimensions when it opens the worksheet.
+            yield FinSheetStream.DIMENSIONS, (self.sheet.max_row, self.sheet.max_column)
+        wb = self.sheet.parent
+        src = self.sheet._get_source()
+        try:
+            parser = WorkSheetParser(
+                src, self.sheet._shared_strings, data_only=wb.data_only, epoch=wb.epoch, date_formats=wb._date_formats
+            )
+            sheet_data = None
+            for event, node in iterparse(src, events=("start", "end")):
+                if event == "start":
+                    if node.tag == self.SHEET_DATA_TAG:
+                        sheet_data = node
+                elif node.tag == self.ROW_TAG:
+                    r, cells = parser.parse_row(node)
+                    # Rows that were already parsed are dropped, so memory use doesn't grow with the worksheet.
+                    if sheet_data is not None:
+                        sheet_data.clear()
+                    yield FinSheetStream.ROW, (
+                        r,
+                        [(c["column"], c["value"], c["data_type"], c["style_id"]) for c in cells],
+                    )
+                elif node.tag == self.MERGE_CELL_TAG:
+                    yield FinSheetStream.MERGED_RANGE, node.get("ref")
+        finally:
+            src.close()
+
+    def make_cell(self, row, column, value, data_type, style_id):
+        """
+        Creates a writable cell bound to the worksheet from a parsed cell, the same way a full load would.
+        """
+        c = Cell(self.sheet, row=row, column=column, style_array=self.cell_styles[style_id])
+        c._value = value
+        c.data_type = data_type
+        return c
+
+    @staticmethod
+    def iter_loaded_values(sheet):
+        """
+        Yields the row, the column and the value of each cell that is stored in a worksheet of a fully loaded workbook.
+        With other versions of openpyxl, all the cells within the dimensions of the worksheet are visited instead.
+        """
+        if FinOpenpyxlSource.is_supported():
+            for (r, c), cell in sheet._cells.items():
+                yield r, c, cell.value
+            return
+        for row in sheet.iter_rows():
+            for cell in row:
+                yield cell.row, cell.column, cell.value
+
+
+class FinSheetStream:
+    """
+    Streams the rows of a read-only worksheet so that a FinSheet can be populated without
+    materializing the full openpyxl object model of the workbook.
+    The source of the worksheet is parsed in a single pass, which collects its dimensions, its merged cell ranges
+    and its cells, as tuples. Cell objects are only kept for the current and previous rows.
+    """
+
+    # the kinds of items that _parse_source yields
+    ROW = "row"
+    MERGED_RANGE = "merged_range"
+    DIMENSIONS = "dimensions"
+
+    def __init__(self, sheet):
+        """
+        :param sheet: A worksheet loaded from a workbook opened in read-only mode.
+        """
+        self.sheet = sheet
+        self.title = sheet.title
+        self.source = FinOpenpyxlSource(sheet)
+        self._read()
+        self._merged_index = None
+        self._window = {}  # map of row index to the cells of the rows that are currently in memory
+
+    def _parse_source(self):
+        """
+        Parses the source of the worksheet in one pass, and yields a tuple of the kind and the content of:
+        - each row (ROW): the row index, with a tuple of column, value, data type and style id for each of its cells,
+        - each merged cell range (MERGED_RANGE): its reference, e.g. "A1:C1",
+        - the dimensions of the worksheet, if it declares them (DIMENSIONS): its number of rows and columns.
+        """
+        return self.source.parse()
+
+    def _read(self):
+        """
+        Reads the source of the worksheet. Worksheets that don't declare their dimensions span all their cells.
+        """
+        self._rows = []  # list of the row index and the parsed cells of each row of the source, in order
+        self.merged_ranges = []
+        dimensions = None
+        max_row, max_col = 0, 0
+        for kind, content in self._parse_source():
+            if kind == FinSheetStream.ROW:
+                r, cells = content
+                if cells:
+                    max_row = max(max_row, r)
+                    max_col = max(max_col, max(c for c, _, _, _ in cells))
+                self._rows.append(content)
+            elif kind == FinSheetStream.MERGED_RANGE:
+                self.merged_ranges.append(CellRange(content))
+            else:
+                dimensions = content
+        self.max_row, self.max_column = dimensions if dimensions is not None else (max_row, max_col)
+
+    def _iter_values(self):
+        """
+        Yields the row, the column and the value of each cell that is stored in the worksheet source.
+        """
+        for r, cells in self._rows:
+            for c, value, _, _ in cells:
+                yield r, c, value
+
+    def get_used_range(self):
+        """
+        Returns the number of rows and columns that span the non-empty values of the worksheet,
+        including the merged cells that take the value of a non-empty top-left cell.
+        Trailing rows and columns that only carry styles are left out.
+        """
+        top_left = {(g.min_row, g.min_col): g for g in self.merged_ranges}
+        max_row, max_col = 0, 0
+        for r, c, value in self._iter_values():
+            if FinTabCell.is_empty_value(value):
+                continue
+            g = top_left.get((r, c))
+            max_row = max(max_row, r if g is None else g.max_row)
+            max_col = max(max_col, c if g is None else g.max_col)
+        return min(max_row, self.max_row), min(max_col, self.max_column)
+
+    def trim(self, max_row, max_column):
+        """
+        Restricts the rows and columns that are streamed, e.g. to the used range of the worksheet.
+        """
+        self.max_row = max_row
+        self.max_column = max_column
+        self._merged_index = None
+
+    def get_merged_index(self):
+        """
+        Returns the FinTabMergedRangeIndex of the merged cell ranges within the streamed rows and columns.
+        """
+        if self._merged_index is None:
+            self._merged_index = FinTabMergedRangeIndex(self.merged_ranges, self.max_row, self.max_column)
+        return self._merged_index
+
+    def _make_cell(self, row, column, value=None, data_type="n", style_id=None):
+        """
+        Creates the cell of a row from a parsed cell. Cells without a style id (e.g. cells that are missing from
+        the source) get the default style.
+        """
+        if style_id is None:
+            return Cell(self.sheet, row=row, column=column)
+        return self.source.make_cell(row, column, value, data_type, style_id)
+
+    def _iter_rows(self):
+        """
+        Yields the cells of each row of the worksheet, up to its dimensions, the same way openpyxl iterates over them:
+        rows missing from the source are empty, and rows that come after a row with a higher index are left out.
+        """
+        counter = 1
+        for r, parsed in self._rows:
+            if r > self.max_row:
+                break
+            while counter < r:
+                yield [self._make_cell(counter, c) for c in range(1, self.max_column + 1)]
+                counter += 1
+            if counter > r:
+                continue
+            row = [None] * self.max_column
+            for column, value, data_type, style_id in parsed:
+                if column <= self.max_column:
+                    row[column - 1] = self._make_cell(r, column, value, data_type, style_id)
+            yield [self._make_cell(r, c + 1) if cell is None else cell for c, cell in enumerate(row)]
+            counter += 1
+        while counter <= self.max_row:
+            yield [self._make_cell(counter, c) for c in range(1, self.max_column + 1)]
+            counter += 1
+
+    def _merged_cell(self, row, column, value):
+        """
+        Returns the cell that replaces a merged cell once its group is unmerged.
+        Like openpyxl's unmerge, it has the default style and the value of the top-left cell of its group.
+        """
+        return Cell(self.sheet, row=row, column=column, value=value)
+
+    @property
+    def rows(self):
+        """
+        Yields the rows of the worksheet with the values of merged cells spread over their whole range.
+        Rows spanned by merged ranges are FinStreamRow objects, which resolve their merged cells when accessed.
+        """
+        index = self.get_merged_index()
+        top_left_values = {}  # map of the coordinates of the merged ranges to the values of their top-left cells
+        self._window = {}
+        for r, cells in enumerate(self._iter_rows(), start=1):
+            intervals = index.row_intervals(r - 1)
+            if intervals:
+                for start, end, g in intervals:
+                    if g.min_row == r:
+                        top_left_values[g.coord] = cells[start].value if start < len(cells) else None
+                cells = FinStreamRow(self, r, cells, top_left_values)
+            self._window = {r - 1: self._window.get(r - 1), r: cells}
+            yield cells
+        self._window = {}
+
+    def cell(self, row, column):
+        """
+        Returns a cell from the rows that are currently in memory.
+        :param row: Row index of the cell (1-based).
+        :param column: Column index of the cell (1-based).
+        """
+        if row < 1 or column < 1:
+            raise ValueError("Row or column values must be at least 1")
+        return self._window[row][column - 1]
+
+
+class FinStreamRow:
+    """
+    A row of cells streamed from a worksheet, some of which are covered by merged ranges.
+    A covered cell takes the value of the top-left cell of its range, which is looked up through the merged range
+    index when the cell is accessed, rather than spread over the whole range as the row is read.
+    Covered cells of ranges with an empty top-left cell are left as they were read.
+    """
+
+    __slots__ = ("stream", "r", "cells", "top_left_values", "_merged")
+
+    def __init__(self, stream, r, cells, top_left_values):
+        """
+        :param stream: The FinSheetStream of the worksheet.
+        :param r: Row index of the row (1-based).
+        :param cells: The cells of the row as they were read.
+        :param top_left_values: The map of the coordinates of the merged ranges of the worksheet to the values of their top-left cells.
+        """
+        self.stream = stream
+        self.r = r
+        self.cells = cells
+        self.top_left_values = top_left_values
+        self._merged = set()  # column indices of the cells that were replaced with merged cells
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __getitem__(self, c):
+        if c < 0:
+            c += len(self.cells)
+        cell = self.cells[c]
+        if c in self._merged:
+            return cell
+        g = self.stream.get_merged_index().find(self.r - 1, c)
+        if g is None or (g.min_row == self.r and g.min_col - 1 == c):
+            return cell
+        value = self.top_left_values[g.coord]
+        if value is None and cell.value is None:
+            return cell
+        # Like openpyxl's unmerge, the covered cell gets the default style.
+        cell = self.cells[c] = self.stream._merged_cell(self.r, c + 1, value)
+        self._merged.add(c)
+        return cell
+
+    def __iter__(self):
+        return (self[c] for c in range(len(self.cells)))
+
+
+class FinLoadedSheet(FinSheetStream):
+    """
+    Iterates over the rows of a worksheet from a fully loaded workbook, the same way a FinSheetStream does.
+    Merged cells are resolved through the merged range index instead of being unmerged within the worksheet.
+    """
+
+    def __init__(self, sheet):
+        """
+        :param sheet: A worksheet loaded from a workbook opened in full (not read-only) mode.
+        """
+        self.sheet = sheet
+        self.title = sheet.title
+        self.max_row, self.max_column = sheet.max_row, sheet.max_column
+        self.merged_ranges = list(sheet.merged_cells.ranges)
+        self._merged_index = None
+        self._window = {}
+
+    def _iter_values(self):
+        return FinOpenpyxlSource.iter_loaded_values(self.sheet)
+
+    def _iter_rows(self):
+        if self.max_row < 1 or self.max_column < 1:
+            return
+        for row in self.sheet.iter_rows(min_row=1, max_row=self.max_row, min_col=1, max_col=self.max_column):
+            yield list(row)
@@ -0,0 +1,82 @@
+from bisect import bisect_left, bisect_right
+
+
+class FinTable:
+    """
+    Represents a rectangular region of a worksheet that holds one financial table.
+    Coordinates are 0-based and inclusive, like the coordinates of the cells of a FinSheet.
+    """
+
+    def __init__(self, sheet, min_row, max_row, min_col, max_col):
+        """
+        :param sheet: The FinSheet that includes the table.
+        :param min_row: The index of the first row of the table.
+        :param max_row: The index of the last row of the table.
+        :param min_col: The index of the first column of the table.
+        :param max_col: The index of the last column of the table.
+        """
+        self.sheet = sheet
+        self.min_row = min_row
+        self.max_row = max_row
+        self.min_col = min_col
+        self.max_col = max_col
+
+    @property
+    def nrows(self):
+        return self.max_row - self.min_row + 1
+
+    @property
+    def ncols(self):
+        return self.max_col - self.min_col + 1
+
+    def __contains__(self, coords):
+        i, j = coords
+        return self.min_row <= i <= self.max_row and self.min_col <= j <= self.max_col
+
+    def __repr__(self):
+        return f"FinTable({self.min_row}, {self.max_row}, {self.min_col}, {self.max_col})"
+
+    @staticmethod
+    def _within(indices, first, last):
+        """
+        Returns the sorted indices that are between first and last (inclusive).
+        """
+        return indices[bisect_left(indices, first) : bisect_right(indices, last)]
+
+    def row_indices(self, i):
+        """
+        Returns the sorted column indices of the non-empty cells of row i within the table.
+        """
+        return self._within(self.sheet.row_occupancy.get(i, []), self.min_col, self.max_col)
+
+    def col_indices(self, j):
+        """
+        Returns the sorted row indices of the non-empty cells of column j within the table.
+        """
+        return self._within(self.sheet.col_occupancy.get(j, []), self.min_row, self.max_row)
+
+    def rows(self):
+        """
+        Yields the index of each row of the table with the sorted column indices of its non-empty cells.
+        """
+        for i in range(self.min_row, self.max_row + 1):
+            cols = self.row_indices(i)
+            if cols:
+                yield i, cols
+
+    def cols(self):
+        """
+        Yields the index of each column of the table with the sorted row indices of its non-empty cells.
+        """
+        for j in range(self.min_col, self.max_col + 1):
+            rows = self.col_indices(j)
+            if rows:
+                yield j, rows
+
+    def items(self):
+        """
+        Yields the coordinates and the FinTabCell of each non-empty cell of the table, row by row.
+        """
+        for i, cols in self.rows():
+            for j in cols:
+                yield (i, j), self.sheet.cells[(i, j)]
@@ -2,7 +2,11 @@ from io import BytesIO
 
 from openpyxl import load_workbook
 
+from sfinx.fintypes.attributes.colors import FinTabThemeColors
+from sfinx.fintypes.attributes.styles import FinTabStyleTable
 from sfinx.fintypes.components.sheet import FinSheet
+from sfinx.fintypes.components.stream import FinSheetStream
+from sfinx.fintypes.components.xlsx import FinXlsxWorkbook
 
 
 class FinWorkbook:
@@ -10,10 +14,46 @@ class FinWorkbook:
     Represents an MS Excel workbook including one or more worksheets.
     """
 
-    def __init__(self, fl, from_path=True):
+    ENGINE_OPENPYXL = "openpyxl"
+    ENGINE_XML = "xml"
+    ENGINES = [ENGINE_OPENPYXL, ENGINE_XML]
+
+    def __init__(
+        self,
+        fl,
+        from_path=True,
+        read_only=False,
+        sheet_names=None,
+        engine=ENGINE_OPENPYXL,
+        max_cells=FinSheet.DEFAULT_MAX_CELLS,
+        truncate=False,
+    ):
+        """
+        :param fl: Path to the workbook, or its content as bytes.
+        :param from_path: Indicates whether fl is a path.
+        :param read_only: Indicates whether worksheets should be streamed row by row
+        instead of loading the full workbook into memory.
+        :param sheet_names: Names of the worksheets to load (all worksheets by default).
+        :param engine: The engine that reads the workbook, one of ENGINES.
+        The xml engine parses the worksheets directly from their xml source, and always streams them.
+        :param max_cells: The maximum number of cells within the used range of each worksheet (None for no limit).
+        :param truncate: Indicates whether worksheets beyond max_cells are truncated rather than rejected.
+        """
+        if engine not in FinWorkbook.ENGINES:
+            raise ValueError(f'The given engine "{engine}" does not match one of {FinWorkbook.ENGINES}')
         f = fl if from_path else BytesIO(fl)
-        self.wb = load_workbook(f, data_only=True)
+        self.engine = engine
+        self.read_only = read_only or engine == FinWorkbook.ENGINE_XML
+        self.sheet_names = sheet_names
+        self.max_cells = max_cells
+        self.truncate = truncate
+        if engine == FinWorkbook.ENGINE_XML:
+            self.wb = FinXlsxWorkbook(f)
+        else:
+            self.wb = load_workbook(f, data_only=True, read_only=read_only)
         self.sheets = {}
+        self.theme_colors = FinTabThemeColors(self.wb.loaded_theme)
+        self.styles = FinTabStyleTable(self.theme_colors)  # distinct cell styles, shared by all worksheets
         self._load_sheets()
 
     def _load_sheets(self):
@@ -22,6 +62,14 @@ class FinWorkbook:
         Keeps track of them via the self.sheets map
         """
         for sn in self.wb.sheetnames:
-            st = self.wb[sn]
+            if self.sheet_names is not None and sn not in self.sheet_names:
+                continue
+            if self.engine == FinWorkbook.ENGINE_XML:
+                st = self.wb[sn]
+            else:
+                st = FinSheetStream(self.wb[sn]) if self.read_only else self.wb[sn]
             if st.max_row > 1 and st.max_column > 1:
-                self.sheets[sn] = FinSheet(sn, st)
+                self.sheets[sn] = FinSheet(sn, st, self.styles, max_cells=self.max_cells, truncate=self.truncate)
+        if self.read_only:
+            # Streamed workbooks keep their source open until they are closed.
+            self.wb.close()
@@ -0,0 +1,466 @@
+import posixpath
+from datetime import date, datetime, time, timedelta
+from xml.etree.ElementTree import fromstring, iterparse
+from zipfile import ZipFile
+
+from openpyxl.cell.cell import ERROR_CODES, TIME_FORMATS
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from openpyxl.utils.cell import coordinate_to_tuple, range_boundaries
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601
+
+from sfinx.fintypes.attributes.styles import FinTabStyles
+from sfinx.fintypes.components.stream import FinSheetStream
+
+SHEET_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+ROW_TAG = "{%s}row" % SHEET_MAIN_NS
+VALUE_TAG = "{%s}v" % SHEET_MAIN_NS
+INLINE_STRING_TAG = "{%s}is" % SHEET_MAIN_NS
+TEXT_TAG = "{%s}t" % SHEET_MAIN_NS
+RUN_TAG = "{%s}r" % SHEET_MAIN_NS
+SHARED_STRING_TAG = "{%s}si" % SHEET_MAIN_NS
+DIMENSION_TAG = "{%s}dimension" % SHEET_MAIN_NS
+SHEET_DATA_TAG = "{%s}sheetData" % SHEET_MAIN_NS
+MERGE_CELL_TAG = "{%s}mergeCell" % SHEET_MAIN_NS
+
+# Converters of the raw values of boolean and ISO 8601 date cells.
+VALUE_PARSERS = {"b": lambda v: bool(int(v)), "d": from_ISO8601}
+
+
+def _main(tag):
+    return "{%s}%s" % (SHEET_MAIN_NS, tag)
+
+
+def _bool(value):
+    """
+    Converts an xml attribute into a boolean, the same way openpyxl does.
+    """
+    if value is None:
+        return None
+    return value not in ("false", "f", "0")
+
+
+def _cast_number(value):
+    """
+    Converts a number stored as a string into an int or a float.
+    """
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+def _text_content(node):
+    """
+    Returns the plain text of a (possibly rich) string element, without its formatting and phonetic runs.
+    """
+    snippets = []
+    t = node.find(TEXT_TAG)
+    if t is not None and t.text is not None:
+        snippets.append(t.text)
+    for r in node.iterfind(RUN_TAG):
+        t = r.find(TEXT_TAG)
+        if t is not None and t.text is not None:
+            snippets.append(t.text)
+    return "".join(snippets)
+
+
+class FinXlsxColor:
+    """
+    Represents a color from the stylesheet of a workbook.
+    Follows the semantics of openpyxl's Color: value is the rgb string, the palette index, the theme index
+    or the auto flag, depending on the type of the color.
+    """
+
+    __slots__ = ("rgb", "indexed", "theme", "auto", "tint", "type")
+
+    BLACK = "00000000"
+
+    def __init__(self, rgb=BLACK, indexed=None, theme=None, auto=None, tint=0.0):
+        self.rgb, self.indexed, self.theme, self.auto = None, None, None, None
+        self.tint = tint
+        if indexed is not None:
+            self.type, self.indexed = "indexed", indexed
+        elif theme is not None:
+            self.type, self.theme = "theme", theme
+        elif auto is not None:
+            self.type, self.auto = "auto", auto
+        else:
+            self.type, self.rgb = "rgb", "00" + rgb if len(rgb) == 6 else rgb
+
+    @staticmethod
+    def from_node(node):
+        if node is None:
+            return None
+        return FinXlsxColor(
+            rgb=node.get("rgb", FinXlsxColor.BLACK),
+            indexed=int(node.get("indexed")) if node.get("indexed") is not None else None,
+            theme=int(node.get("theme")) if node.get("theme") is not None else None,
+            auto=_bool(node.get("auto")),
+            tint=float(node.get("tint", 0.0)),
+        )
+
+    @property
+    def value(self):
+        return getattr(self, self.type)
+
+    @property
+    def index(self):
+        return self.value
+
+
+class FinXlsxFont:
+    """
+    Represents the font attributes of a cell that are relevant to financial tables.
+    """
+
+    __slots__ = ("sz", "b", "i", "color")
+
+    def __init__(self, sz=None, b=False, i=False, color=None):
+        self.sz = sz
+        self.b = b
+        self.i = i
+        self.color = color
+
+    @staticmethod
+    def from_node(node):
+        def flag(tag):
+            el = node.find(_main(tag))
+            return False if el is None else _bool(el.get("val", "1"))
+
+        sz = node.find(_main("sz"))
+        return FinXlsxFont(
+            sz=float(sz.get("val")) if sz is not None and sz.get("val") is not None else None,
+            b=flag("b"),
+            i=flag("i"),
+            color=FinXlsxColor.from_node(node.find(_main("color"))),
+        )
+
+
+class FinXlsxFill:
+    """
+    Represents the background fill of a cell.
+    """
+
+    __slots__ = ("start_color",)
+
+    def __init__(self, start_color=None):
+        self.start_color = start_color or FinXlsxColor()
+
+    @staticmethod
+    def from_node(node):
+        pattern = node.find(_main("patternFill"))
+        if pattern is None:
+            return FinXlsxFill()
+        return FinXlsxFill(FinXlsxColor.from_node(pattern.find(_main("fgColor"))))
+
+
+class FinXlsxAlignment:
+    """
+    Represents the alignment of a cell.
+    """
+
+    __slots__ = ("horizontal",)
+
+    def __init__(self, horizontal=None):
+        self.horizontal = horizontal
+
+
+class FinXlsxStyle:
+    """
+    Represents one entry of the compact style table of a workbook, i.e. one cell format (xf) of its stylesheet,
+    resolved into the attributes that FinTabCell reads.
+    """
+
+    __slots__ = ("number_format", "is_date", "style", "font", "fill", "alignment")
+
+    def __init__(self, number_format, style, font, fill, alignment):
+        self.number_format = number_format
+        self.is_date = is_date_format(number_format)
+        self.style = style
+        self.font = font
+        self.fill = fill
+        self.alignment = alignment
+
+
+class FinXlsxStyleTable:
+    """
+    Parses the stylesheet of a workbook into a table of FinXlsxStyle objects indexed by cell style id.
+    """
+
+    def __init__(self, src):
+        """
+        :param src: Content of xl/styles.xml (or None if the workbook has no stylesheet).
+        """
+        root = fromstring(src) if src else None
+        custom_formats = self._get_custom_formats(root)
+        fonts = [FinXlsxFont.from_node(n) for n in self._children(root, "fonts", "font")] or [FinXlsxFont()]
+        fills = [FinXlsxFill.from_node(n) for n in self._children(root, "fills", "fill")] or [FinXlsxFill()]
+        names = self._get_named_styles(root)
+        self.styles = []
+        for xf in self._children(root, "cellXfs", "xf"):
+            num_fmt_id = int(xf.get("numFmtId", 0))
+            alignment = xf.find(_main("alignment"))
+            self.styles.append(
+                self._make_style(
+                    custom_formats.get(num_fmt_id, BUILTIN_FORMATS.get(num_fmt_id, "General")),
+                    names,
+                    int(xf.get("xfId", 0)),
+                    fonts[int(xf.get("fontId", 0))],
+                    fills[int(xf.get("fillId", 0))],
+                    FinXlsxAlignment(alignment.get("horizontal") if alignment is not None else None),
+                )
+            )
+        # Style of cells that have no style of their own, e.g. unmerged cells or cells missing from the source.
+        self.default = self._make_style("General", names, 0, fonts[0], fills[0], FinXlsxAlignment())
+        self.date_style_ids = {idx for idx, style in enumerate(self.styles) if style.is_date}
+
+    @staticmethod
+    def _make_style(number_format, names, xf_id, font, fill, alignment):
+        try:
+            style = names[xf_id]
+        except IndexError:
+            style = FinTabStyles.NORMAL
+        return FinXlsxStyle(number_format, style, font, fill, alignment)
+
+    @staticmethod
+    def _children(root, parent, tag):
+        if root is None:
+            return []
+        node = root.find(_main(parent))
+        return [] if node is None else node.findall(_main(tag))
+
+    @staticmethod
+    def _get_custom_formats(root):
+        return {
+            int(n.get("numFmtId")): n.get("formatCode") for n in FinXlsxStyleTable._children(root, "numFmts", "numFmt")
+        }
+
+    @staticmethod
+    def _get_named_styles(root):
+        """
+        Returns the names of the named styles, ordered by their xf id with duplicates removed (as openpyxl does).
+        """
+        names = []
+        cell_styles = FinXlsxStyleTable._children(root, "cellStyles", "cellStyle")
+        for n in sorted(cell_styles, key=lambda n: int(n.get("xfId", 0))):
+            if n.get("name") not in names:
+                names.append(n.get("name"))
+        return names or ["Normal"]
+
+    def __getitem__(self, style_id):
+        return self.styles[style_id]
+
+
+class FinXlsxCell:
+    """
+    Represents a cell read directly from the xml source of a worksheet.
+    Exposes the same attributes as an openpyxl cell for the subset that FinSheet reads.
+    """
+
+    __slots__ = ("row", "column", "value", "data_type", "number_format", "style", "font", "fill", "alignment", "_style")
+
+    def __init__(self, row, column, value, data_type, style):
+        self.row = row
+        self.column = column
+        self.value = value
+        self.data_type = data_type
+        self.number_format = style.number_format
+        self.style = style.style
+        self.font = style.font
+        self.fill = style.fill
+        self.alignment = style.alignment
+        self._style = style  # identifies the style within the workbook, like the style array of an openpyxl cell
+
+    def bind_value(self, value):
+        """
+        Sets the value of the cell and infers its data type, the same way openpyxl does on assignment.
+        """
+        self.value = value
+        self.data_type = "n"
+        if isinstance(value, bool):
+            self.data_type = "b"
+        elif isinstance(value, (datetime, date, time, timedelta)):
+            self.data_type = "d"
+            if not is_date_format(self.number_format):
+                self.number_format = TIME_FORMATS[type(value)]
+        elif isinstance(value, str):
+            self.data_type = "s"
+            if len(value) > 1 and value.startswith("="):
+                self.data_type = "f"
+            elif value in ERROR_CODES:
+                self.data_type = "e"
+
+
+class FinXlsxWorkbook:
+    """
+    Reads an xlsx workbook directly from its zip archive, without building the openpyxl object model.
+    Offers the subset of the openpyxl workbook interface that FinWorkbook uses.
+    """
+
+    WORKSHEET_REL = REL_NS + "/worksheet"
+    SHARED_STRINGS_REL = REL_NS + "/sharedStrings"
+    STYLES_REL = REL_NS + "/styles"
+    OFFICE_DOCUMENT_REL = REL_NS + "/officeDocument"
+    THEME_PATH = "xl/theme/theme1.xml"
+
+    def __init__(self, f):
+        """
+        :param f: Path to the workbook, or a file-like object with its content.
+        """
+        self.archive = ZipFile(f)
+        self.files = set(self.archive.namelist())
+        wb_path = self._get_workbook_path()
+        rels = self._read_rels(wb_path)
+        root = fromstring(self.archive.read(wb_path))
+        properties = root.find(_main("workbookPr"))
+        date1904 = _bool(properties.get("date1904")) if properties is not None else None
+        self.epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+        self.sheet_paths = {}
+        sheets = root.find(_main("sheets"))
+        for sheet in sheets if sheets is not None else []:
+            rel = rels.get(sheet.get("{%s}id" % REL_NS))
+            if rel is not None and rel[0] == self.WORKSHEET_REL:
+                self.sheet_paths[sheet.get("name")] = rel[1]
+        self.sheetnames = list(self.sheet_paths)
+        self.shared_strings = self._read_shared_strings(self._find_rel(rels, self.SHARED_STRINGS_REL))
+        styles_path = self._find_rel(rels, self.STYLES_REL)
+        self.styles = FinXlsxStyleTable(self.archive.read(styles_path) if styles_path else None)
+        self.loaded_theme = self.archive.read(self.THEME_PATH) if self.THEME_PATH in self.files else None
+
+    def _get_workbook_path(self):
+        for rel_type, target in self._read_rels("").values():
+            if rel_type == self.OFFICE_DOCUMENT_REL:
+                return target
+        return "xl/workbook.xml"
+
+    def _read_rels(self, part):
+        """
+        Reads the relationships of a part of the archive.
+        :return: Map of relationship id to a tuple of relationship type and target path.
+        """
+        folder, name = posixpath.split(part)
+        rels_path = posixpath.join(folder, "_rels", name + ".rels")
+        if rels_path not in self.files:
+            return {}
+        rels = {}
+        for rel in fromstring(self.archive.read(rels_path)):
+            target = rel.get("Target")
+            if target.startswith("/"):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(folder, target))
+            rels[rel.get("Id")] = (rel.get("Type"), target)
+        return rels
+
+    @staticmethod
+    def _find_rel(rels, rel_type):
+        for t, target in rels.values():
+            if t == rel_type:
+                return target
+        return None
+
+    def _read_shared_strings(self, path):
+        strings = []
+        if path is None or path not in self.files:
+            return strings
+        with self.archive.open(path) as src:
+            for _, node in iterparse(src):
+                if node.tag == SHARED_STRING_TAG:
+                    strings.append(_text_content(node).replace("x005F_", ""))
+                    node.clear()
+        return strings
+
+    def __getitem__(self, sheet_name):
+        return FinXlsxSheet(self, sheet_name, self.sheet_paths[sheet_name])
+
+    def close(self):
+        self.archive.close()
+
+
+class FinXlsxSheet(FinSheetStream):
+    """
+    Streams the rows of a worksheet parsed directly from its xml source.
+    Styles are resolved through the compact style table of the workbook.
+    """
+
+    def __init__(self, workbook, title, path):
+        """
+        :param workbook: The FinXlsxWorkbook that includes the worksheet.
+        :param title: The name of the worksheet.
+        :param path: The path of the worksheet's xml source within the archive.
+        """
+        self.workbook = workbook
+        self.sheet = None
+        self.title = title
+        self.path = path
+        self._read()
+        self._merged_index = None
+        self._window = {}
+
+    def _get_source(self):
+        return self.workbook.archive.open(self.path)
+
+    def _parse_value(self, c):
+        """
+        Decodes the value of a cell element, the same way openpyxl does for workbooks loaded with data_only.
+        :return: A tuple of the value and the data type of the cell.
+        """
+        data_type = c.get("t", "n")
+        if data_type == "inlineStr":
+            child = c.find(INLINE_STRING_TAG)
+            return (None, data_type) if child is None else (_text_content(child), "s")
+        value = c.findtext(VALUE_TAG) or None
+        if value is None:
+            return value, data_type
+        if data_type == "n":
+            value = _cast_number(value)
+            if int(c.get("s", 0)) in self.workbook.styles.date_style_ids:
+                try:
+                    return from_excel(value, self.workbook.epoch), "d"
+                except ValueError:
+                    return "#VALUE!", "e"
+        elif data_type == "s":
+            value = self.workbook.shared_strings[int(value)]
+        elif data_type == "str":
+            data_type = "s"
+        elif data_type in VALUE_PARSERS:
+            value = VALUE_PARSERS[data_type](value)
+        return value, data_type
+
+    def _parse_source(self):
+        row_counter = 0
+        with self._get_source() as src:
+            sheet_data = None
+            for event, node in iterparse(src, events=("start", "end")):
+                if event == "start":
+                    if node.tag == SHEET_DATA_TAG:
+                        sheet_data = node
+                elif node.tag == DIMENSION_TAG:
+                    _, _, max_col, max_row = range_boundaries(node.get("ref"))
+                    yield FinSheetStream.DIMENSIONS, (max_row, max_col)
+                elif node.tag == MERGE_CELL_TAG:
+                    yield FinSheetStream.MERGED_RANGE, node.get("ref")
+                elif node.tag == ROW_TAG:
+                    r = node.get("r")
+                    row_counter = int(r) if r else row_counter + 1
+                    cells = []
+                    for col_counter, c in enumerate(node, start=1):
+                        coordinate = c.get("r")
+                        column = coordinate_to_tuple(coordinate)[1] if coordinate else col_counter
+                        value, data_type = self._parse_value(c)
+                        cells.append((column, value, data_type, int(c.get("s", 0))))
+                    # Rows that were already parsed are dropped, so memory use doesn't grow with the worksheet.
+                    if sheet_data is not None:
+                        sheet_data.clear()
+                    yield FinSheetStream.ROW, (row_counter, cells)
+
+    def _make_cell(self, row, column, value=None, data_type="n", style_id=None):
+        styles = self.workbook.styles
+        return FinXlsxCell(row, column, value, data_type, styles.default if style_id is None else styles[style_id])
+
+    def _merged_cell(self, row, column, value):
+        c = FinXlsxCell(row, column, None, "n", self.workbook.styles.default)
+        c.bind_value(value)
+        return c
@@ -0,0 +1,340 @@
+import json
+
+import numpy as np
+
+
+class FinTabDatapoints:
+    """
+    Holds the metrics of a workbook in columns, with one row per datapoint (i.e. per amount of a metric over a period),
+    as an alternative to the tree of FinTabMetric objects of FinTabMetricNormalizer.
+    Worksheets, metric paths, periods, amount types, scales and currencies are interned into tables, and the columns
+    hold their ids. Datapoints are ordered the same way as in the tree, so the datapoints of each metric are contiguous.
+    """
+
+    # The columns of the amounts of a datapoint in the tsv output, after its worksheet and metric names
+    TSV_COLUMNS = [
+        "period_expr",
+        "period_start",
+        "period_end",
+        "period_flags",
+        "row_idx",
+        "col_idx",
+        "amount_expr",
+        "amount_type",
+        "amount_scale",
+        "amount_currency",
+        "pct_share_of_total",
+    ]
+
+    def __init__(self, sheet_to_metrics):
+        """
+        :param sheet_to_metrics: The metrics of a workbook, keyed by worksheet name and metric key
+        (see FinTabMetricNormalizer.sheet_to_metrics). Their change rates and shares are expected to be calculated.
+        """
+        self.sheets = {}  # map of worksheet names to worksheet ids
+        self.metric_sheets = []  # map of metric ids to worksheet ids
+        self.metric_parents = []  # map of metric ids to the ids of their parent metrics (or -1)
+        self.metric_paths = []  # map of metric ids to the names of the metrics from the top of the hierarchy
+        self.periods = []  # map of period ids to periods
+        self.types = {}  # map of amount types to type ids
+        self.scales = {}  # map of amount scales to scale ids
+        self.currencies = {}  # map of amount currencies to currency ids
+        self.values = []  # the amount of each datapoint, as it appears in its cell (e.g. an integer or text)
+        self.shares = []  # the share of total of each datapoint (or None)
+        self._period_ids = {}  # map of the ids of period objects to period ids
+        self._period_keys = {}  # map of (expression, start date, end date, flags) to period ids
+        columns = {name: [] for name in ["sheet", "metric", "period", "amount_type", "scale", "currency", "row", "col"]}
+        metric_ranges = []
+        for sheet_name, metrics in self._group_by_sheet(sheet_to_metrics).items():
+            sheet_id = self._intern(self.sheets, sheet_name)
+            for metric in metrics:
+                self._add(sheet_id, -1, (), metric, columns, metric_ranges)
+        self.metric_starts = np.array([start for start, stop in metric_ranges], dtype=np.int64)
+        self.metric_stops = np.array([stop for start, stop in metric_ranges], dtype=np.int64)
+        self.sheet = np.array(columns["sheet"], dtype=np.int32)
+        self.metric = np.array(columns["metric"], dtype=np.int32)
+        self.period = np.array(columns["period"], dtype=np.int32)
+        self.amount_type = np.array(columns["amount_type"], dtype=np.int16)
+        self.scale = np.array(columns["scale"], dtype=np.int16)
+        self.currency = np.array(columns["currency"], dtype=np.int16)
+        self.row = np.array(columns["row"], dtype=np.int64)
+        self.col = np.array(columns["col"], dtype=np.int64)
+        # Amounts that are not numbers (e.g. text) are NaN, as are missing shares.
+        self.amount = np.array([x if type(x) in (int, float, bool) else np.nan for x in self.values], dtype=float)
+        self.share = np.array([np.nan if x is None else x for x in self.shares], dtype=float)
+        # The ids of the period objects are only valid while the metrics are added.
+        del self._period_ids, self._period_keys
+
+    def __len__(self):
+        return len(self.values)
+
+    @staticmethod
+    def _group_by_sheet(sheet_to_metrics):
+        """
+        Returns the metrics of each worksheet, in the same order as FinTabMetricNormalizer.to_json.
+        """
+        metrics = {}
+        for (sheet_name, key), metric in sheet_to_metrics.items():
+            metrics.setdefault(sheet_name, []).append(metric)
+        return metrics
+
+    @staticmethod
+    def _intern(table, value):
+        """
+        Returns the id of a value within one of the tables of worksheets, amount types, scales or currencies.
+        """
+        return table.setdefault(value, len(table))
+
+    def _period_id(self, period):
+        """
+        Returns the id of a period. Periods are interned by their expressions, dates and flags,
+        so that the many derived periods that are alike share the same id.
+        """
+        period_id = self._period_ids.get(id(period))
+        if period_id is None:
+            key = (period.expr, period.start_date, period.end_date, tuple(period.flags))
+            period_id = self._period_keys.get(key)
+            if period_id is None:
+                period_id = self._period_keys[key] = len(self.periods)
+                self.periods.append(period)
+            self._period_ids[id(period)] = period_id
+        return period_id
+
+    def _add(self, sheet_id, parent_id, path, metric, columns, metric_ranges):
+        """
+        Adds the datapoints of a metric, then those of its sub-metrics.
+        """
+        metric_id = len(self.metric_paths)
+        path = path + (metric.name,)
+        self.metric_sheets.append(sheet_id)
+        self.metric_parents.append(parent_id)
+        self.metric_paths.append(path)
+        start = len(self.values)
+        for period, amount in metric.period_to_amount.items():
+            columns["sheet"].append(sheet_id)
+            columns["metric"].append(metric_id)
+            columns["period"].append(self._period_id(period))
+            columns["amount_type"].append(self._intern(self.types, amount.amount_type))
+            columns["scale"].append(self._intern(self.scales, amount.amount_scale))
+            columns["currency"].append(self._intern(self.currencies, amount.amount_currency))
+            columns["row"].append(amount.i)
+            columns["col"].append(amount.j)
+            self.values.append(amount.amount)
+            self.shares.append(amount.share_of_total)
+        metric_ranges.append((start, len(self.values)))
+        for sm in metric.name_to_sub_metric.values():
+            self._add(sheet_id, metric_id, path, sm, columns, metric_ranges)
+
+    def _children(self):
+        """
+        Returns the ids of the top metrics of each worksheet, and of the sub-metrics of each metric, in order.
+        """
+        top = {sheet_id: [] for sheet_id in self.sheets.values()}
+        children = [[] for _ in self.metric_paths]
+        for metric_id, (sheet_id, parent_id) in enumerate(zip(self.metric_sheets, self.metric_parents)):
+            (children[parent_id] if parent_id >= 0 else top[sheet_id]).append(metric_id)
+        return top, children
+
+    def _decode(self, column, table):
+        """
+        Returns the values of a column of ids, given the table that the ids were interned in.
+        """
+        values = list(table)
+        return [values[x] for x in column.tolist()]
+
+    def _json_builder(self):
+        """
+        Returns the top metrics of each worksheet, and functions that return the json representations of a metric
+        (along with its sub-metrics) and of a datapoint, given their ids.
+        """
+        periods = [period.to_json() for period in self.periods]
+        period_ids = self.period.tolist()
+        rows = self.row.tolist()
+        cols = self.col.tolist()
+        types = self._decode(self.amount_type, self.types)
+        scales = self._decode(self.scale, self.scales)
+        currencies = self._decode(self.currency, self.currencies)
+        starts, stops = self.metric_starts.tolist(), self.metric_stops.tolist()
+        top, children = self._children()
+
+        def datapoint_to_json(k):
+            return {
+                "period": dict(periods[period_ids[k]]),
+                "amount": {
+                    "row_idx": rows[k],
+                    "col_idx": cols[k],
+                    "amount_expr": self.values[k],
+                    "amount_type": types[k],
+                    "amount_scale": scales[k],
+                    "amount_currency": currencies[k],
+                    "pct_share_of_total": self.shares[k],
+                },
+            }
+
+        def metric_to_json(metric_id):
+            j = {"metric_name": self.metric_paths[metric_id][-1]}
+            start, stop = starts[metric_id], stops[metric_id]
+            if stop > start:
+                j["values"] = [datapoint_to_json(k) for k in range(start, stop)]
+            if len(children[metric_id]) > 0:
+                j["sub_metrics"] = [metric_to_json(c) for c in children[metric_id]]
+            return j
+
+        return top, metric_to_json, datapoint_to_json
+
+    def to_json(self):
+        """
+        Returns the same json representation as FinTabMetricNormalizer.to_json.
+        """
+        sheets = list(self.sheets)
+        top, metric_to_json, _ = self._json_builder()
+        return [
+            {"sheet_name": sheets[sheet_id], "metrics": [metric_to_json(m) for m in metrics]}
+            for sheet_id, metrics in top.items()
+        ]
+
+    def write_json(self, f):
+        """
+        Writes the same json as json.dumps of to_json, one top metric at a time,
+        so that the json representation of the whole workbook is never held in memory.
+        :param f: A text file, or any object with a write method (e.g. a socket file).
+        """
+        sheets = list(self.sheets)
+        top, metric_to_json, _ = self._json_builder()
+        f.write("[")
+        for n, (sheet_id, metrics) in enumerate(top.items()):
+            f.write((", " if n > 0 else "") + '{"sheet_name": ' + json.dumps(sheets[sheet_id]) + ', "metrics": [')
+            for k, metric_id in enumerate(metrics):
+                f.write((", " if k > 0 else "") + json.dumps(metric_to_json(metric_id)))
+            f.write("]}")
+        f.write("]")
+
+    def write_ndjson(self, f):
+        """
+        Writes one json record per line for each datapoint (NDJSON), with the names of its worksheet and of the
+        metrics along its path, followed by its period and amount.
+        The records are in the same order as the datapoints of to_json.
+        :param f: A text file, or any object with a write method (e.g. a socket file).
+        """
+        sheets = list(self.sheets)
+        _, _, datapoint_to_json = self._json_builder()
+        for metric_id, (start, stop) in enumerate(zip(self.metric_starts.tolist(), self.metric_stops.tolist())):
+            sheet_name, path = sheets[self.metric_sheets[metric_id]], list(self.metric_paths[metric_id])
+            for k in range(start, stop):
+                record = {"sheet_name": sheet_name, "metric_path": path}
+                record.update(datapoint_to_json(k))
+                f.write(json.dumps(record) + "\n")
+
+    def to_tsv(self):
+        """
+        Returns the same tsv representation as FinTabMetricNormalizer.to_tsv of the json representation.
+        """
+        periods = [
+            [period.expr, period.start_date.strftime("%Y-%m-%d"), period.end_date.strftime("%Y-%m-%d")]
+            + [" ".join(period.flags)]
+            for period in self.periods
+        ]
+        period_ids = self.period.tolist()
+        rows = self.row.tolist()
+        cols = self.col.tolist()
+        types = self._decode(self.amount_type, self.types)
+        scales = self._decode(self.scale, self.scales)
+        currencies = self._decode(self.currency, self.currencies)
+        starts, stops = self.metric_starts.tolist(), self.metric_stops.tolist()
+        sheets = list(self.sheets)
+        top, children = self._children()
+        lines = []
+
+        def add_lines(metric_id, prefix):
+            # Like FinTabMetricNormalizer.to_list, the sub-metrics of a metric with values are left out,
+            # and the names of the metrics along the path are listed in pairs.
+            start, stop = starts[metric_id], stops[metric_id]
+            if stop > start:
+                for k in range(start, stop):
+                    lines.append(
+                        prefix
+                        + periods[period_ids[k]]
+                        + [rows[k], cols[k], self.values[k], types[k], scales[k], currencies[k]]
+                        + [self.shares[k] if self.shares[k] else ""]
+                    )
+                return
+            name = self.metric_paths[metric_id][-1]
+            for c in children[metric_id]:
+                add_lines(c, prefix + [name, self.metric_paths[c][-1]])
+
+        for sheet_id, metrics in top.items():
+            for metric_id in metrics:
+                add_lines(metric_id, [sheets[sheet_id]])
+        return FinTabDatapoints.format_tsv(lines, ["sheet_name"])
+
+    @staticmethod
+    def format_tsv(lines, prefix):
+        """
+        Formats the lines of the tsv output, each made of the names of a worksheet (and file) and metrics,
+        followed by the TSV_COLUMNS of a datapoint.
+        :param lines: The lines of the tsv output, as lists.
+        :param prefix: The names of the columns before the metric names, e.g. ["sheet_name"].
+        """
+        max_len = max([len(x) for x in lines])
+        output = FinTabDatapoints.format_tsv_header(max_len, prefix)
+        for x in lines:
+            output += FinTabDatapoints.format_tsv_line(x, max_len)
+        return output
+
+    @staticmethod
+    def format_tsv_header(max_len, prefix):
+        """
+        Formats the header of the tsv output.
+        :param max_len: The length of the longest line, i.e. of the deepest metric.
+        :param prefix: The names of the columns before the metric names, e.g. ["sheet_name"].
+        """
+        return (
+            "\t".join(
+                prefix
+                + ["metric"]
+                + ["sub_metric" for x in range(max_len - len(prefix) - 12)]
+                + FinTabDatapoints.TSV_COLUMNS
+            )
+            + "\n"
+        )
+
+    @staticmethod
+    def format_tsv_line(x, max_len):
+        """
+        Formats a line of the tsv output, padding the metric names up to the length of the longest line.
+        """
+        return (
+            "\t".join(
+                [str(y).replace("\n", " ").replace("\r", " ").replace("\t", " ") for y in x[:-11]]
+                + ["" for x in range(max_len - len(x))]
+                + [str(y).replace("\n", " ").replace("\r", " ").replace("\t", " ") for y in x[-11:]]
+            )
+            + "\n"
+        )
+
+    def to_numpy(self):
+        """
+        Returns the datapoints as a NumPy structured array, with the ids of their worksheets, metrics, periods,
+        amount types, scales and currencies, the ordinal days of the start and end of their periods,
+        and their amounts, source row and column indices and shares of total.
+        """
+        starts = np.array([period.start_date.toordinal() for period in self.periods], dtype=np.int64)
+        ends = np.array([period.end_date.toordinal() for period in self.periods], dtype=np.int64)
+        columns = {
+            "sheet": self.sheet,
+            "metric": self.metric,
+            "period": self.period,
+            "period_start": starts[self.period],
+            "period_end": ends[self.period],
+            "amount": self.amount,
+            "amount_type": self.amount_type,
+            "scale": self.scale,
+            "currency": self.currency,
+            "row": self.row,
+            "col": self.col,
+            "share": self.share,
+        }
+        a = np.empty(len(self), dtype=[(name, column.dtype) for name, column in columns.items()])
+        for name, column in columns.items():
+            a[name] = column
+        return a
@@ -4,7 +4,9 @@ from sfinx.fintypes.attributes.amounts import FinTabAmount, FinTabDerivedAmount
 from sfinx.fintypes.attributes.currencies import FinTabCurrency
 from sfinx.fintypes.attributes.scales import FinTabScale
 from sfinx.fintypes.attributes.valtypes import FinTabValTypes
+from sfinx.fintypes.change_rates import FinTabChangeRates
 from sfinx.fintypes.period import FinTabDerivedPeriod
+from sfinx.fintypes.shares import FinTabShares
 
 
 class FinTabMetric:
@@ -15,7 +17,18 @@ class FinTabMetric:
     def __init__(self, name):
         self.name = name
         self.name_to_sub_metric = {}
-        self.period_to_amount = OrderedDict()
+        self._period_to_amount = OrderedDict()
+        self._change_rates = None  # the FinTabChangeRates of the metric, with the range of its series
+
+    @property
+    def period_to_amount(self):
+        """
+        The amounts of the metric by period, followed by its derived change rates (if they are calculated).
+        """
+        if self._change_rates is not None:
+            (change_rates, start, stop), self._change_rates = self._change_rates, None
+            change_rates.materialize(self, start, stop)
+        return self._period_to_amount
 
     def add_sub_metric(self, sub):
         """
@@ -46,13 +59,7 @@ class FinTabMetric:
         """
         Provided with two amounts over two periods, calculates the period-on-period change%.
         """
-        derived_period = FinTabDerivedPeriod(
-            period1.expr + " to " + period2.expr + " delta% [derived]",
-            period1.start_date,
-            period2.end_date,
-            period1.flags + period2.flags,
-            period1.occurrence_range + period2.occurrence_range,
-        )
+        derived_period = FinTabDerivedPeriod.between(period1, period2, "delta%")
         derived_cell = FinTabDerivedAmount(
             ((amount2.amount - amount1.amount) * 100.0 / amount1.amount) if amount1.amount != 0.0 else 0.0,
             FinTabValTypes.PERCENT,
@@ -65,13 +72,7 @@ class FinTabMetric:
         """
         Provided with two amounts over two periods, calculates the period-on-period change in basis-points.
         """
-        derived_period = FinTabDerivedPeriod(
-            period1.expr + " to " + period2.expr + " delta(BPS) [derived]",
-            period1.start_date,
-            period2.end_date,
-            period1.flags + period2.flags,
-            period1.occurrence_range + period2.occurrence_range,
-        )
+        derived_period = FinTabDerivedPeriod.between(period1, period2, "delta(BPS)")
         derived_cell = FinTabDerivedAmount(
             int((amount2.amount - amount1.amount) * 10000 / amount1.amount) if amount1.amount != 0.0 else 0,
             FinTabValTypes.BPS,
@@ -81,61 +82,18 @@ class FinTabMetric:
         self.period_to_amount[derived_period] = derived_cell
 
     def set_change_rates(self):
-        items = [(period, amount) for period, amount in self.period_to_amount.items()]
-        item_pairs = [(items[i], items[i + 1]) for i in range(0, len(items) - 1)]
-        for (period1, amount1), (period2, amount2) in item_pairs:
-            # For any pair of adjacent cells, calculate period-on-period deltas, if appropriate.
-            derived_period = FinTabDerivedPeriod.calculate(amount1, period1, amount2, period2)
-            if derived_period is None:
-                continue
-            # Set the raw delta
-            self.set_delta(amount1, amount2, derived_period)
-            # Set the percentage change
-            self.set_pct_delta(amount1, period1, amount2, period2)
-            # Set the bps change
-            self.set_bps_delta(amount1, period1, amount2, period2)
-        # recurse over other sub-metrics
-        for smn, sm in self.name_to_sub_metric.items():
-            sm.set_change_rates()
+        """
+        Calculates the period-on-period deltas of any pair of adjacent amounts of the metric and its sub-metrics.
+        To calculate them for many metrics at once (e.g. all the metrics of a worksheet), use FinTabChangeRates.
+        """
+        FinTabChangeRates([self])
 
     def set_shares(self):
         """
-        Calculates shares of totals for a series of metrics that add to a total.
-        """
-        # first, group the sub-metrics by their period and amount type
-        period_amount_type_to_amount = {}
-        for smn, sm in self.name_to_sub_metric.items():
-            # purge any totals from each group
-            if "total" in smn.lower():
-                continue
-            for period, amount in sm.period_to_amount.items():
-                # skip over derived periods
-                if "[derived]" in period.expr:
-                    continue
-                # skip over percentages--they already reflect shares
-                if amount.amount_type == FinTabValTypes.PERCENT:
-                    continue
-                # get the proper amount type (integers and floats are treated the same as currencies)
-                if amount.fit_for_deltas():
-                    at = FinTabValTypes.CURRENCY
-                else:
-                    at = amount.amount_type
-                # populate the map that tracks periods, amount types and amounts
-                l = period_amount_type_to_amount.get((period, at), [])
-                l.append(amount)
-                period_amount_type_to_amount[(period, amount.amount_type)] = l
-        # next, calculate totals
-        for key, l in period_amount_type_to_amount.items():
-            if len(l) == 0:
-                continue
-            total = sum([x.amount for x in l])
-            for x in l:
-                # then, calculate the share for each metric and add it as derived data
-                share = (x.amount * 100.0 / total) if total != 0.0 else 0.0
-                x.share_of_total = share
-        # lastly, recurse over sub-metrics
-        for smn, sm in self.name_to_sub_metric.items():
-            sm.set_shares()
+        Calculates shares of totals for a series of metrics that add to a total, for the metric and its sub-metrics.
+        To calculate them for many metrics at once (e.g. all the metrics of a worksheet), use FinTabShares.
+        """
+        FinTabShares([self])
 
     def to_json(self):
         """
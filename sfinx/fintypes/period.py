@@ -4,13 +4,15 @@ from enum import Enum
 from dateutil.relativedelta import relativedelta
 
 from sfinx.fintypes.attributes.valtypes import FinTabValTypes
-from sfinx.fintypes.temporals.base import Temporal
-from sfinx.fintypes.temporals.ending import DaysEnding, Ending, MonthsEnding
+from sfinx.fintypes.components.cell import FinTabHeaderChain
+from sfinx.fintypes.temporals.ending import DaysEnding, MonthsEnding
 from sfinx.fintypes.temporals.fulldates import FullDate
-from sfinx.fintypes.temporals.months import Apr, Aug, Dec, Feb, Jan, Jul, Jun, Mar, May, Month, Nov, Oct, Sep
+from sfinx.fintypes.temporals.memo import TemporalMemo
+from sfinx.fintypes.temporals.months import Apr, Aug, Dec, Feb, Jan, Jul, Jun, Mar, May, Nov, Oct, Sep
 from sfinx.fintypes.temporals.quarters import Q1, Q2, Q3, Q4, Quarter
+from sfinx.fintypes.temporals.scanner import TemporalScanner
 from sfinx.fintypes.temporals.semis import H1, H2, Semi
-from sfinx.fintypes.temporals.years import FY2, FY4, QH2, QH4, FourDigit, Year
+from sfinx.fintypes.temporals.years import FY2, FY4, QH2, QH4, FourDigit
 
 
 class FinTabPeriod:
@@ -41,20 +43,88 @@ class FinTabPeriod:
         Nov(),
         Dec(),
     ]
+    SCANNER = TemporalScanner(YEARS, QUARTERS, SEMIS, ENDING_PERIODS, MONTHS)
+    # (granularity, min number of days, max number of days), e.g. "3 months ended ..." spans a quarter and a day
+    GRANULARITIES = [
+        (IS.DAY, 1, 1),
+        (IS.WEEK, 7, 8),
+        (IS.MONTH, 28, 32),
+        (IS.QUARTER, 89, 93),
+        (IS.SEMI, 181, 185),
+        (IS.YEAR, 365, 367),
+    ]
+    MICROSECONDS_PER_DAY = 86_400_000_000
+
+    __slots__ = (
+        "expr",
+        "start_date",
+        "end_date",
+        "flags",
+        "occurrence_range",
+        "id",
+        "table",
+        "start",
+        "end",
+        "end_time",
+        "granularity",
+        "_hash",
+    )
 
-    def __init__(self, expr, start_date, end_date, flags):
+    def __init__(self, expr, start_date, end_date, flags, period_id=None, table=None):
+        """
+        :param expr: Period expression.
+        :param start_date: Start date of the period.
+        :param end_date: End date of the period (exclusive).
+        :param flags: Flags associated with the period.
+        :param period_id: The id of the period within its FinTabPeriodTable (optional).
+        :param table: The FinTabPeriodTable that the period is interned in (optional).
+        """
         self.expr = expr
         self.start_date = start_date
         self.end_date = end_date
         self.flags = flags
-        self.occurrence_range = []
+        self.occurrence_range = []  # the coordinates of the headers that the period was last found in
+        self.id = period_id
+        self.table = table
+        self.start = start_date.toordinal()
+        self.end = end_date.toordinal()
+        self.end_time = FinTabPeriod.get_time_ordinal(
+            end_date
+        )  # periods are ordered by their end, including its time of day
+        self.granularity = FinTabPeriod.get_granularity(self.end - self.start)
+        self._hash = hash((expr, self.start, self.end))
+
+    @staticmethod
+    def get_granularity(days):
+        """
+        Returns the granularity of a period (one of FinTabPeriod.IS) given its number of days.
+        """
+        for granularity, min_days, max_days in FinTabPeriod.GRANULARITIES:
+            if min_days <= days <= max_days:
+                return granularity
+        return FinTabPeriod.IS.NA
+
+    @staticmethod
+    def get_time_ordinal(d):
+        """
+        Returns a date or datetime as an integer that orders it the same way, including its time of day
+        (the number of microseconds since the start of its proleptic Gregorian ordinal day 0).
+        """
+        t = d.toordinal() * FinTabPeriod.MICROSECONDS_PER_DAY
+        if isinstance(d, datetime):
+            t += ((d.hour * 60 + d.minute) * 60 + d.second) * 1_000_000 + d.microsecond
+        return t
 
     def __hash__(self):
-        return self.expr.__hash__()
+        return self._hash
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, FinTabPeriod):
             return False
+        if self.table is not None and self.table is other.table:
+            return self.id == other.id
         return self.expr == other.expr and self.start_date == other.start_date and self.end_date == other.end_date
 
     def __ne__(self, other):
@@ -65,22 +135,22 @@ class FinTabPeriod:
     def __ge__(self, other):
         if not isinstance(other, FinTabPeriod):
             return False
-        return self.end_date >= other.end_date
+        return self.end_time >= other.end_time
 
     def __gt__(self, other):
         if not isinstance(other, FinTabPeriod):
             return False
-        return self.end_date > other.end_date
+        return self.end_time > other.end_time
 
     def __le__(self, other):
         if not isinstance(other, FinTabPeriod):
             return False
-        return self.end_date <= other.end_date
+        return self.end_time <= other.end_time
 
     def __lt__(self, other):
         if not isinstance(other, FinTabPeriod):
             return False
-        return self.end_date < other.end_date
+        return self.end_time < other.end_time
 
     def __str__(self):
         return self.expr
@@ -100,29 +170,31 @@ class FinTabPeriod:
     def _get_period_from_cached(curr_map, sheet_name, headers):
         """
         Loads cached periods instead of recalculating them.
-        :param curr_map: A map that links specific headers in the current worksheet to their corresponding period.
+        :param curr_map: A FinTabPeriodMap that links headers to their corresponding period.
         :param sheet_name: Name of the current worksheet
         :param headers: Set of headers that might include an expression of period in them.
         :return: The headers split into period and non period groups
         """
-        cached = {i for i, h in enumerate(headers) if (sheet_name, h.i, h.j) in curr_map}
-        header_coords = [(h.i, h.j) for h in headers]
+        index = curr_map.sheets.get(sheet_name)
+        if index is None:
+            return None, None
+        coords = headers.coords if isinstance(headers, FinTabHeaderChain) else [(h.i, h.j) for h in headers]
+        cached = {i for i, c in enumerate(coords) if c in index}
         if len(cached) <= 0:
             return None, None
-        c = next(iter(cached))
-        period = curr_map[(sheet_name, headers[c].i, headers[c].j)]
-        for coords in period.occurrence_range:
-            if coords not in header_coords:
-                return None, None
-        non_periods = [headers[i] for i in range(len(headers)) if i not in cached]
-        return period, non_periods
+        period_id = index.period_id(coords[next(iter(cached))])
+        # The period is only reused if all the headers that express it are among the given headers.
+        if not index.occurrences[period_id].issubset(coords):
+            return None, None
+        non_periods = [h for i, h in enumerate(headers) if i not in cached]
+        return index.periods[period_id], non_periods
 
     @staticmethod
     def construct_period(sheet_name, curr_map, string, start, end, period_indices, flags, non_periods):
         """
         Constructs the period object for a given header string.
         :param sheet_name: Name of the worksheet.
-        :param curr_map: Map of cached periods.
+        :param curr_map: The FinTabPeriodMap of cached periods, whose FinTabPeriodTable interns the period.
         :param string: Period expression within the header.
         :param start: Start date of the period.
         :param end: End date of the period.
@@ -131,19 +203,20 @@ class FinTabPeriod:
         :param non_periods: Substrings within the header that do not correspond to the period.
         :return: FinTabPeriod object representing the period expression in the string.
         """
-        p = FinTabPeriod(string, start, end, flags)
+        p = curr_map.table.intern(string, start, end, flags)
         p.occurrence_range = period_indices
-        for i, j in period_indices:
-            curr_map[(sheet_name, i, j)] = p
+        curr_map.add(sheet_name, p, period_indices)
         return p, non_periods
 
     @staticmethod
-    def get_period(curr_map, sheet_name, cell):
+    def get_period(curr_map, sheet_name, cell, found=None, temporals=None):
         """
         Extracts the period expression from the headers of the given cell.
-        :param curr_map: A map that keep track of all headers and their corresponding periods.
+        :param curr_map: A FinTabPeriodMap that keeps track of all headers and their corresponding periods.
         :param sheet_name: The name of the current worksheet.
         :param cell: A cell in the current worksheet.
+        :param found: A map of header chains to the period expressions found in them (optional, see find_period).
+        :param temporals: The TemporalMemo of parsed header strings (the memo of the current process by default).
         :return: A tuple where:
         the first element is a FinTabPeriod object representing the period expressed in the headers of the cell, and
         the second element is the indices of all substrings in the headers that do not express any periods.
@@ -151,18 +224,88 @@ class FinTabPeriod:
         row_headers = cell.row_header if cell.row_header else []
         col_headers = cell.col_header if cell.col_header else []
         headers = col_headers + row_headers
+        return FinTabPeriod.get_headers_period(curr_map, sheet_name, headers, found, temporals)
 
+    @staticmethod
+    def get_headers_period(curr_map, sheet_name, headers, found=None, temporals=None):
+        """
+        Extracts the period expression from a list of headers.
+        :param curr_map: A FinTabPeriodMap that keeps track of all headers and their corresponding periods.
+        :param sheet_name: The name of the current worksheet.
+        :param headers: The headers of a cell (a list or a FinTabHeaderChain).
+        :param found: A map of header chains to the period expressions found in them (optional, see find_period).
+        :param temporals: The TemporalMemo of parsed header strings (the memo of the current process by default).
+        :return: A tuple of the FinTabPeriod expressed in the headers, and the headers that do not express any periods.
+        """
         # If period has already been identified in the headers, return the cached version
         period, non_periods = FinTabPeriod._get_period_from_cached(curr_map, sheet_name, headers)
         if period:
             return period, non_periods
+        # Finding the period expression only depends on the headers, so it is reused for interned header chains.
+        if found is not None and isinstance(headers, FinTabHeaderChain):
+            if headers not in found:
+                found[headers] = FinTabPeriod.find_period(curr_map, sheet_name, headers, temporals)
+            expression = found[headers]
+        else:
+            expression = FinTabPeriod.find_period(curr_map, sheet_name, headers, temporals)
+        if expression is None:
+            return None, headers
+        return FinTabPeriod.construct_period(sheet_name, curr_map, *expression)
+
+    @staticmethod
+    def has_period_expr(headers, temporals=None):
+        """
+        Determines whether any of the given headers is likely to include an expression of period.
+        :param temporals: The TemporalMemo of parsed header strings (the memo of the current process by default).
+        """
+        temporals = temporals if temporals is not None else TemporalMemo.open()
+        return any(FinTabPeriod.header_has_period_expr(h, temporals) for h in headers)
 
+    @staticmethod
+    def header_has_period_expr(header, temporals):
+        """
+        Determines whether a header is likely to include an expression of period, like Temporal.has_period_expr.
+        :param temporals: The TemporalMemo of parsed header strings.
+        """
+        if header.val_type == FinTabValTypes.DATE:
+            return True
+        components = temporals.get(TemporalMemo.COMPONENTS, header.val.lower().strip(), FinTabPeriod.find_components)
+        if header.val_type == FinTabValTypes.TEXT:
+            return components[5]
+        return components[4] is not None
+
+    @staticmethod
+    def find_components(text):
+        """
+        Finds the year, quarter, semi-annual period, ending period and month expressed in a (lowercased) header string,
+        with FinTabPeriod.SCANNER.
+        :return: A tuple of the components, each of them None if the string does not express it, followed by
+        whether the string is likely to include an expression of period (see TemporalScanner.scan).
+        """
+        return FinTabPeriod.SCANNER.scan(text)
+
+    @staticmethod
+    def find_period(curr_map, sheet_name, headers, temporals=None):
+        """
+        Finds the period expressed in a list of headers.
+        Headers are only linked to periods in curr_map if they include an expression of period themselves,
+        so the result only depends on the headers.
+        :param curr_map: A FinTabPeriodMap that keeps track of all headers and their corresponding periods.
+        :param sheet_name: The name of the current worksheet.
+        :param headers: The headers of a cell.
+        :param temporals: The TemporalMemo of parsed header strings (the memo of the current process by default).
+        :return: The arguments of construct_period that follow curr_map (the period expression, its start and end,
+        the indices of the headers that express it, their flags and the headers that do not express any periods),
+        or None if the headers do not express any periods.
+        """
+        temporals = temporals if temporals is not None else TemporalMemo.open()
+        index = curr_map.index(sheet_name)
         # Split headers into segments that include period expressions and segments that don't
         tagged = [
             (
                 h,
-                (sheet_name, h.i, h.j) in curr_map,
-                Temporal.has_period_expr(h, FinTabPeriod.MONTHS),
+                (h.i, h.j) in index,
+                FinTabPeriod.header_has_period_expr(h, temporals),
             )
             for h in headers
         ]
@@ -171,7 +314,21 @@ class FinTabPeriod:
         flags = [f for h in periods for f in h.flags]
         non_periods = [h[0] for h in tagged if not h[1] and not h[2]]
 
-        # Extract all relevant temporal expressions from the segments expressing periods
+        st, date, year, quarter, semi, ended, month = FinTabPeriod.find_temporals(periods, temporals)
+        span = FinTabPeriod.get_span(date, year, quarter, semi, ended, month)
+        if span is None:
+            return None
+        return st, span[0], span[1], period_indices, flags, non_periods
+
+    @staticmethod
+    def find_temporals(periods, temporals):
+        """
+        Extracts all relevant temporal expressions from the headers that express periods.
+        :param periods: The headers that express periods.
+        :param temporals: The TemporalMemo of parsed header strings.
+        :return: A tuple of the period expression, followed by the date, year, quarter, semi-annual period,
+        ending period and month expressed in the headers (each of them None if they don't express it).
+        """
         date, year, quarter, semi, ended, month = None, None, None, None, None, None
         st = ""
         for header in periods:
@@ -182,75 +339,155 @@ class FinTabPeriod:
             else:
                 s = header.val.lower().replace("mtd", "").replace("ytd", "")
                 st += " " + header.val
-                if not year:
-                    year = Year.find(s, FinTabPeriod.YEARS)
-                if not quarter:
-                    quarter = Quarter.find(s, FinTabPeriod.QUARTERS)
-                if not semi:
-                    semi = Semi.find(s, FinTabPeriod.SEMIS)
-                if not ended:
-                    ended = Ending.find(s, FinTabPeriod.ENDING_PERIODS)
-                if not month:
-                    month = Month.find(s, FinTabPeriod.MONTHS)
+                components = temporals.get(TemporalMemo.COMPONENTS, s, FinTabPeriod.find_components)
+                year = year or components[0]
+                quarter = quarter or components[1]
+                semi = semi or components[2]
+                ended = ended or components[3]
+                month = month or components[4]
                 if not date and not quarter and not semi:
-                    date = FullDate.find(s)
+                    if temporals.date_fallback:
+                        date = temporals.get(TemporalMemo.DATE, s, FullDate.find)
+                    else:
+                        date = temporals.get(TemporalMemo.EXACT_DATE, s, FullDate.find_exact)
+        return st, date, year, quarter, semi, ended, month
+
+    @staticmethod
+    def get_span(date, year, quarter, semi, ended, month):
+        """
+        Determines the start and end of the period that the temporal expressions of headers add up to.
+        :return: A tuple of the start and end of the period, or None if the expressions don't express any periods.
+        """
         if ended and date:  # "3 months/days ending 9/30/2020"
-            return FinTabPeriod.construct_period(
-                sheet_name,
-                curr_map,
-                st,
-                date + ended,
-                date + relativedelta(days=1),
-                period_indices,
-                flags,
-                non_periods,
-            )
+            return date + ended, date + relativedelta(days=1)
         if quarter and year:  # "Q1 2020"
-            start, end = Quarter.get_quarterly_period(year, quarter)
-            return FinTabPeriod.construct_period(
-                sheet_name, curr_map, st, start, end, period_indices, flags, non_periods
-            )
+            return Quarter.get_quarterly_period(year, quarter)
         if semi and year:  # "1H 2020"
-            start, end = Semi.get_semiannual_period(year, semi)
-            return FinTabPeriod.construct_period(
-                sheet_name, curr_map, st, start, end, period_indices, flags, non_periods
-            )
+            return Semi.get_semiannual_period(year, semi)
         if month and year:  # "Jan 2020"
             if not date or year != date.year or month != date.month:
                 start = datetime(year, month, 1)
-                return FinTabPeriod.construct_period(
-                    sheet_name,
-                    curr_map,
-                    st,
-                    start,
-                    start + relativedelta(months=1),
-                    period_indices,
-                    flags,
-                    non_periods,
-                )
+                return start, start + relativedelta(months=1)
         if date:  # "1/1/2020"
-            return FinTabPeriod.construct_period(
-                sheet_name,
-                curr_map,
-                st,
-                date,
-                date + relativedelta(days=1),
-                period_indices,
-                flags,
-                non_periods,
-            )
+            return date, date + relativedelta(days=1)
         if year:  # "2020"
-            return FinTabPeriod.construct_period(
-                sheet_name,
-                curr_map,
-                st,
-                datetime(year, 1, 1),
-                datetime(year + 1, 1, 1),
-                period_indices,
-                flags,
-                non_periods,
-            )
-        return None, headers
+            return datetime(year, 1, 1), datetime(year + 1, 1, 1)
+        return None
+
+
+class FinTabPeriodTable:
+    """
+    Interns the periods of a workbook, so that each of them is represented by a single FinTabPeriod object.
+    Periods with the same expression, start and end dates share the same id, whatever their flags,
+    so that they compare equal by their ids alone.
+    """
+
+    def __init__(self):
+        self.periods = []  # map of period ids to the first period interned with that id
+        self._period_ids = {}  # map of (expression, start date, end date) to period ids
+        self._interned = {}  # map of (expression, start date, end date, flags) to periods
+
+    def __len__(self):
+        return len(self.periods)
+
+    def intern(self, expr, start_date, end_date, flags):
+        """
+        Returns the canonical FinTabPeriod of the given period, creating it if it isn't interned yet.
+        """
+        key = (expr, start_date, end_date, tuple(flags))
+        period = self._interned.get(key)
+        if period is None:
+            period_id = self._period_ids.get(key[:3])
+            is_new = period_id is None
+            if is_new:
+                period_id = self._period_ids[key[:3]] = len(self.periods)
+            period = self._interned[key] = FinTabPeriod(expr, start_date, end_date, flags, period_id, self)
+            if is_new:
+                self.periods.append(period)
+        return period
+
+
+class FinTabPeriodIndex:
+    """
+    Links the coordinates of the headers of a worksheet to the periods that they express.
+    Each time a period is found in a set of headers, the link is given an id that is local to the index.
+    """
+
+    def __init__(self):
+        self.periods = []  # map of link ids to periods
+        self.occurrences = []  # map of link ids to the frozenset of the coordinates of the headers that express them
+        self._period_ids = {}  # map of header coordinates to the id of the last link of the headers
+
+    def __contains__(self, coords):
+        return coords in self._period_ids
+
+    def __len__(self):
+        return len(self._period_ids)
+
+    def period_id(self, coords):
+        """
+        Returns the id of the last link of the header at the given coordinates (or None).
+        """
+        return self._period_ids.get(coords)
+
+    def get(self, coords):
+        """
+        Returns the period expressed by the header at the given coordinates (or None).
+        """
+        period_id = self._period_ids.get(coords)
+        return None if period_id is None else self.periods[period_id]
+
+    def add(self, period, occurrences):
+        """
+        Links the headers at the given coordinates to the given period.
+        :return: The id of the link.
+        """
+        period_id = len(self.periods)
+        self.periods.append(period)
+        self.occurrences.append(frozenset(occurrences))
+        for coords in occurrences:
+            self._period_ids[coords] = period_id
+        return period_id
+
+
+class FinTabPeriodMap:
+    """
+    Keeps track of the periods expressed by the headers of each worksheet of a workbook, with one FinTabPeriodIndex
+    per worksheet, and interns them in a FinTabPeriodTable. It can be shared by several FinTabPeriodNormalizer
+    objects of the same workbook, e.g. that normalize different worksheets.
+    """
+
+    def __init__(self):
+        self.sheets = {}  # map of worksheet names to their FinTabPeriodIndex
+        self.table = FinTabPeriodTable()
+
+    def index(self, sheet_name):
+        """
+        Returns the FinTabPeriodIndex of a worksheet.
+        """
+        index = self.sheets.get(sheet_name)
+        if index is None:
+            index = self.sheets[sheet_name] = FinTabPeriodIndex()
+        return index
+
+    def add(self, sheet_name, period, occurrences):
+        """
+        Links the headers of a worksheet at the given coordinates to the given period.
+        """
+        return self.index(sheet_name).add(period, occurrences)
+
+    def __contains__(self, key):
+        sheet_name, i, j = key
+        return sheet_name in self.sheets and (i, j) in self.sheets[sheet_name]
+
+    def __getitem__(self, key):
+        sheet_name, i, j = key
+        if key not in self:
+            raise KeyError(key)
+        return self.sheets[sheet_name].get((i, j))
+
+    def __len__(self):
+        return sum(len(index) for index in self.sheets.values())
 
 
 class FinTabDerivedPeriod:
@@ -258,12 +495,14 @@ class FinTabDerivedPeriod:
     Represents a derived period, e.g. quarter-on-quarter periods calculated based on two adjacent columns.
     """
 
-    def __init__(self, expr, start_date, end_date, flags, occurrence_range):
+    __slots__ = ("expr", "start_date", "end_date", "flags", "occurrence_range")
+
+    def __init__(self, expr, start_date, end_date, flags, occurrence_range=None):
         self.expr = expr
         self.start_date = start_date
         self.end_date = end_date
         self.flags = flags
-        self.occurrence_range = occurrence_range
+        self.occurrence_range = occurrence_range if occurrence_range is not None else []
 
     def __hash__(self):
         return self.expr.__hash__()
@@ -278,6 +517,20 @@ class FinTabDerivedPeriod:
             return True
         return not self.__eq__(other)
 
+    @staticmethod
+    def between(period1, period2, kind):
+        """
+        Returns the derived period that spans from period1 to period2.
+        :param kind: The kind of delta over the derived period, e.g. "delta%".
+        """
+        return FinTabDerivedPeriod(
+            period1.expr + " to " + period2.expr + " " + kind + " [derived]",
+            period1.start_date,
+            period2.end_date,
+            period1.flags + period2.flags,
+            period1.occurrence_range + period2.occurrence_range,
+        )
+
     @staticmethod
     def calculate(amount1, period1, amount2, period2):
         """
@@ -299,13 +552,7 @@ class FinTabDerivedPeriod:
         else:
             a1, p1, a2, p2 = amount2, period2, amount1, period2  # noqa: F841
         # Calculate the period-on-period span and create a new derived period object.
-        return FinTabDerivedPeriod(
-            p1.expr + " to " + p2.expr + " delta [derived]",
-            p1.start_date,
-            p2.end_date,
-            p1.flags + p2.flags,
-            p1.occurrence_range + p2.occurrence_range,
-        )
+        return FinTabDerivedPeriod.between(p1, p2, "delta")
 
     def to_json(self):
         """
@@ -0,0 +1,107 @@
+from itertools import compress
+
+import numpy as np
+
+from sfinx.fintypes.attributes.amounts import FinTabAmount
+from sfinx.fintypes.attributes.valtypes import FinTabValTypes
+
+
+class FinTabShares:
+    """
+    Calculates the shares of total of a group of metrics (e.g. all the metrics of a worksheet)
+    and of their sub-metrics at once.
+    The amounts of the sub-metrics of each metric are grouped by period and type, and the totals and shares of all
+    the groups are calculated in one vectorized pass.
+    """
+
+    # integers and floating point numbers are grouped with currencies
+    GROUP_TYPES = {t: FinTabValTypes.CURRENCY for t in FinTabAmount.DELTA_TYPES}
+
+    def __init__(self, metrics):
+        """
+        :param metrics: A list of FinTabMetric objects.
+        """
+        self.amounts = []  # the amounts whose shares are calculated
+        self.groups = []  # the group of each amount
+        self.totaled_groups = []  # whether the shares of each group are set
+        for metric in metrics:
+            self._gather(metric)
+        self._calculate()
+
+    def _gather(self, metric):
+        """
+        Groups the amounts of the sub-metrics of a metric (except totals) by period and type,
+        then those of the sub-metrics of its sub-metrics.
+        Percentages are left out (they already reflect shares), and integers and floating point numbers are
+        grouped with currencies.
+        """
+        period_to_groups = {}  # map of periods to maps of amount types to groups
+        for smn, sm in metric.name_to_sub_metric.items():
+            if "total" not in smn.lower():
+                self._gather_amounts(sm, period_to_groups)
+        # Only the groups that are kept get shares.
+        for type_to_group in period_to_groups.values():
+            for group in type_to_group.values():
+                self.totaled_groups[group] = True
+        for sm in metric.name_to_sub_metric.values():
+            self._gather(sm)
+
+    def _gather_amounts(self, sub_metric, period_to_groups):
+        """
+        Adds the amounts of a sub-metric to the groups of their period and type.
+        :param period_to_groups: The map of periods to maps of amount types to groups of the sub-metrics of a metric.
+        """
+        # the derived change rates are not needed here, so they are left for when the metric is output
+        for period, amount in sub_metric._period_to_amount.items():
+            if "[derived]" in period.expr:
+                continue
+            amount_type = amount.amount_type
+            if amount_type == FinTabValTypes.PERCENT:
+                continue
+            type_to_group = period_to_groups.get(period)
+            if type_to_group is None:
+                type_to_group = period_to_groups[period] = {}
+            # Groups are looked up by the currency type, but kept by the type of the amount,
+            # so that an integer or floating point number met before any currency starts a group of its own,
+            # which the next one of the same type replaces.
+            group = type_to_group.get(self.GROUP_TYPES.get(amount_type, amount_type))
+            if group is None:
+                group = len(self.totaled_groups)
+                self.totaled_groups.append(False)
+            type_to_group[amount_type] = group
+            self.amounts.append(amount)
+            self.groups.append(group)
+
+    def _calculate(self):
+        n = len(self.amounts)
+        values = [x.amount for x in self.amounts]
+        groups = np.array(self.groups, dtype=np.int64)
+        all_numbers = set(map(type, values)) <= {int, float, bool}
+        if not all_numbers:
+            numbers = np.array([type(x) in (int, float, bool) for x in values], dtype=bool)
+            values = [x if is_number else 0.0 for x, is_number in zip(values, numbers)]
+        values = np.array(values, dtype=float)
+        # Integral values beyond this magnitude may be integers too large to add up exactly in floating point.
+        inexact = (np.abs(values) > 2**53 // max(n, 1)) & (values == np.trunc(values))
+        if not all_numbers:
+            inexact |= ~numbers
+        values[inexact] = 0.0
+        # Amounts are added up in order within each group, the same way as sum.
+        totaled = np.array(self.totaled_groups, dtype=bool)
+        totals = np.bincount(groups, weights=values, minlength=len(totaled))[groups]
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            shares = np.where(totals != 0.0, values * 100.0 / totals, 0.0)
+        # Groups with amounts that are not numbers (or too large integers) are calculated with the formulas below.
+        calculated = totaled.copy()
+        calculated[groups[inexact]] = False
+        selected = calculated[groups]
+        for amount, share in zip(compress(self.amounts, selected), shares[selected].tolist()):
+            amount.share_of_total = share
+        selected = totaled[groups] & ~selected
+        members = {}  # map of the other groups to their amounts
+        for amount, group in zip(compress(self.amounts, selected), groups[selected].tolist()):
+            members.setdefault(group, []).append(amount)
+        for group, amounts in members.items():
+            total = sum([x.amount for x in amounts])
+            for x in amounts:
+                x.share_of_total = (x.amount * 100.0 / total) if total != 0.0 else 0.0
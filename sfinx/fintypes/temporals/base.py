@@ -8,6 +8,10 @@ class Temporal:
     Represents any temporal expression such as years, quarters, months, semi-annual periods, or exact dates.
     """
 
+    # Words that are likely to express a period, such as "quarter", "months ended" or "q1"
+    PERIOD_WORDS = re.compile(r"\b(quarter|qtr|months|mos|days|ended|ending|period|[1-4]q|q[1-4]|q|[12][0-9]{3})\b")
+    MAY = re.compile(r"\bmay[\-\s.][0-9]+")
+
     def __init__(self, name):
         self.name = name
         self.regexes = []
@@ -29,12 +33,10 @@ class Temporal:
         for month in months:
             if month.get(l):
                 return True
-        regex = re.compile(r"\b(quarter|qtr|months|mos|days|ended|ending|period|[1-4]q|q[1-4]|q|[12][0-9]{3})\b")
-        output = header.val_type == FinTabValTypes.TEXT and regex.search(l)
+        output = header.val_type == FinTabValTypes.TEXT and Temporal.PERIOD_WORDS.search(l)
         if output:
             return True
-        regex2 = re.compile(r"\bmay[\-\s.][0-9]+")
-        if regex2.search(l):
+        if Temporal.MAY.search(l):
             return True
         if l == "may":
             return True
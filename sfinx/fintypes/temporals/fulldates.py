@@ -1,24 +1,79 @@
-import dateparser
+import re
+from datetime import datetime
 
 from sfinx.fintypes.temporals.base import Temporal
 
+_MONTH = (
+    r"(?P<month>jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sept?(?:ember)?"
+    r"|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+)
+_MONTHS = {
+    m: i for i, m in enumerate(["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)
+}
+
 
 class FullDate(Temporal):
     """
     Represents a full date expression.
     """
 
+    # The formats of dates that financial tables use, e.g. 9/30/2020, 2020-09-30, Sep 30, 2020 or 30-Sep-20.
+    FORMATS = [
+        re.compile(r"(?P<month>[0-9]{1,2})(?P<sep>[/.\-])(?P<day>[0-9]{1,2})(?P=sep)(?P<year>[0-9]{4}|[0-9]{2})"),
+        re.compile(r"(?P<year>[0-9]{4})(?P<sep>[/.\-])(?P<month>[0-9]{1,2})(?P=sep)(?P<day>[0-9]{1,2})"),
+        re.compile(_MONTH + r"\s*(?P<day>[0-9]{1,2})(?:,\s*|\s+)(?P<year>[0-9]{4})"),
+        re.compile(r"(?P<day>[0-9]{1,2})(?:-|\s+)" + _MONTH + r",?(?:-|\s+)(?P<year>[0-9]{4}|[0-9]{2})"),
+    ]
+    _parser = None  # the dateparser parser of English dates, created on first use
+
     def __init__(self):
         super().__init__(self.__name__)  # pylint: disable=no-member
 
+    @staticmethod
+    def find_exact(text):
+        """
+        Finds a date in a string that consists of one of FORMATS only.
+        :param text: input string
+        :return: the date expressed in text, if it matches one of FORMATS (or None)
+        """
+        text = text.strip()
+        for regex in FullDate.FORMATS:
+            hit = regex.fullmatch(text)
+            if not hit:
+                continue
+            month = hit.group("month")
+            month = int(month) if month.isdigit() else _MONTHS[month[:3]]
+            year = int(hit.group("year"))
+            if year < 100:  # two digit years are read the same way as by dateparser, e.g. 20 is 2020 and 69 is 1969
+                year += 2000 if year < 69 else 1900
+            try:
+                return datetime(year, month, int(hit.group("day")))
+            except ValueError:
+                return None
+        return None
+
+    @staticmethod
+    def get_parser():
+        """
+        Returns the dateparser parser of English dates, which is created once since loading its language data is slow.
+        """
+        if FullDate._parser is None:
+            from dateparser.date import DateDataParser
+
+            FullDate._parser = DateDataParser(languages=["en"])
+        return FullDate._parser
+
     @staticmethod
     def find(text):
         """
-        Finds the occurrence of a date in a string
+        Finds the occurrence of a date in a string, with dateparser if it doesn't match one of FORMATS
         :param text: input string
         :return: full expression of date in text, if present (or None)
         """
-        t = dateparser.parse(text)
+        t = FullDate.find_exact(text)
+        if t:
+            return t
+        t = FullDate.get_parser().get_date_data(text).date_obj
         if t:
             return t
         return None
@@ -0,0 +1,171 @@
+import json
+import sqlite3
+from collections import OrderedDict
+from datetime import date, datetime
+
+from dateutil.relativedelta import relativedelta
+
+
+class TemporalMemo:
+    """
+    Memoizes the temporal components parsed from header strings (years, quarters, semi-annual periods,
+    ending periods, months and full dates), across worksheets and workbooks.
+    Entries are kept in a bounded in-process map that evicts its least recently used entries first,
+    and can be persisted to a SQLite file so that later runs reuse them.
+    Full dates may be completed with the current day (e.g. "sep 2020"), so they are only reused on the day
+    they were parsed, unless the dateparser fallback is disabled and dates are only parsed from FullDate.FORMATS.
+    """
+
+    # the year, quarter, semi-annual period, ending period and month of a string, and whether it expresses a period
+    COMPONENTS = "components"
+    DATE = "date"  # the full date expressed in a string
+    EXACT_DATE = "exact_date"  # the full date expressed in a string that matches one of FullDate.FORMATS
+    DEFAULT_MAX_ENTRIES = 100_000
+    FLUSH_SIZE = 1000  # number of new entries that are written to the SQLite file at once
+    _opened = {}  # map of (path, max_entries, date_fallback) to the memo opened by the current process
+
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES, date_fallback=True):
+        """
+        :param path: The path to a SQLite file that persists the entries (optional).
+        :param max_entries: The maximum number of entries kept in memory.
+        :param date_fallback: Indicates whether dates that don't match one of FullDate.FORMATS are parsed
+        by dateparser.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.date_fallback = date_fallback
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # map of (kind, text) to (value, day the value was parsed on)
+        self._pending = {}  # entries that are not yet written to the SQLite file
+        self._db = None
+
+    @staticmethod
+    def open(path=None, max_entries=DEFAULT_MAX_ENTRIES, date_fallback=True):
+        """
+        Returns the memo of the current process for the given SQLite file, so that its entries are shared
+        by all the workbooks that the process normalizes.
+        """
+        key = (path, max_entries, date_fallback)
+        if key not in TemporalMemo._opened:
+            TemporalMemo._opened[key] = TemporalMemo(path, max_entries, date_fallback)
+        return TemporalMemo._opened[key]
+
+    def __reduce__(self):
+        # Worker processes reopen the memo of the same file, rather than copying its entries.
+        return TemporalMemo.open, (self.path, self.max_entries, self.date_fallback)
+
+    def _connect(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, timeout=30)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS temporals "
+                "(kind TEXT, text TEXT, value TEXT, parsed_on TEXT, PRIMARY KEY (kind, text))"
+            )
+        return self._db
+
+    @staticmethod
+    def _encode(kind, value):
+        if kind in (TemporalMemo.DATE, TemporalMemo.EXACT_DATE):
+            return json.dumps(value.isoformat() if value else None)
+        year, quarter, semi, ended, month, expresses_period = value
+        ended = [ended.months, ended.days] if ended else None
+        return json.dumps([year, quarter, semi, ended, month, expresses_period])
+
+    @staticmethod
+    def _decode(kind, value):
+        value = json.loads(value)
+        if kind in (TemporalMemo.DATE, TemporalMemo.EXACT_DATE):
+            return datetime.fromisoformat(value) if value else None
+        year, quarter, semi, ended, month, expresses_period = value
+        ended = relativedelta(months=ended[0], days=ended[1]) if ended else None
+        return year, quarter, semi, ended, month, expresses_period
+
+    def _load(self, kind, text, today):
+        """
+        Looks an entry up in the SQLite file.
+        :return: The stored value, or None if there is no reusable entry.
+        """
+        row = (
+            self._connect()
+            .execute("SELECT value, parsed_on FROM temporals WHERE kind = ? AND text = ?", (kind, text))
+            .fetchone()
+        )
+        if row is None or (kind == TemporalMemo.DATE and row[1] != today):
+            return None
+        try:
+            return self._decode(kind, row[0]), row[1]
+        except (ValueError, TypeError):  # entries stored in an older format are parsed again
+            return None
+
+    def get(self, kind, text, parse):
+        """
+        Returns the value of a temporal component of a string, parsing it only if it isn't memoized.
+        :param kind: One of COMPONENTS, DATE and EXACT_DATE.
+        :param text: The (lowercased) header string.
+        :param parse: The function that parses the string into the value.
+        """
+        key = (kind, text)
+        entry = self._entries.get(key)
+        today = date.today().isoformat() if entry is None or kind == TemporalMemo.DATE else entry[1]
+        if entry is not None and entry[1] != today:
+            entry = None
+        if entry is None and self.path is not None:
+            entry = self._load(kind, text, today)
+        if entry is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            entry = (parse(text), today)
+            if self.path is not None:
+                self._pending[key] = entry
+                if len(self._pending) >= self.FLUSH_SIZE:
+                    self.flush()
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry[0]
+
+    def flush(self):
+        """
+        Writes the new entries to the SQLite file.
+        Another process may hold the lock on the file, in which case the entries are written with the next flush.
+        """
+        if self.path is None or not self._pending:
+            return
+        rows = [(kind, text, self._encode(kind, value), on) for (kind, text), (value, on) in self._pending.items()]
+        try:
+            with self._connect() as db:
+                db.executemany("INSERT OR REPLACE INTO temporals VALUES (?, ?, ?, ?)", rows)
+        except sqlite3.OperationalError:
+            return
+        self._pending = {}
+
+    def counters(self):
+        """
+        Returns the hit, miss and eviction counters of the memo, e.g. to send those of a worker process back.
+        """
+        return self.hits, self.misses, self.evictions
+
+    def add_counters(self, hits, misses, evictions):
+        """
+        Adds the counters of the lookups that a worker process made in its own copy of the memo.
+        """
+        self.hits += hits
+        self.misses += misses
+        self.evictions += evictions
+
+    def stats(self):
+        """
+        Returns the hit and miss counters of the memo.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+        }
@@ -0,0 +1,56 @@
+import re
+
+from sfinx.fintypes.temporals.base import Temporal
+from sfinx.fintypes.temporals.ending import Ending
+from sfinx.fintypes.temporals.months import Month
+from sfinx.fintypes.temporals.quarters import Quarter
+from sfinx.fintypes.temporals.semis import Semi
+from sfinx.fintypes.temporals.years import Year
+
+
+class TemporalScanner:
+    """
+    Finds all the temporal expressions of a header string at once: its year, quarter, semi-annual period,
+    ending period and month, and whether it is likely to express a period at all.
+    The regexes of all temporal expressions are combined into one regex, so that the many header strings that
+    don't express any periods are ruled out in a single pass.
+    """
+
+    NONE = (None, None, None, None, None, False)
+
+    def __init__(self, years, quarters, semis, ending_periods, months):
+        """
+        :param years: a list of Year objects, by order of precedence
+        :param quarters: a list of Quarter objects, by order of precedence
+        :param semis: a list of Semi objects, by order of precedence
+        :param ending_periods: a list of Ending objects, by order of precedence
+        :param months: a list of Month objects, by order of precedence
+        """
+        self.years = years
+        self.quarters = quarters
+        self.semis = semis
+        self.ending_periods = ending_periods
+        self.months = months
+        regexes = [r for t in years + quarters + semis + ending_periods + months for r in t.regexes]
+        regexes.append(Temporal.PERIOD_WORDS)
+        self.regex = re.compile("|".join(f"(?:{r.pattern})" for r in regexes))
+
+    def scan(self, text):
+        """
+        Finds the temporal expressions of a string
+        :param text: input string (lowercased)
+        :return: A tuple of the year, quarter, semi-annual period, ending period and month expressed in text
+        (each of them None if text does not express it), followed by a boolean indicating whether text is likely
+        to include an expression of period (i.e. a month or one of Temporal.PERIOD_WORDS).
+        """
+        if not self.regex.search(text):
+            return TemporalScanner.NONE
+        month = Month.find(text, self.months)
+        return (
+            Year.find(text, self.years),
+            Quarter.find(text, self.quarters),
+            Semi.find(text, self.semis),
+            Ending.find(text, self.ending_periods),
+            month,
+            month is not None or Temporal.PERIOD_WORDS.search(text) is not None,
+        )
@@ -1,11 +1,15 @@
 import argparse
-import json
+import io
 import sys
 import warnings
 from pathlib import Path
 
+from sfinx.cache import FinResultCache
+from sfinx.fintypes.components.sheet import FinSheet
 from sfinx.fintypes.components.workbook import FinWorkbook
+from sfinx.fintypes.temporals.memo import TemporalMemo
 from sfinx.processors.metric_normalizer import FinTabMetricNormalizer
+from sfinx.processors.parallel_normalizer import FinTabParallelNormalizer
 from sfinx.processors.period_normalizer import FinTabPeriodNormalizer
 
 # Ignore dateparser warnings regarding pytz
@@ -15,7 +19,19 @@ warnings.filterwarnings(
 )
 
 INPUT_EXTENSIONS = ["xlsx"]
-OUTPUT_EXTENSIONS = [".tsv", ".json"]
+OUTPUT_EXTENSIONS = [".tsv", ".json", ".ndjson"]
+
+
+def cell_budget(value):
+    """
+    Parses the --max-cells argument, which must allow at least one cell.
+    """
+    max_cells = int(value)
+    if max_cells < 1:
+        raise argparse.ArgumentTypeError(f"the cell budget must be at least 1, not {max_cells}")
+    return max_cells
+
+
 my_parser = argparse.ArgumentParser(description="Run SFinX normalizer on input data and store in output.")
 
 # Add the arguments
@@ -23,6 +39,77 @@ my_parser.add_argument("--input", "-i", dest="input_path", type=str, help="The p
 
 my_parser.add_argument("--output", "-o", dest="output_path", type=str, help="The path to output file.")
 
+my_parser.add_argument(
+    "--read-only",
+    dest="read_only",
+    action="store_true",
+    help="Stream worksheets row by row instead of loading the full workbook into memory.",
+)
+
+my_parser.add_argument(
+    "--engine",
+    dest="engine",
+    type=str,
+    default=FinWorkbook.ENGINE_OPENPYXL,
+    choices=FinWorkbook.ENGINES,
+    help="The engine that reads workbooks. The xml engine parses worksheets directly from their xml source.",
+)
+
+my_parser.add_argument(
+    "--max-cells",
+    dest="max_cells",
+    type=cell_budget,
+    default=FinSheet.DEFAULT_MAX_CELLS,
+    help="The maximum number of cells within the used range of a worksheet. Larger worksheets are rejected.",
+)
+
+my_parser.add_argument(
+    "--truncate",
+    dest="truncate",
+    action="store_true",
+    help="Truncate worksheets beyond --max-cells to their first rows instead of rejecting them.",
+)
+
+my_parser.add_argument(
+    "--workers",
+    "-w",
+    dest="workers",
+    type=int,
+    default=1,
+    help="The number of worker processes that normalize worksheets in parallel.",
+)
+
+my_parser.add_argument(
+    "--cache-dir",
+    dest="cache_dir",
+    type=str,
+    default=None,
+    help="A directory where outputs are cached by the content of their input workbook.",
+)
+
+my_parser.add_argument(
+    "--cache-size",
+    dest="cache_size",
+    type=int,
+    default=FinResultCache.DEFAULT_MAX_BYTES >> 20,
+    help="The maximum size of the cache in MB.",
+)
+
+my_parser.add_argument(
+    "--period-cache",
+    dest="period_cache",
+    type=str,
+    default=None,
+    help="A SQLite file where the periods parsed from header strings are kept across runs.",
+)
+
+my_parser.add_argument(
+    "--no-date-fallback",
+    dest="no_date_fallback",
+    action="store_true",
+    help="Only parse full dates in the formats of FullDate.FORMATS, without falling back to dateparser.",
+)
+
 
 def recursive_print_per_sheet(sheet_name, metric, map):
     if len(map) == 0:
@@ -60,23 +147,89 @@ def recursive_print(path):
     return True
 
 
-def generate_output(input, extension, is_path):
-    wb = FinWorkbook(input, from_path=is_path)
-    period_norm = FinTabPeriodNormalizer(wb)  # noqa: F841
-    metric_norm = FinTabMetricNormalizer(wb)
-    j = metric_norm.to_json()
+def generate_output(
+    input,
+    extension,
+    is_path,
+    read_only=False,
+    workers=1,
+    cache=None,
+    engine=FinWorkbook.ENGINE_OPENPYXL,
+    max_cells=FinSheet.DEFAULT_MAX_CELLS,
+    truncate=False,
+    temporals=None,
+):
+    options = {"engine": engine, "max_cells": max_cells, "truncate": truncate}
+    if cache is not None and extension in OUTPUT_EXTENSIONS:
+        content = Path(input).read_bytes() if is_path else input
+        # The cell budget changes the output of large worksheets, and the date parser that of some headers,
+        # so they are part of the key.
+        config = {"extension": extension, "max_cells": max_cells, "truncate": truncate}
+        if temporals is not None and not temporals.date_fallback:
+            config["date_fallback"] = False
+        key = cache.key(content, config)
+        j = cache.get(key, extension)
+        if j is None:
+            j = generate_output(
+                content, extension, False, read_only=read_only, workers=workers, temporals=temporals, **options
+            )
+            cache.put(key, extension, j)
+        return j
+    datapoints = get_datapoints(input, is_path, read_only=read_only, workers=workers, temporals=temporals, **options)
+    if extension in OUTPUT_EXTENSIONS:
+        f = io.StringIO()
+        write_output(datapoints, extension, f)
+        return f.getvalue()
+    return datapoints.to_json()
+
+
+def get_datapoints(input, is_path, read_only=False, workers=1, temporals=None, **options):
+    """
+    Normalizes a workbook, and returns its metrics as a FinTabDatapoints store.
+    :param options: The engine, max_cells and truncate keyword arguments of generate_output.
+    """
+    if workers > 1:
+        metric_norm = FinTabParallelNormalizer(
+            input, from_path=is_path, workers=workers, temporals=temporals, **options
+        )
+    else:
+        wb = FinWorkbook(input, from_path=is_path, read_only=read_only, **options)
+        period_norm = FinTabPeriodNormalizer(wb, temporals)  # noqa: F841
+        metric_norm = FinTabMetricNormalizer(wb)
+    return metric_norm.to_datapoints()
+
+
+def write_output(datapoints, extension, f):
+    """
+    Writes the output of a workbook in the format of an output extension.
+    The .json and .ndjson outputs are written as they are generated, rather than built in memory first.
+    :param datapoints: The FinTabDatapoints of the workbook.
+    :param extension: One of OUTPUT_EXTENSIONS.
+    :param f: A text file, or any object with a write method (e.g. a socket file).
+    """
     if extension == ".tsv":
-        j = FinTabMetricNormalizer.to_tsv(j)
-    if extension == ".json":
-        j = json.dumps(j)
-    return j
+        f.write(datapoints.to_tsv())
+    elif extension == ".ndjson":
+        datapoints.write_ndjson(f)
+    else:
+        datapoints.write_json(f)
 
 
-def run_from_path(input, output_path):
-    j = generate_output(input, output_path.suffix, True)
+def run_from_path(input, output_path, cache=None, **options):
+    """
+    Writes the output of a workbook into a file, in the format of the extension of its path.
+    Without a cache, the output is streamed into the file rather than built in memory.
+    :return: The output with a cache, or the FinTabDatapoints of the workbook without one.
+    """
+    if cache is not None:
+        j = generate_output(input, output_path.suffix, True, cache=cache, **options)
+        with open(output_path, "w") as f:
+            f.write(j)
+        return j
+    datapoints = get_datapoints(input, True, **options)
     with open(output_path, "w") as f:
-        f.write(j)
-    return j
+        write_output(datapoints, output_path.suffix, f)
+    return datapoints
 
 
 if __name__ == "__main__":
@@ -93,4 +246,21 @@ if __name__ == "__main__":
         print(f'The given file extension "{output_extension}" does not match one of {OUTPUT_EXTENSIONS}')
         sys.exit(1)
 
-    run_from_path(input_path, output_path)
+    cache = FinResultCache(args.cache_dir, max_bytes=args.cache_size << 20) if args.cache_dir else None
+    temporals = None
+    if args.period_cache or args.no_date_fallback:
+        temporals = TemporalMemo.open(args.period_cache, date_fallback=not args.no_date_fallback)
+    run_from_path(
+        input_path,
+        output_path,
+        read_only=args.read_only,
+        workers=args.workers,
+        cache=cache,
+        engine=args.engine,
+        max_cells=args.max_cells,
+        truncate=args.truncate,
+        temporals=temporals,
+    )
+    if args.period_cache:
+        stats = temporals.stats()
+        print(f"Period cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate).")
@@ -1,4 +1,7 @@
+from sfinx.fintypes.change_rates import FinTabChangeRates
+from sfinx.fintypes.datapoints import FinTabDatapoints
 from sfinx.fintypes.metric import FinTabMetric
+from sfinx.fintypes.shares import FinTabShares
 
 
 class FinTabMetricNormalizer:
@@ -32,57 +35,67 @@ class FinTabMetricNormalizer:
         Keeps track of different values of the same metric over different periods.
         """
         for sheet_name, sheet in self.wb.sheets.items():
-            for coords, cell in sheet.cells.items():
-                # Empty cells cannot be part of a hierarchy group.
-                if cell.is_empty:
-                    continue
-                # Cells not attached to a period cannot be part of a hierarchy group.
-                if not cell.period:
-                    continue
-                # Cells that don't have a hierarchy cannot be part of a hierarchy group.
-                if not cell.metrics_hierarchy:
-                    continue
-                # If the cell passes all requirements,
-                # ensure that its hierarchy group is recorded in the corresponding worksheet.
-                metric = cell.metrics_hierarchy[0]
-                m = self._populate_sheet_to_metrics(sheet_name, metric)
-                # Also ensure that all sub-metrics in its hierarchy are tracked by super-metrics.
-                for metric in cell.metrics_hierarchy[1:]:
-                    m = m.add_sub_metric(metric)
-                # Finally, ensure that the periods and amounts are aligned for the current metric.
-                m.add_period_amount(cell)
+            for table in sheet.tables:
+                for coords, cell in table.items():
+                    # Empty cells cannot be part of a hierarchy group.
+                    if cell.is_empty:
+                        continue
+                    # Cells not attached to a period cannot be part of a hierarchy group.
+                    if not cell.period:
+                        continue
+                    # Cells that don't have a hierarchy cannot be part of a hierarchy group.
+                    if not cell.metrics_hierarchy:
+                        continue
+                    # If the cell passes all requirements,
+                    # ensure that its hierarchy group is recorded in the corresponding worksheet.
+                    metric = cell.metrics_hierarchy[0]
+                    m = self._populate_sheet_to_metrics(sheet_name, metric)
+                    # Also ensure that all sub-metrics in its hierarchy are tracked by super-metrics.
+                    for metric in cell.metrics_hierarchy[1:]:
+                        m = m.add_sub_metric(metric)
+                    # Finally, ensure that the periods and amounts are aligned for the current metric.
+                    m.add_period_amount(cell)
 
-    def _set_change_rates(self):
+    def _metrics_per_sheet(self):
         """
-        For all metric groups, calculates period-on-period change rates.
+        Returns the metric groups of each worksheet.
         """
+        sheet_to_metrics = {}
         for sheet_name, metric in self.sheet_to_metrics:
-            m = self.sheet_to_metrics[(sheet_name, metric)]
-            m.set_change_rates()
+            sheet_to_metrics.setdefault(sheet_name, []).append(self.sheet_to_metrics[(sheet_name, metric)])
+        return sheet_to_metrics.values()
+
+    def _set_change_rates(self):
+        """
+        For all metric groups, calculates period-on-period change rates, those of each worksheet at once.
+        """
+        for metrics in self._metrics_per_sheet():
+            FinTabChangeRates(metrics)
 
     def _set_shares(self):
         """
-        For all metric groups, calculates shares of total for each sub-metric.
+        For all metric groups, calculates shares of total for each sub-metric, those of each worksheet at once.
         """
-        for sheet_name, metric in self.sheet_to_metrics:
-            m = self.sheet_to_metrics[(sheet_name, metric)]
-            m.set_shares()
+        for metrics in self._metrics_per_sheet():
+            FinTabShares(metrics)
+
+    def to_datapoints(self):
+        """
+        Returns the metrics in the workbook as a columnar FinTabDatapoints store.
+        """
+        return FinTabDatapoints(self.sheet_to_metrics)
 
     def to_json(self):
         """
         Returns json representation of all metrics in the workbook.
         """
-        j = []
+        sheets = {}  # map of worksheet names to their json representations, in order
         for sheet_name, metric in self.sheet_to_metrics:
-            ss = [x for x in j if x["sheet_name"] == sheet_name]
-            if len(ss) > 0:
-                s = ss[0]
-            else:
-                s = {"sheet_name": sheet_name, "metrics": []}
-                j.append(s)
+            if sheet_name not in sheets:
+                sheets[sheet_name] = {"sheet_name": sheet_name, "metrics": []}
             m = self.sheet_to_metrics[(sheet_name, metric)]
-            s["metrics"].append(m.to_json())
-        return j
+            sheets[sheet_name]["metrics"].append(m.to_json())
+        return list(sheets.values())
 
     @staticmethod
     def to_list(j):
@@ -115,41 +128,27 @@ class FinTabMetricNormalizer:
                 for sub in subs:
                     yield [j["sheet_name"]] + sub
 
+    @staticmethod
+    def workbook_to_list(j):
+        """
+        Returns list representation of the dictionary object j of a workbook, with the file name of the workbook
+        added as the first column (see sfinx.batch).
+        """
+        for sheet in j["sheets"]:
+            for sub in FinTabMetricNormalizer.to_list(sheet):
+                yield [j["file_name"]] + sub
+
     @staticmethod
     def to_tsv(j):
         """
         Returns tsv representation of dictionary object j.
+        j is either the list of worksheets of a workbook, or a list of workbooks (see sfinx.batch),
+        in which case the file name of each workbook is added as the first column.
         """
-        l = [list(FinTabMetricNormalizer.to_list(sheet)) for sheet in j]
-        max_len = max([len(x) for sheet in l for x in sheet])
-        output = (
-            "\t".join(
-                ["sheet_name", "metric"]
-                + ["sub_metric" for x in range(max_len - 13)]
-                + [
-                    "period_expr",
-                    "period_start",
-                    "period_end",
-                    "period_flags",
-                    "row_idx",
-                    "col_idx",
-                    "amount_expr",
-                    "amount_type",
-                    "amount_scale",
-                    "amount_currency",
-                    "pct_share_of_total",
-                ]
-            )
-            + "\n"
-        )
-        for sheet in l:
-            for x in sheet:
-                output += (
-                    "\t".join(
-                        [str(y).replace("\n", " ").replace("\r", " ").replace("\t", " ") for y in x[:-11]]
-                        + ["" for x in range(max_len - len(x))]
-                        + [str(y).replace("\n", " ").replace("\r", " ").replace("\t", " ") for y in x[-11:]]
-                    )
-                    + "\n"
-                )
-        return output
+        if len(j) > 0 and "sheets" in j[0]:
+            l = [list(FinTabMetricNormalizer.workbook_to_list(workbook)) for workbook in j]
+            prefix = ["file_name", "sheet_name"]
+        else:
+            l = [list(FinTabMetricNormalizer.to_list(sheet)) for sheet in j]
+            prefix = ["sheet_name"]
+        return FinTabDatapoints.format_tsv([x for sheet in l for x in sheet], prefix)
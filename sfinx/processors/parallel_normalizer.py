@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from openpyxl import load_workbook
+
+from sfinx.fintypes.components.sheet import FinSheet
+from sfinx.fintypes.components.workbook import FinWorkbook
+from sfinx.fintypes.temporals.memo import TemporalMemo
+from sfinx.processors.metric_normalizer import FinTabMetricNormalizer
+from sfinx.processors.period_normalizer import FinTabPeriodNormalizer
+
+# The workbook whose worksheets are processed by the current worker process.
+_worker_source = {}
+
+
+def _init_worker(fl, from_path, options, temporals=None):
+    """
+    Hands the workbook over to a worker process once, rather than once per worksheet.
+    :param options: Keyword arguments of FinWorkbook that apply to every worksheet.
+    :param temporals: The TemporalMemo of parsed header strings (optional).
+    """
+    _worker_source["fl"] = fl
+    _worker_source["from_path"] = from_path
+    _worker_source["options"] = options
+    _worker_source["temporals"] = temporals
+
+
+def _normalize_sheet(sheet_name):
+    """
+    Runs the full pipeline on a single worksheet.
+    :param sheet_name: The name of the worksheet.
+    :return: A tuple of the metrics of the worksheet, keyed the same way as FinTabMetricNormalizer.sheet_to_metrics,
+    and the counters of the lookups in the TemporalMemo of the worker process.
+    """
+    temporals = _worker_source["temporals"]
+    temporals = temporals if temporals is not None else TemporalMemo.open()
+    counters = temporals.counters()
+    # Only the requested worksheet is parsed, so workers always stream it from a read-only workbook.
+    wb = FinWorkbook(
+        _worker_source["fl"],
+        from_path=_worker_source["from_path"],
+        read_only=True,
+        sheet_names=[sheet_name],
+        **_worker_source["options"],
+    )
+    FinTabPeriodNormalizer(wb, temporals)
+    return FinTabMetricNormalizer(wb).sheet_to_metrics, [n - m for n, m in zip(temporals.counters(), counters)]
+
+
+class FinTabParallelNormalizer(FinTabMetricNormalizer):
+    """
+    Normalizes the metrics in a workbook by running the full pipeline (cells, periods and metrics)
+    on each worksheet in a pool of worker processes.
+    Worksheets are independent of each other, so the results are merged in worksheet order,
+    and match the output of running the pipeline on the whole workbook.
+    """
+
+    def __init__(
+        self,
+        fl,
+        from_path=True,
+        workers=None,
+        engine=FinWorkbook.ENGINE_OPENPYXL,
+        max_cells=FinSheet.DEFAULT_MAX_CELLS,
+        truncate=False,
+        temporals=None,
+    ):
+        """
+        :param fl: Path to the workbook, or its content as bytes.
+        :param from_path: Indicates whether fl is a path.
+        :param workers: Number of worker processes (defaults to the number of CPUs).
+        :param engine: The engine that reads the workbook, one of FinWorkbook.ENGINES.
+        :param max_cells: The maximum number of cells within the used range of each worksheet (None for no limit).
+        :param truncate: Indicates whether worksheets beyond max_cells are truncated rather than rejected.
+        :param temporals: The TemporalMemo of parsed header strings, reopened by each worker process (optional).
+        """
+        self.wb = None
+        self.workers = workers or os.cpu_count() or 1
+        self.options = {"engine": engine, "max_cells": max_cells, "truncate": truncate}
+        self.temporals = temporals
+        self.sheet_to_metrics = {}
+        self._populate_in_parallel(fl, from_path)
+
+    def _populate_in_parallel(self, fl, from_path):
+        """
+        Fans the worksheets out to the worker processes and merges their metrics in worksheet order.
+        The counters of the TemporalMemo of each worker are added to those of the memo of the current process.
+        """
+        temporals = self.temporals if self.temporals is not None else TemporalMemo.open()
+        wb = load_workbook(fl if from_path else BytesIO(fl), read_only=True)
+        sheet_names = wb.sheetnames
+        wb.close()
+        if len(sheet_names) == 0:
+            return
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(sheet_names)),
+            initializer=_init_worker,
+            initargs=(fl, from_path, self.options, self.temporals),
+        ) as pool:
+            for sheet_to_metrics, counters in pool.map(_normalize_sheet, sheet_names):
+                self.sheet_to_metrics.update(sheet_to_metrics)
+                temporals.add_counters(*counters)
@@ -1,16 +1,68 @@
-from sfinx.fintypes.period import FinTabPeriod
+from sfinx.fintypes.period import FinTabPeriod, FinTabPeriodMap
+from sfinx.fintypes.temporals.memo import TemporalMemo
 
 
 class FinTabPeriodNormalizer:
-    def __init__(self, workbook):
+    def __init__(self, workbook, temporals=None, period_map=None):
+        """
+        :param workbook: A FinWorkbook.
+        :param temporals: The TemporalMemo of parsed header strings (the memo of the current process by default).
+        :param period_map: The FinTabPeriodMap of the periods expressed by the headers of the workbook,
+        e.g. to share it with another normalizer of the same workbook (a new map by default).
+        """
         self.wb = workbook
-        self.header_to_period_map = {}
+        self.temporals = temporals if temporals is not None else TemporalMemo.open()
+        self.header_to_period_map = period_map if period_map is not None else FinTabPeriodMap()
+        self._found_periods = {}  # map of header chains to the period expressions found in them
+        self._expresses_period = {}  # map of header chains to whether they include an expression of period
         self._set_periods_and_hierarchy()
 
     def _set_periods_and_hierarchy(self):
         for sheet_name, sheet in self.wb.sheets.items():
-            for coords, cell in sheet.cells.items():
-                if not cell.is_empty:
-                    period, hierarchy = FinTabPeriod.get_period(self.header_to_period_map, sheet_name, cell)
-                    cell.period = period
-                    cell.metrics_hierarchy = hierarchy
+            # Tables are independent of each other: their headers never span more than one table.
+            for table in sheet.tables:
+                for coords, cell in table.items():
+                    if not cell.is_empty:
+                        period, hierarchy = self._get_period(sheet_name, cell)
+                        cell.period = period
+                        cell.metrics_hierarchy = hierarchy
+        self.temporals.flush()
+
+    def _has_period_expr(self, headers):
+        """
+        Determines whether a header chain includes an expression of period, once per distinct chain.
+        """
+        if not headers:
+            return False
+        if headers not in self._expresses_period:
+            self._expresses_period[headers] = FinTabPeriod.has_period_expr(headers, self.temporals)
+        return self._expresses_period[headers]
+
+    def _get_period(self, sheet_name, cell):
+        """
+        Resolves the period of a cell, the same way as FinTabPeriod.get_period.
+        The period of a cell usually comes entirely from its column headers or entirely from its row headers.
+        In that case, it is resolved from those headers alone, once per distinct header chain,
+        and the headers of the other side are simply added to the headers that do not express any periods.
+        :return: A tuple of the FinTabPeriod of the cell and its metrics hierarchy.
+        """
+        col_headers = cell.col_header if cell.col_header else []
+        row_headers = cell.row_header if cell.row_header else []
+        in_cols = self._has_period_expr(col_headers)
+        in_rows = self._has_period_expr(row_headers)
+        if not in_cols and not in_rows:
+            return None, col_headers + row_headers
+        if in_cols and in_rows:
+            # Both sides may express parts of the period, so all headers are considered together.
+            return FinTabPeriod.get_period(
+                self.header_to_period_map, sheet_name, cell, self._found_periods, self.temporals
+            )
+        headers = col_headers if in_cols else row_headers
+        period, non_periods = FinTabPeriod.get_headers_period(
+            self.header_to_period_map, sheet_name, headers, self._found_periods, self.temporals
+        )
+        if period is None:
+            return period, col_headers + row_headers
+        if in_cols:
+            return period, non_periods + list(row_headers)
+        return period, list(col_headers) + non_periods
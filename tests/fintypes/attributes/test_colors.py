@@ -1,5 +1,7 @@
-from sfinx.fintypes.attributes.colors import FinTabColors
-from tests.globals import sample_toc
+from openpyxl.styles.colors import Color
+
+from sfinx.fintypes.attributes.colors import FinTabColors, FinTabThemeColors
+from tests.globals import sample_toc, sample_workbook
 
 
 def test_cell_font_color_hex():
@@ -10,3 +12,12 @@ def test_cell_font_color_hex():
 def test_cell_fill_color_hex():
     cell = sample_toc["B13"]
     assert FinTabColors.get_cell_fill_color_hex(cell) == "FF644C76"
+
+
+def test_theme_colors():
+    theme_colors = FinTabThemeColors(sample_workbook.loaded_theme)
+    assert theme_colors.colors[:2] == ["FFFFFF", "000000"]
+    assert theme_colors.color_to_hex(Color(theme=1)) == "FF000000"
+    assert theme_colors.color_to_hex(Color(theme=0, tint=-0.5)) == "FF808080"
+    assert theme_colors.color_to_hex(Color(rgb="FF644C76")) == "FF644C76"
+    assert theme_colors.theme_and_tint_to_hex(12, 0.0) == FinTabColors.BLACK
@@ -8,3 +8,12 @@ def test_scale():
     cell = FinTabCell(3, 6, sample_table["D6"], [])
     cell.metrics_hierarchy = [parent]
     assert FinTabCurrency.find(cell) == FinTabCurrency.USD
+
+
+def test_currency_in_format():
+    assert FinTabCurrency.find_in_format("[$€-x]#,##0") == FinTabCurrency.EUR
+    assert FinTabCurrency.find_in_format("[$$-409]#,##0.00") == FinTabCurrency.USD
+    assert FinTabCurrency.find_in_format("[$£-809]#,##0") == FinTabCurrency.GBP
+    assert FinTabCurrency.find_in_format("[$CHF] #,##0") == "chf"
+    assert FinTabCurrency.find_in_format("[Red]#,##0") == FinTabCurrency.DEFAULT
+    assert FinTabCurrency.find_in_format('_("$"* #,##0.00_)') == FinTabCurrency.DEFAULT
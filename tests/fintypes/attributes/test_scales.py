@@ -1,4 +1,8 @@
+from openpyxl import Workbook
+
+from sfinx.fintypes.attributes.amounts import FinTabAmount
 from sfinx.fintypes.attributes.scales import FinTabScale
+from sfinx.fintypes.attributes.valtypes import FinTabValTypes
 from sfinx.fintypes.components.cell import FinTabCell
 from tests.globals import sample_table
 
@@ -8,3 +12,45 @@ def test_scale():
     cell = FinTabCell(3, 6, sample_table["D6"], [])
     cell.metrics_hierarchy = [parent]
     assert FinTabScale.find(cell) == "millions"
+
+
+def test_scale_memo():
+    parent = FinTabCell(1, 3, sample_table["B4"], [])
+    cells = [FinTabCell(3, 6, sample_table["D6"], []), FinTabCell(3, 7, sample_table["E6"], [])]
+    FinTabScale.find_in_values.cache_clear()
+    for cell in cells:
+        cell.metrics_hierarchy = [parent]
+        assert FinTabScale.find(cell) == "millions"
+    # The cells under the same hierarchy share the scale found for it.
+    info = FinTabScale.find_in_values.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_format_exponent():
+    assert FinTabScale.format_exponent("#,##0") == 0
+    assert FinTabScale.format_exponent("#,##0,") == 1
+    assert FinTabScale.format_exponent("#,##0.0,,") == 2
+    assert FinTabScale.format_exponent('#,##0,,," bn"') == 3
+    assert FinTabScale.format_exponent("_(* #,##0,,_);_(* \\(#,##0,,\\)") == 2
+    assert FinTabScale.format_exponent('_(* #,##0_);_(* \\(#,##0\\);_(* "-"??_);_(@_)') == 0
+
+
+def test_scale_in_format():
+    sheet = Workbook().active
+    sheet["A1"] = "Revenue"
+    sheet["A2"] = "Revenue (in billions)"
+    sheet["B1"] = 5_000_000
+    sheet["B1"].number_format = "#,##0,,"
+
+    def amount(header):
+        cell = FinTabCell(0, 1, sheet["B1"], [])
+        cell.metrics_hierarchy = [FinTabCell(0, 0, header, [])]
+        return FinTabAmount(cell)
+
+    # The format only shows the number in millions: the amount is the number itself.
+    a = amount(sheet["A1"])
+    assert (a.amount, a.amount_scale) == (5_000_000, FinTabScale.DEFAULT)
+    assert a.amount_type == FinTabValTypes.INT
+    # The number shown is in billions, so the amount is in thousands.
+    a = amount(sheet["A2"])
+    assert (a.amount, a.amount_scale) == (5_000_000, "thousands")
@@ -0,0 +1,15 @@
+from tests.globals import sample_fin_table, sample_wb
+
+
+def test_interned_styles():
+    cells = list(sample_fin_table.cells.values())
+    assert 0 < len(sample_wb.styles.styles) < len(cells)
+    assert all(c.styles is sample_wb.styles for c in cells)
+
+
+def test_relations_same_as_attributes():
+    styles = sample_wb.styles
+    for a, style in enumerate(styles.styles):
+        for b, other in enumerate(styles.styles):
+            assert styles.sub(a, b) == style.sub(other)
+            assert styles.equal(a, b) == style.equal(other)
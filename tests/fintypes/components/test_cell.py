@@ -1,4 +1,6 @@
-from sfinx.fintypes.components.cell import FinTabCell
+from openpyxl.worksheet.cell_range import CellRange
+
+from sfinx.fintypes.components.cell import FinTabCell, FinTabCellStore, FinTabHeaderChain, FinTabMergedRangeIndex
 from tests.globals import sample_table
 
 cell1 = FinTabCell(1, 3, sample_table["B4"], [])
@@ -14,3 +16,48 @@ def test_vals():
     assert cell2.is_empty is False
     assert cell2.is_body is True
     assert cell2.is_header is False
+
+
+def test_cell_store():
+    store = FinTabCellStore(2, 3)
+    store[(1, 2)] = cell1
+    assert (1, 2) in store and (0, 0) not in store and (5, 5) not in store
+    assert store[(1, 2)] is cell1
+    assert store.get((0, 1)) is None
+    assert list(store.items()) == [((1, 2), cell1)]
+    assert len(store) == 1
+    # Cells stored out of order are still iterated in row-major order.
+    store[(0, 1)] = cell2
+    store[(1, 0)] = cell2
+    assert list(store) == [(0, 1), (1, 0), (1, 2)]
+    assert len(store) == 3 and len(store._rows) == 2
+
+
+def test_merged_range_index():
+    index = FinTabMergedRangeIndex([CellRange("B2:D2"), CellRange("A4:A6"), CellRange("F1:G3")])
+    assert index.find(1, 2).coord == "B2:D2"
+    assert index.find(1, 4) is None
+    assert index.find(4, 0).coord == "A4:A6"
+    assert index.is_top_left(1, 1) and not index.is_top_left(1, 2)
+    assert index.is_merged_col_wise(1, 3) and not index.is_merged_row_wise(1, 3)
+    assert index.is_merged_row_wise(5, 0) and not index.is_merged_col_wise(5, 0)
+    assert index.is_merged_row_wise(2, 6) and index.is_merged_col_wise(2, 6)
+    assert [(start, end) for start, end, _ in index.row_intervals(1)] == [(1, 3), (5, 6)]
+    assert [(start, end) for start, end, _ in index.col_intervals(0)] == [(3, 5)]
+    # Ranges are clipped to the indexed rows and columns.
+    assert FinTabMergedRangeIndex([CellRange("A1:XFD1048576")], 2, 2).find(1, 1) is not None
+    assert FinTabMergedRangeIndex([CellRange("A1:XFD1048576")], 2, 2).row_intervals(2) == []
+
+
+def test_header_chain():
+    empty = FinTabHeaderChain()
+    a, b, c = object(), object(), object()
+    chain = empty.append(a).append(b)
+    assert list(chain) == [a, b] and len(chain) == 2 and chain[-1] is b
+    assert not empty and chain
+    # Chains are interned, so equal chains are the same object.
+    assert empty.extend([a, b]) is chain
+    assert chain + empty.append(c) is empty.extend([a, b, c])
+    assert [] + chain is chain
+    assert chain[:-1] is chain.parent is empty.append(a)
+    assert {chain: 1}[empty.extend([a, b])] == 1
@@ -1,4 +1,11 @@
-from tests.globals import sample_fin_table
+from io import BytesIO
+
+import pytest
+from openpyxl import Workbook
+from openpyxl.styles import Font
+
+from sfinx.fintypes.components.workbook import FinWorkbook
+from tests.globals import sample_fin_table, sample_path
 
 
 def test_headers():
@@ -12,3 +19,71 @@ def test_headers():
     assert len(ch) == 2
     assert ch[0].val == "2019"
     assert ch[1].val == "FY 20182"
+
+
+def test_sparse_cells():
+    assert all(not c.is_empty for c in sample_fin_table.cells.values())
+    assert len(sample_fin_table.cells) == sum(len(cols) for cols in sample_fin_table.row_occupancy.values())
+    for i, cols in sample_fin_table.row_occupancy.items():
+        assert cols == sorted(cols)
+        assert all(i in sample_fin_table.col_occupancy[j] for j in cols)
+    assert all(i not in sample_fin_table.row_occupancy for i in sample_fin_table.empty_rows)
+
+
+def inflated_workbook():
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["", "2019", "2020"])
+    ws.append(["Revenue", 10, 12])
+    ws.append(["Costs", 5, 6])
+    # A formatted cell far beyond the data inflates the dimensions of the worksheet.
+    ws.cell(1048576, 16384).font = Font(bold=True)
+    f = BytesIO()
+    wb.save(f)
+    return f.getvalue()
+
+
+@pytest.mark.parametrize("options", [{}, {"read_only": True}, {"engine": FinWorkbook.ENGINE_XML}])
+def test_used_range(options):
+    sheet = list(FinWorkbook(inflated_workbook(), from_path=False, **options).sheets.values())[0]
+    assert (sheet.nrows, sheet.ncols) == (3, 3)
+    assert len(sheet.cells) == 8
+
+
+def test_cell_budget():
+    with pytest.raises(ValueError):
+        FinWorkbook(inflated_workbook(), from_path=False, max_cells=6)
+    with pytest.warns(UserWarning):
+        wb = FinWorkbook(inflated_workbook(), from_path=False, max_cells=6, truncate=True)
+    sheet = list(wb.sheets.values())[0]
+    assert (sheet.nrows, sheet.ncols) == (2, 3)
+    assert sheet.truncated_from == (3, 3)
+    with pytest.raises(ValueError):
+        FinWorkbook(inflated_workbook(), from_path=False, max_cells=0, truncate=True)
+
+
+def test_merged_cells_are_not_unmerged():
+    wb = FinWorkbook(sample_path, from_path=True)
+    sheet = wb.sheets["OF segment accounts"]
+    assert len(sheet.merged) == len(wb.wb["OF segment accounts"].merged_cells.ranges) == 1
+    g = sheet.merged.ranges[0]
+    top_left = sheet.cells.get((g.min_row - 1, g.min_col - 1))
+    for i in range(g.min_row - 1, min(g.max_row, sheet.nrows)):
+        for j in range(g.min_col - 1, min(g.max_col, sheet.ncols)):
+            assert sheet.merged.find(i, j) is g
+            if top_left is not None:
+                assert sheet.cells[(i, j)].val == top_left.val
+
+
+def test_headers_across_empty_rows():
+    wb = Workbook()
+    ws = wb.active
+    for row in [["", "2019", "2020"], ["Revenue", 10, 12], [], ["Costs", 5, 6], [], [], ["Other", 1, 2]]:
+        ws.append(row)
+    f = BytesIO()
+    wb.save(f)
+    sheet = list(FinWorkbook(f.getvalue(), from_path=False).sheets.values())[0]
+    # The walk toward the column header crosses the empty row right above a cell, but no further.
+    assert [h.val for h in sheet.cells[(3, 1)].col_header] == ["2019"]
+    assert len(sheet.cells[(6, 1)].col_header) == 0
+    assert [h.val for h in sheet.cells[(6, 2)].row_header] == ["Other"]
@@ -0,0 +1,72 @@
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell.cell import MergedCell
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+
+from sfinx.fintypes.components.stream import (
+    FinLoadedSheet,
+    FinOpenpyxlSource,
+    FinSheetStream,
+    FinStreamRow,
+)
+from sfinx.fintypes.components.workbook import FinWorkbook
+from tests.globals import sample_path, sample_wb
+
+sample_stream_wb = FinWorkbook(sample_path, from_path=True, read_only=True)
+
+
+def test_merged_ranges():
+    wb = load_workbook(sample_path, data_only=True, read_only=True)
+    sheet = FinSheetStream(wb["OF segment accounts"])
+    assert len(sheet.merged_ranges) == 1
+    assert (sheet.max_row, sheet.max_column) == (41, 34)
+    wb.close()
+
+
+def test_source_parsed_once(monkeypatch):
+    opened = []
+    get_source = ReadOnlyWorksheet._get_source
+    wb = load_workbook(sample_path, data_only=True, read_only=True)
+    monkeypatch.setattr(ReadOnlyWorksheet, "_get_source", lambda self: opened.append(self) or get_source(self))
+    sheet = FinSheetStream(wb["OF segment accounts"])
+    sheet.trim(*sheet.get_used_range())
+    assert sum(1 for _ in sheet.rows) == sheet.max_row
+    assert len(opened) == 1
+    wb.close()
+
+
+def test_unsupported_openpyxl_version(monkeypatch):
+    assert FinOpenpyxlSource.is_supported("3.0.5")
+    assert not FinOpenpyxlSource.is_supported("4.0.0")
+    monkeypatch.setattr(FinOpenpyxlSource, "SUPPORTED_VERSIONS", [])
+    wb = load_workbook(sample_path, data_only=True, read_only=True)
+    with pytest.raises(RuntimeError):
+        FinSheetStream(wb["OF segment accounts"])
+    wb.close()
+
+
+def test_same_as_full_load():
+    assert list(sample_stream_wb.sheets) == list(sample_wb.sheets)
+    for sheet_name, sheet in sample_wb.sheets.items():
+        streamed = sample_stream_wb.sheets[sheet_name]
+        assert (streamed.nrows, streamed.ncols) == (sheet.nrows, sheet.ncols)
+        for coords, cell in sheet.cells.items():
+            other = streamed.cells[coords]
+            assert (other.val, other.val_type, other.font_is_bold) == (cell.val, cell.val_type, cell.font_is_bold)
+            assert [h.key for h in other.col_header or []] == [h.key for h in cell.col_header or []]
+
+
+def test_merged_cells_resolved_on_access():
+    ws = Workbook().active
+    ws["A1"] = "Revenue"
+    ws["A3"] = 1
+    ws.merge_cells("A1:C1")
+    ws.merge_cells("B2:Z3")  # a large range with an empty top-left cell
+    rows = []
+    for row in FinLoadedSheet(ws).rows:
+        rows.append([(cell, cell.value) for cell in row])
+        assert isinstance(row, FinStreamRow)
+    assert [value for _, value in rows[0][:4]] == ["Revenue", "Revenue", "Revenue", None]
+    # The covered cells of the empty range are not replaced.
+    assert all(isinstance(cell, MergedCell) for cell, _ in rows[1][2:] + rows[2][1:])
+    assert rows[2][0][1] == 1
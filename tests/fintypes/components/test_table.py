@@ -0,0 +1,39 @@
+from io import BytesIO
+
+from openpyxl import Workbook
+
+from sfinx.fintypes.components.workbook import FinWorkbook
+from tests.globals import sample_fin_table
+
+
+def test_single_table():
+    assert len(sample_fin_table.tables) == 1
+    table = sample_fin_table.tables[0]
+    assert (table.min_row, table.min_col) == (1, 1)
+    assert sum(1 for _ in table.items()) == len(sample_fin_table.cells)
+
+
+def test_segment_tables():
+    wb = Workbook()
+    ws = wb.active
+    # Two tables side by side, and a third one below them.
+    for top, left in [(1, 1), (1, 6), (9, 1)]:
+        ws.cell(top, left + 1, "2019")
+        ws.cell(top, left + 2, "2020")
+        for k, metric in enumerate(["Revenue", "Costs"]):
+            # A single empty row within a table does not split it.
+            ws.cell(top + 2 * k + 1, left, metric)
+            ws.cell(top + 2 * k + 1, left + 1, 10 + k)
+            ws.cell(top + 2 * k + 1, left + 2, 20 + k)
+    f = BytesIO()
+    wb.save(f)
+    sheet = list(FinWorkbook(f.getvalue(), from_path=False).sheets.values())[0]
+    assert [(t.min_row, t.max_row, t.min_col, t.max_col) for t in sheet.tables] == [
+        (0, 3, 0, 2),
+        (0, 3, 5, 7),
+        (8, 11, 0, 2),
+    ]
+    assert sum(sum(1 for _ in t.items()) for t in sheet.tables) == len(sheet.cells)
+    assert (3, 1) in sheet.tables[0] and (3, 5) not in sheet.tables[0]
+    assert [h.val for h in sheet.cells[(3, 6)].col_header] == ["2019"]
+    assert [h.val for h in sheet.cells[(11, 2)].row_header] == ["Costs"]
@@ -0,0 +1,47 @@
+from openpyxl import load_workbook
+from openpyxl.cell.cell import MergedCell
+
+from sfinx.fintypes.components.workbook import FinWorkbook
+from sfinx.fintypes.components.xlsx import FinXlsxWorkbook
+from tests.globals import sample_path, sample_wb
+
+sample_xml_wb = FinWorkbook(sample_path, from_path=True, engine=FinWorkbook.ENGINE_XML)
+
+
+def test_cells_same_as_openpyxl():
+    wb = load_workbook(sample_path, data_only=True)
+    xlsx = FinXlsxWorkbook(sample_path)
+    assert xlsx.sheetnames == wb.sheetnames
+    sheet = wb["OF segment accounts"]
+    rows = xlsx["OF segment accounts"]._iter_rows()
+    for row, other_row in zip(sheet.iter_rows(max_row=sheet.max_row, max_col=sheet.max_column), rows):
+        for cell, other in zip(row, other_row):
+            if isinstance(cell, MergedCell):  # restyled once unmerged
+                continue
+            assert (other.value, other.data_type, other.number_format) == (
+                cell.value,
+                cell.data_type,
+                cell.number_format,
+            )
+            assert (other.font.b, other.font.sz, other.fill.start_color.index) == (
+                cell.font.b,
+                cell.font.sz,
+                cell.fill.start_color.index,
+            )
+    xlsx.close()
+
+
+def test_same_as_openpyxl_engine():
+    assert list(sample_xml_wb.sheets) == list(sample_wb.sheets)
+    for sheet_name, sheet in sample_wb.sheets.items():
+        other_sheet = sample_xml_wb.sheets[sheet_name]
+        assert (other_sheet.nrows, other_sheet.ncols) == (sheet.nrows, sheet.ncols)
+        for coords, cell in sheet.cells.items():
+            other = other_sheet.cells[coords]
+            assert (other.val, other.val_type, other.style, other.font_color) == (
+                cell.val,
+                cell.val_type,
+                cell.style,
+                cell.font_color,
+            )
+            assert [h.key for h in other.col_header or []] == [h.key for h in cell.col_header or []]
@@ -1,3 +1,7 @@
+from datetime import datetime
+
+import dateparser
+
 from sfinx.fintypes.temporals.fulldates import FullDate
 
 
@@ -7,3 +11,40 @@ def test_full_date():
     assert d.year == 2021
     assert d.month == 9
     assert d.day == 20
+
+
+def test_exact_formats():
+    for text in ["9/30/2020", "sep 30, 2020", "30-sep-20", "2020-09-30", "september 30 2020", "30 september\n2020"]:
+        assert FullDate.find_exact(text) == datetime(2020, 9, 30)
+    assert FullDate.find_exact("feb 30, 2020") is None
+    assert FullDate.find_exact("three months ended september 30, 2020") is None
+    assert FullDate.find_exact("30-sep-99") == datetime(1999, 9, 30)
+
+
+def test_exact_formats_agree_with_dateparser():
+    # Headers that consist of a date only are parsed by FORMATS as they were by dateparser.
+    for text in [
+        "9/30/2020",
+        " 12/31/19 ",
+        "2021-03-31",
+        "sep 30, 2020",
+        "december 31 2020",
+        "30-sep-99",
+        "1 jan 2021",
+    ]:
+        assert FullDate.find_exact(text) == dateparser.parse(text)
+        assert FullDate.find(text) == dateparser.parse(text)
+
+
+def test_embedded_dates_agree_with_dateparser():
+    # Dates within longer headers are left to dateparser, so that their periods don't change.
+    for text in [
+        "three months ended september 30, 2021",
+        "quarter ended sep 30, 2020",
+        "year ended december 31, 2020",
+        "balance at 12/31/2019",
+        "as of 12/31/2019 and 12/31/2020",
+        "note 1.2.20",
+    ]:
+        assert FullDate.find_exact(text) is None
+        assert FullDate.find(text) == dateparser.parse(text)
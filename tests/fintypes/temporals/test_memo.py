@@ -0,0 +1,41 @@
+import pickle
+import sqlite3
+
+from sfinx.fintypes.period import FinTabPeriod
+from sfinx.fintypes.temporals.fulldates import FullDate
+from sfinx.fintypes.temporals.memo import TemporalMemo
+
+
+def test_memo():
+    memo = TemporalMemo(max_entries=2)
+    text = "three months ended september 30, 2021"
+    components = memo.get(TemporalMemo.COMPONENTS, text, FinTabPeriod.find_components)
+    assert components == FinTabPeriod.find_components(text)
+    assert memo.get(TemporalMemo.COMPONENTS, text, None) == components
+    memo.get(TemporalMemo.DATE, "q1 2020", FullDate.find)
+    memo.get(TemporalMemo.DATE, "fy2020", FullDate.find)
+    assert memo.stats() == {"hits": 1, "misses": 3, "evictions": 1, "hit_rate": 0.25}
+
+
+def test_persisted_memo(tmp_path):
+    path = str(tmp_path / "periods.db")
+    memo = TemporalMemo(path)
+    texts = ["4q21", "three months ended september 30, 2021"]
+    for text in texts:
+        memo.get(TemporalMemo.COMPONENTS, text, FinTabPeriod.find_components)
+    memo.get(TemporalMemo.DATE, texts[1], FullDate.find)
+    memo.flush()
+    warm = TemporalMemo(path)
+    for text in texts:
+        assert warm.get(TemporalMemo.COMPONENTS, text, None) == FinTabPeriod.find_components(text)
+    assert warm.get(TemporalMemo.DATE, texts[1], None) == FullDate.find(texts[1])
+    assert warm.stats()["hit_rate"] == 1.0
+    # Full dates parsed on another day are parsed again, since they may be completed with the current day.
+    with sqlite3.connect(path) as db:
+        db.execute("UPDATE temporals SET parsed_on = '2000-01-01'")
+    stale = TemporalMemo(path)
+    assert stale.get(TemporalMemo.DATE, texts[1], FullDate.find) == FullDate.find(texts[1])
+    assert stale.get(TemporalMemo.COMPONENTS, texts[0], None) == FinTabPeriod.find_components(texts[0])
+    assert (stale.hits, stale.misses) == (1, 1)
+    # Worker processes reopen the memo of the same file.
+    assert pickle.loads(pickle.dumps(stale)) is TemporalMemo.open(path)
@@ -0,0 +1,15 @@
+from dateutil.relativedelta import relativedelta
+
+from sfinx.fintypes.period import FinTabPeriod
+
+
+def test_scan():
+    scanner = FinTabPeriod.SCANNER
+    year, quarter, semi, ended, month, expresses_period = scanner.scan("three months ended september 30, 2021")
+    assert (year, quarter, semi, month) == (2021, None, None, 9)
+    assert ended == relativedelta(months=-3)
+    assert expresses_period is True
+    assert scanner.scan("1q19")[:2] == (2019, 1)
+    assert scanner.scan("1h 2020")[:3] == (2020, None, 1)
+    assert scanner.scan("period") == (None, None, None, None, None, True)
+    assert scanner.scan("revenue") == (None, None, None, None, None, False)
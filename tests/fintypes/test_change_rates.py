@@ -0,0 +1,51 @@
+from copy import copy
+
+from sfinx.fintypes.change_rates import FinTabChangeRates
+from sfinx.fintypes.metric import FinTabMetric
+from sfinx.fintypes.period import FinTabDerivedPeriod
+from tests.globals import sample_metric_norm
+
+
+def copy_metric(metric, amounts=None):
+    """
+    Copies the amounts of the cells of a metric and its sub-metrics, optionally replacing their values.
+    """
+    m = FinTabMetric(metric.name)
+    for period, amount in metric.period_to_amount.items():
+        if "[derived]" not in period.expr:
+            m.period_to_amount[period] = copy(amount) if amounts is None else amounts(copy(amount))
+    for smn, sm in metric.name_to_sub_metric.items():
+        m.name_to_sub_metric[smn] = copy_metric(sm, amounts)
+    return m
+
+
+def set_change_rates(metric):
+    """
+    Calculates the change rates of a metric pair by pair, with the formulas of FinTabMetric.
+    """
+    items = list(metric.period_to_amount.items())
+    for (period1, amount1), (period2, amount2) in zip(items, items[1:]):
+        derived_period = FinTabDerivedPeriod.calculate(amount1, period1, amount2, period2)
+        if derived_period is not None:
+            metric.set_delta(amount1, amount2, derived_period)
+            metric.set_pct_delta(amount1, period1, amount2, period2)
+            metric.set_bps_delta(amount1, period1, amount2, period2)
+    for sm in metric.name_to_sub_metric.values():
+        set_change_rates(sm)
+
+
+def with_amount(amount, value):
+    amount.amount = value
+    return amount
+
+
+def test_change_rates():
+    metrics = list(sample_metric_norm.sheet_to_metrics.values())
+    # Integers, zeros and integers too large for floating point, along with the amounts of the sample
+    for amounts in [None, lambda a: with_amount(a, a.i * 7 - 20), lambda a: with_amount(a, 2**60 + a.i)]:
+        expected = [copy_metric(m, amounts) for m in metrics]
+        for m in expected:
+            set_change_rates(m)
+        actual = [copy_metric(m, amounts) for m in metrics]
+        FinTabChangeRates(actual)
+        assert [m.to_json() for m in actual] == [m.to_json() for m in expected]
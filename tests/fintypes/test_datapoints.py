@@ -0,0 +1,60 @@
+import io
+import json
+
+import numpy as np
+
+from sfinx.processors.metric_normalizer import FinTabMetricNormalizer
+from tests.globals import sample_metric_norm
+
+
+def test_datapoints():
+    datapoints = sample_metric_norm.to_datapoints()
+    j = sample_metric_norm.to_json()
+    assert datapoints.to_json() == j
+    assert datapoints.to_tsv() == FinTabMetricNormalizer.to_tsv(j)
+    a = datapoints.to_numpy()
+    assert len(a) == len(datapoints) == sum(len(v["values"]) for v in iter_metrics(j) if "values" in v)
+    # The datapoints of each metric are contiguous, and the ids refer to the interned tables.
+    assert np.all(np.diff(a["metric"]) >= 0)
+    assert a["period"].max() < len(datapoints.periods) and a["sheet"].max() < len(datapoints.sheets)
+    derived = np.array(["[derived]" in datapoints.periods[p].expr for p in a["period"]])
+    assert np.all(a["row"][derived] == -1) and np.all(a["row"][~derived] >= 0)
+    assert a["period_end"][0] == datapoints.periods[a["period"][0]].end_date.toordinal()
+
+
+def iter_metrics(j):
+    for sheet in j:
+        stack = list(sheet["metrics"])
+        while stack:
+            metric = stack.pop()
+            yield metric
+            stack.extend(metric.get("sub_metrics", []))
+
+
+def test_write_json():
+    datapoints = sample_metric_norm.to_datapoints()
+    j = sample_metric_norm.to_json()
+    f = io.StringIO()
+    datapoints.write_json(f)
+    assert f.getvalue() == json.dumps(j)
+    f = io.StringIO()
+    datapoints.write_ndjson(f)
+    records = [json.loads(line) for line in f.getvalue().splitlines()]
+    assert records == list(iter_records(j))
+
+
+def iter_records(j):
+    """
+    Lists the datapoints of the json representation of a workbook in the order of its metrics.
+    """
+
+    def metric_records(sheet_name, path, metric):
+        path = path + [metric["metric_name"]]
+        for val in metric.get("values", []):
+            yield {"sheet_name": sheet_name, "metric_path": path, "period": val["period"], "amount": val["amount"]}
+        for sub_metric in metric.get("sub_metrics", []):
+            yield from metric_records(sheet_name, path, sub_metric)
+
+    for sheet in j:
+        for metric in sheet["metrics"]:
+            yield from metric_records(sheet["sheet_name"], [], metric)
@@ -1,12 +1,13 @@
 from datetime import datetime
 
-from sfinx.fintypes.period import FinTabPeriod
+from sfinx.fintypes.period import FinTabDerivedPeriod, FinTabPeriod, FinTabPeriodMap, FinTabPeriodTable
+from sfinx.fintypes.temporals.memo import TemporalMemo
 from tests.globals import sample_fin_table
 
 
 def test_period():
     cell = sample_fin_table.cells[(5, 4)]
-    period, non_headers = FinTabPeriod.get_period({}, "sheet", cell)
+    period, non_headers = FinTabPeriod.get_period(FinTabPeriodMap(), "sheet", cell)
     assert period is not None
     assert period.expr.strip() == "2019"
 
@@ -18,3 +19,44 @@ def test_period():
     assert non_headers[1].val == "Business performance, $MM"
     assert non_headers[2].val == "Income Statement"
     assert non_headers[3].val == "External revenue"
+
+
+def test_period_without_date_fallback():
+    cell = sample_fin_table.cells[(5, 4)]
+    period, non_headers = FinTabPeriod.get_period(
+        FinTabPeriodMap(), "sheet", cell, temporals=TemporalMemo(date_fallback=False)
+    )
+    # Without dateparser, a year alone is not completed with the current month/day
+    assert (period.start_date, period.end_date) == (datetime(2019, 1, 1), datetime(2020, 1, 1))
+    assert len(non_headers) == 4
+    assert period.granularity == FinTabPeriod.IS.YEAR
+
+
+def test_period_table():
+    table = FinTabPeriodTable()
+    q3 = table.intern("q3 2020", datetime(2020, 7, 1), datetime(2020, 10, 1), [])
+    assert table.intern("q3 2020", datetime(2020, 7, 1), datetime(2020, 10, 1), []) is q3
+    assert q3.granularity == FinTabPeriod.IS.QUARTER
+    # Periods that only differ by their flags are distinct objects with the same id
+    flagged = table.intern("q3 2020", datetime(2020, 7, 1), datetime(2020, 10, 1), ["flag"])
+    assert flagged is not q3 and flagged.id == q3.id and flagged == q3 and hash(flagged) == hash(q3)
+    q4 = table.intern("q3 2020", datetime(2020, 10, 1), datetime(2021, 1, 1), [])
+    assert q4 != q3 and q3 < q4 and len(table) == 2
+    # Periods of different tables are compared by their values
+    assert FinTabPeriodTable().intern("q3 2020", datetime(2020, 7, 1), datetime(2020, 10, 1), []) == q3
+
+
+def test_period_order_and_occurrences():
+    # Periods that end on the same day are ordered by their time of day.
+    morning = FinTabPeriod("9/30/2020 9:00", datetime(2020, 9, 29, 9), datetime(2020, 9, 30, 9), [])
+    evening = FinTabPeriod("9/30/2020 18:00", datetime(2020, 9, 29, 18), datetime(2020, 9, 30, 18), [])
+    assert morning < evening and evening > morning and not evening <= morning
+    assert sorted([evening, morning]) == [morning, evening]
+    curr_map = FinTabPeriodMap()
+    p, _ = FinTabPeriod.construct_period(
+        "sheet", curr_map, "q3 2020", morning.start_date, morning.end_date, [(0, 1)], [], []
+    )
+    assert p.occurrence_range == [(0, 1)]
+    derived = FinTabDerivedPeriod.between(p, evening, "delta")
+    assert derived.occurrence_range == [(0, 1)]
+    assert FinTabDerivedPeriod("x", p.start_date, p.end_date, []).occurrence_range == []
@@ -0,0 +1,59 @@
+from copy import copy
+
+from sfinx.fintypes.attributes.valtypes import FinTabValTypes
+from sfinx.fintypes.shares import FinTabShares
+from tests.fintypes.test_change_rates import copy_metric
+from tests.globals import sample_metric_norm
+
+
+def set_shares(metric):
+    """
+    Calculates the shares of total of a metric group by group, in Python.
+    """
+    period_amount_type_to_amount = {}
+    for smn, sm in metric.name_to_sub_metric.items():
+        if "total" in smn.lower():
+            continue
+        for period, amount in sm.period_to_amount.items():
+            if "[derived]" in period.expr or amount.amount_type == FinTabValTypes.PERCENT:
+                continue
+            at = FinTabValTypes.CURRENCY if amount.fit_for_deltas() else amount.amount_type
+            l = period_amount_type_to_amount.get((period, at), [])
+            l.append(amount)
+            period_amount_type_to_amount[(period, amount.amount_type)] = l
+    for l in period_amount_type_to_amount.values():
+        total = sum([x.amount for x in l])
+        for x in l:
+            x.share_of_total = (x.amount * 100.0 / total) if total != 0.0 else 0.0
+    for sm in metric.name_to_sub_metric.values():
+        set_shares(sm)
+
+
+def with_type(amount, amount_type, value):
+    amount = copy(amount)
+    amount.amount_type = amount_type
+    amount.amount = value
+    return amount
+
+
+def shares(metric):
+    return [[a.share_of_total for a in metric.period_to_amount.values()]] + [
+        shares(sm) for sm in metric.name_to_sub_metric.values()
+    ]
+
+
+def test_shares():
+    metrics = list(sample_metric_norm.sheet_to_metrics.values())
+    types = [FinTabValTypes.INT, FinTabValTypes.CURRENCY, FinTabValTypes.FLOAT, FinTabValTypes.PERCENT]
+    # Along with the amounts of the sample, integers met before currencies and integers too large for floating point
+    for amounts in [
+        None,
+        lambda a: with_type(a, types[(a.i + a.j) % 4], a.i - a.j),
+        lambda a: with_type(a, types[a.i % 2], 2**60 + a.j),
+    ]:
+        expected = [copy_metric(m, amounts) for m in metrics]
+        for m in expected:
+            set_shares(m)
+        actual = [copy_metric(m, amounts) for m in metrics]
+        FinTabShares(actual)
+        assert [shares(m) for m in actual] == [shares(m) for m in expected]
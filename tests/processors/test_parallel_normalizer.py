@@ -0,0 +1,15 @@
+from sfinx.fintypes.temporals.memo import TemporalMemo
+from sfinx.processors.parallel_normalizer import FinTabParallelNormalizer
+from tests.globals import sample_metric_norm, sample_path
+
+
+def test_same_as_serial():
+    metric_norm = FinTabParallelNormalizer(sample_path, from_path=True, workers=2)
+    assert list(metric_norm.sheet_to_metrics) == list(sample_metric_norm.sheet_to_metrics)
+    assert metric_norm.to_json() == sample_metric_norm.to_json()
+
+
+def test_period_counters():
+    temporals = TemporalMemo()
+    FinTabParallelNormalizer(sample_path, from_path=True, workers=2, temporals=temporals)
+    assert temporals.hits + temporals.misses > 0
@@ -0,0 +1,30 @@
+from sfinx.fintypes.components.workbook import FinWorkbook
+from sfinx.fintypes.period import FinTabPeriod, FinTabPeriodMap
+from sfinx.processors.period_normalizer import FinTabPeriodNormalizer
+from tests.globals import sample_path, sample_period_norm, sample_wb
+
+
+def test_same_as_get_period():
+    # Resolving periods once per header chain gives the same results as resolving them cell by cell.
+    header_to_period_map = FinTabPeriodMap()
+    for sheet_name, sheet in sample_wb.sheets.items():
+        for table in sheet.tables:
+            for coords, cell in table.items():
+                period, hierarchy = FinTabPeriod.get_period(header_to_period_map, sheet_name, cell)
+                assert period == cell.period
+                assert [h.key for h in hierarchy] == [h.key for h in cell.metrics_hierarchy]
+    assert len(sample_period_norm._found_periods) < sum(len(sheet.cells) for sheet in sample_wb.sheets.values()) / 10
+
+
+def test_shared_period_map():
+    period_map = FinTabPeriodMap()
+    for sheet_name in sample_wb.sheets:
+        # Each worksheet is normalized separately, and their periods are kept in the same map.
+        wb = FinWorkbook(sample_path, from_path=True, sheet_names=[sheet_name])
+        FinTabPeriodNormalizer(wb, period_map=period_map)
+        for coords, cell in wb.sheets[sheet_name].cells.items():
+            assert cell.period == sample_wb.sheets[sheet_name].cells[coords].period
+            if cell.period is not None:
+                assert cell.period.table is period_map.table
+                assert any(p is cell.period for p in period_map.index(sheet_name).periods)
+    assert len(period_map) > 0 and set(period_map.sheets) <= set(sample_wb.sheets)
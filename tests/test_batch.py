@@ -0,0 +1,78 @@
+import json
+import os
+
+from sfinx.batch import STATUS_OK, _init_worker, find_inputs, run_batch
+from sfinx.cache import FinResultCache
+from sfinx.fintypes.temporals.fulldates import FullDate
+from sfinx.fintypes.temporals.memo import TemporalMemo
+
+examples_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples")
+
+
+def test_find_inputs():
+    paths = find_inputs(examples_path)
+    assert len(paths) == 4
+    assert find_inputs(os.path.join(examples_path, "*_1_input.xlsx")) == paths[:1]
+
+
+def test_run_batch(tmp_path):
+    paths = find_inputs(os.path.join(examples_path, "*_1_input.xlsx"))
+    records = run_batch(paths, tmp_path / "combined.json", workers=1)
+    assert [r["status"] for r in records] == [STATUS_OK]
+    assert (tmp_path / "combined_summary.tsv").exists()
+    with open(tmp_path / "combined.json") as f:
+        j = json.load(f)
+    assert j[0]["file_name"] == str(paths[0])
+    assert j[0]["sheets"][0]["sheet_name"] == "income statement"
+
+
+def test_run_batch_ndjson(tmp_path):
+    paths = find_inputs(os.path.join(examples_path, "*_input.xlsx"))
+    run_batch(paths, tmp_path / "combined.json", workers=1)
+    run_batch(paths, tmp_path / "combined.ndjson", workers=1)
+    with open(tmp_path / "combined.json") as f:
+        j = json.load(f)
+    with open(tmp_path / "combined.ndjson") as f:
+        records = [json.loads(line) for line in f]
+    assert [r["file_name"] for r in records[:1] + records[-1:]] == [str(paths[0]), str(paths[-1])]
+    assert records[0]["sheet_name"] == j[0]["sheets"][0]["sheet_name"]
+    values = sum(len(v["values"]) for w in j for s in w["sheets"] for v in iter_metrics(s["metrics"]) if "values" in v)
+    assert len(records) == values
+
+
+def iter_metrics(metrics):
+    for metric in metrics:
+        yield metric
+        yield from iter_metrics(metric.get("sub_metrics", []))
+
+
+def test_run_batch_cache(tmp_path):
+    # More workbooks than the window of submitted workbooks of a single worker
+    paths = find_inputs(examples_path)
+    cache = FinResultCache(tmp_path / "cache")
+    records = run_batch(paths, tmp_path / "outputs", extension=".tsv", workers=1, cache=cache)
+    assert [r["status"] for r in records] == [STATUS_OK] * len(paths)
+    assert (cache.hits, cache.misses) == (0, len(paths))
+    records = run_batch(paths, tmp_path / "outputs", extension=".tsv", workers=1, cache=cache)
+    assert [r["cached"] for r in records] == [True] * len(paths)
+    assert (cache.hits, cache.misses) == (len(paths), len(paths))
+    assert [r["input_path"] for r in records] == [str(p) for p in paths]
+
+
+def test_run_batch_period_counters(tmp_path):
+    # The lookups of the worker processes are added to the counters of the TemporalMemo of the batch.
+    paths = find_inputs(examples_path)
+    temporals = TemporalMemo(tmp_path / "periods.db")
+    run_batch(paths, tmp_path / "outputs", workers=2, temporals=temporals)
+    hits, misses = temporals.hits, temporals.misses
+    assert misses > 0
+    # The periods are parsed by the first batch only.
+    run_batch(paths, tmp_path / "outputs", workers=2, temporals=temporals)
+    assert temporals.misses == misses
+    assert temporals.hits > hits
+
+
+def test_init_worker_without_date_fallback(monkeypatch):
+    # The language data of the date parser is only loaded if it may be used.
+    monkeypatch.setattr(FullDate, "get_parser", None)
+    _init_worker(TemporalMemo(date_fallback=False))
@@ -0,0 +1,46 @@
+import os
+
+from sfinx.cache import FinResultCache
+from sfinx.main import generate_output
+
+example_path = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples", "sfinx_example_1_input.xlsx"
+)
+
+
+def test_cache_hits(tmp_path):
+    cache = FinResultCache(tmp_path)
+    j = generate_output(example_path, ".tsv", True, cache=cache)
+    assert cache.stats()["misses"] == 1
+    with open(example_path, "rb") as f:
+        content = f.read()
+    assert generate_output(content, ".tsv", False, cache=cache) == j
+    assert generate_output(example_path, ".tsv", True, cache=cache) == j
+    assert cache.stats()["hits"] == 2
+    generate_output(example_path, ".json", True, cache=cache)
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_eviction(tmp_path):
+    cache = FinResultCache(tmp_path, max_bytes=10)
+    cache.put(cache.key(b"a", {}), ".json", "0123456789")
+    os.utime(cache.cache_dir / (cache.key(b"a", {}) + ".json"), (1, 1))
+    cache.put(cache.key(b"b", {}), ".json", "0123456789")
+    assert cache.evictions == 1
+    assert cache.get(cache.key(b"a", {}), ".json") is None
+    assert cache.get(cache.key(b"b", {}), ".json") == "0123456789"
+
+
+def test_cache_running_total(tmp_path, monkeypatch):
+    cache = FinResultCache(tmp_path, max_bytes=25)
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or scandir(path))
+    for k in range(2):
+        cache.put(cache.key(bytes([k]), {}), ".json", "0123456789")
+    # The directory is only scanned once, then again when the running total exceeds the bound.
+    assert len(scans) == 1 and cache.evictions == 0
+    cache.put(cache.key(b"\x00", {}), ".json", "012345678")  # replaced entries don't count twice
+    assert len(scans) == 1
+    cache.put(cache.key(b"\x02", {}), ".json", "0123456789")
+    assert len(scans) == 2 and cache.evictions == 1